@@ -0,0 +1,39 @@
+import statistics
+import time
+
+from rich.pretty import pprint as rich_print
+
+from arena_missions.builders import ChallengeBuilder, MissionBuilder, RequiredObjectBuilder
+
+
+NUM_REPEATS = 5
+RNG_SEED = 0
+
+
+def benchmark_mission_generation(num_repeats: int = NUM_REPEATS) -> None:
+    """Time how long it takes to generate every mission, without any workers.
+
+    All the challenges are registered before timing, so that only the generation is measured.
+    """
+    mission_builder = MissionBuilder(ChallengeBuilder(), RequiredObjectBuilder())
+    num_missions = len(ChallengeBuilder())
+
+    durations = []
+    for _ in range(num_repeats):
+        start_time = time.perf_counter()
+        list(mission_builder.generate_all_missions(num_workers=1, rng_seed=RNG_SEED))
+        durations.append(time.perf_counter() - start_time)
+
+    rich_print(
+        {
+            "num_missions": num_missions,
+            "num_repeats": num_repeats,
+            "best_seconds": min(durations),
+            "median_seconds": statistics.median(durations),
+            "missions_per_second": num_missions / min(durations),
+        }
+    )
+
+
+if __name__ == "__main__":
+    benchmark_mission_generation()
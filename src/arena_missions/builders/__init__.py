@@ -2,6 +2,13 @@ from arena_missions.builders.challenge_builder import (
     ChallengeBuilder,
     ChallengeBuilderFunction,
     ChallengeBuilderOutput,
+    ChallengeBuilderRegistry,
+    ChallengeFamily,
+)
+from arena_missions.builders.challenge_query import (
+    parse_challenge_query,
+    sample_challenge_builders,
+    select_challenge_builders,
 )
 from arena_missions.builders.mission_builder import MissionBuilder
 from arena_missions.builders.required_objects_builder import RequiredObjectBuilder
@@ -1,13 +1,14 @@
-from collections.abc import Iterator
-from copy import deepcopy
-from itertools import groupby
-from typing import Any, Callable, Optional, Union
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Set as AbstractSet
+from importlib import import_module
+from typing import Any, Callable, NamedTuple, Optional, TypeVar, Union
 
-from deepmerge import always_merger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+from pydantic.fields import ModelField
 
 from arena_missions.constants.arena import OfficeLayout, OfficeRoom
 from arena_missions.structures import HighLevelKey, RequiredObject, StateCondition, TaskGoal
+from arena_missions.structures.high_level_key import InstructionAction
 
 
 class ChallengeBuilderOutput(BaseModel):
@@ -39,16 +40,335 @@ class ChallengeBuilderOutput(BaseModel):
 
 ChallengeBuilderFunction = Callable[[], ChallengeBuilderOutput]
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def merge_into_model(model: ModelT, modifications: dict[str, Any]) -> ModelT:
+    """Merge the modifications into a copy of the model, like a deep merge of its dict.
+
+    Lists are extended and dicts are merged, the same as with `deepmerge.always_merger`. Only the
+    fields that are modified are copied and validated, and everything else is shared with the
+    original model, which is left untouched.
+    """
+    updated_fields: dict[str, Any] = {}
+
+    for field_name, modification in modifications.items():
+        model_field = _get_model_field(type(model), field_name)
+        updated_fields[model_field.name] = _merge_field_value(
+            getattr(model, model_field.name), modification, model_field, model.__dict__
+        )
+
+    return model.copy(update=updated_fields)
+
+
+def _get_model_field(model_type: type[BaseModel], field_name: str) -> ModelField:
+    """Get the field of the model from its name or its alias."""
+    if field_name in model_type.__fields__:
+        return model_type.__fields__[field_name]
+
+    for model_field in model_type.__fields__.values():
+        if model_field.alias == field_name:
+            return model_field
+
+    raise ValueError(f"`{model_type.__name__}` does not have the field `{field_name}`.")
+
+
+def _merge_field_value(
+    current_value: Any, modification: Any, model_field: ModelField, field_values: dict[str, Any]
+) -> Any:
+    """Merge the modification into the value of the field, and validate the result."""
+    if isinstance(current_value, BaseModel) and isinstance(modification, dict):
+        return merge_into_model(current_value, modification)
+
+    if (
+        isinstance(current_value, dict)
+        and isinstance(modification, dict)
+        and model_field.sub_fields
+    ):
+        # Merge each modified item of the dict, using the field for the values of the dict
+        item_field = model_field.sub_fields[0]
+        merged_value = dict(current_value)
+        for item_key, item_modification in modification.items():
+            merged_value[item_key] = (
+                _merge_field_value(current_value[item_key], item_modification, item_field, {})
+                if item_key in current_value
+                else _validate_field_value(item_modification, item_field, {})
+            )
+        return merged_value
+
+    if isinstance(current_value, list) and isinstance(modification, list):
+        return _validate_field_value([*current_value, *modification], model_field, field_values)
+
+    return _validate_field_value(modification, model_field, field_values)
+
+
+def _validate_field_value(
+    field_value: Any, model_field: ModelField, field_values: dict[str, Any]
+) -> Any:
+    """Validate the value for the field, the same way as when parsing the model."""
+    validated_value, validation_errors = model_field.validate(
+        field_value, field_values, loc=model_field.alias
+    )
+    if validation_errors:
+        raise ValidationError([validation_errors], ChallengeBuilderOutput)
+    return validated_value
+
+
+ChallengeBuilderEntry = tuple[HighLevelKey, ChallengeBuilderFunction]
+
+
+def get_allowed_values(field_value: Any) -> AbstractSet[Any]:
+    """Get the values that a field can have to match, where a set means any of its values."""
+    if isinstance(field_value, AbstractSet):
+        return field_value
+    return {field_value}
+
+
+class ChallengeFamily(NamedTuple):
+    """Challenges that a module registers, which are only registered once they are needed.
+
+    Each family declares the actions, and optionally the target objects, of the high-level keys
+    that it can register, so that only the families that can produce the challenges being looked
+    for need to be imported and built.
+    """
+
+    module: str
+    register_function: str
+    actions: frozenset[InstructionAction]
+    target_objects: Optional[frozenset[str]] = None
+    register_kwargs: Optional[dict[str, Any]] = None
+
+    @property
+    def name(self) -> str:
+        """Get the name of the family."""
+        return f"{self.module}.{self.register_function}"
+
+    def can_produce(self, field_values: dict[str, Any]) -> bool:
+        """Check if the family could register challenges whose high-level keys have the values."""
+        if "action" in field_values and self.actions.isdisjoint(
+            get_allowed_values(field_values["action"])
+        ):
+            return False
+
+        if self.target_objects is None or "target_object" not in field_values:
+            return True
+
+        return not self.target_objects.isdisjoint(
+            get_allowed_values(field_values["target_object"])
+        )
+
+    def register(self) -> None:
+        """Import the module and register all the challenges in the family."""
+        register_function = getattr(import_module(self.module), self.register_function)
+        register_function(**(self.register_kwargs or {}))
+
+
+class ChallengeBuilderRegistry:
+    """Registered challenge builders, indexed by their high-level key and each of its fields.
+
+    Challenge builders are kept in the order they were registered, alongside an index from each
+    high-level key to its functions and an index from each field value of the high-level keys to
+    the positions of the challenge builders, so that registering and looking up challenge
+    builders does not need to go through the entire registry.
+
+    Challenge families are registered lazily: they are only built when something looks for
+    challenges they could produce. Their challenges are ordered as if every family was registered
+    straight away, so the order does not depend on which families were needed first.
+    """
+
+    def __init__(self, entries: Iterable[ChallengeBuilderEntry] = ()) -> None:
+        self._entries: list[ChallengeBuilderEntry] = []
+        self._entry_order: list[tuple[int, int]] = []
+        self._identities: set[ChallengeBuilderEntry] = set()
+        self._functions_per_key: dict[HighLevelKey, list[ChallengeBuilderFunction]] = {}
+        self._positions_per_field_value: dict[tuple[str, Any], list[int]] = defaultdict(list)
+
+        self._families: list[ChallengeFamily] = []
+        self._pending_family_indices: set[int] = set()
+        self._loading_family_index: Optional[int] = None
+        self._staged_entries: list[tuple[tuple[int, int], ChallengeBuilderEntry]] = []
+
+        for high_level_key, func in entries:
+            self.add(high_level_key, func)
+
+    def __iter__(self) -> Iterator[ChallengeBuilderEntry]:
+        """Iterate over the challenge builders, in the order they were registered."""
+        self.load_families()
+        yield from self._entries
+
+    def __len__(self) -> int:
+        """Get the number of registered challenge builders."""
+        self.load_families()
+        return len(self._entries)
+
+    def __getitem__(self, index: int) -> ChallengeBuilderEntry:
+        """Get the challenge builder at the position in the registry."""
+        self.load_families()
+        return self._entries[index]
+
+    def __contains__(self, entry: object) -> bool:
+        """Check if the challenge builder is registered for the high-level key."""
+        self.load_families()
+        return entry in self._identities
+
+    @property
+    def pending_families(self) -> list[ChallengeFamily]:
+        """Get the families which have not been registered yet."""
+        return [self._families[index] for index in sorted(self._pending_family_indices)]
+
+    def add_family(self, family: ChallengeFamily) -> None:
+        """Add a family of challenges, to be registered once they are needed."""
+        self._pending_family_indices.add(len(self._families))
+        self._families.append(family)
+
+    def load_families(self, **field_values: Any) -> None:
+        """Register every pending family that could produce challenges with the field values."""
+        for family_index in sorted(self._pending_family_indices):
+            if not self._families[family_index].can_produce(field_values):
+                continue
+
+            # Remove it first so that a family which fails to load is not loaded again
+            self._pending_family_indices.remove(family_index)
+            self._loading_family_index = family_index
+            try:
+                self._families[family_index].register()
+            finally:
+                self._loading_family_index = None
+                self._add_staged_entries()
+
+    def add(self, high_level_key: HighLevelKey, func: ChallengeBuilderFunction) -> None:
+        """Register the challenge builder for the high-level key."""
+        if (high_level_key, func) in self._identities:
+            raise ValueError(
+                f"Challenge builder already registered for: ({high_level_key}, {func})."
+            )
+
+        # Challenges from a family go where the family was added, and any others go after every
+        # family which had been added before them
+        entry_order = (
+            self._loading_family_index
+            if self._loading_family_index is not None
+            else len(self._families),
+            len(self._identities),
+        )
+        self._identities.add((high_level_key, func))
+        self._staged_entries.append((entry_order, (high_level_key, func)))
+
+        # Challenges from a family are all added together once the family has been registered
+        if self._loading_family_index is None:
+            self._add_staged_entries()
+
+    def keys(self) -> list[HighLevelKey]:
+        """Get every high-level key, in the order they were first registered."""
+        self.load_families()
+        return list(self._functions_per_key.keys())
+
+    def get_functions(self, high_level_key: HighLevelKey) -> list[ChallengeBuilderFunction]:
+        """Get the challenge builders for the high-level key."""
+        self.load_families(
+            action=high_level_key.action, target_object=high_level_key.target_object
+        )
+        return list(self._functions_per_key.get(high_level_key, []))
+
+    def get_positions(self, **field_values: Any) -> list[int]:
+        """Get the positions of the challenge builders whose high-level keys have the values.
+
+        Each keyword is the name of a field of the `HighLevelKey`, such as `action="pickup"` or
+        `to_receptacle_is_container=True`. A set of values matches any of them, such as
+        `target_object={"Apple", "Bowl_01"}`. Only the families which could produce the
+        challenges are registered.
+        """
+        unknown_fields = field_values.keys() - HighLevelKey.__fields__.keys()
+        if unknown_fields:
+            raise ValueError(f"High-level keys do not have the fields: {sorted(unknown_fields)}")
+
+        self.load_families(**field_values)
+
+        if not field_values:
+            return list(range(len(self._entries)))
+
+        # Start from the rarest field, since the result can only get smaller
+        positions_per_field = sorted(
+            (
+                [
+                    position
+                    for allowed_value in get_allowed_values(field_value)
+                    for position in self._positions_per_field_value.get(
+                        (field_name, allowed_value), []
+                    )
+                ]
+                for field_name, field_value in field_values.items()
+            ),
+            key=len,
+        )
+        matching_positions = set(positions_per_field[0])
+        for positions in positions_per_field[1:]:
+            matching_positions.intersection_update(positions)
+
+        return sorted(matching_positions)
+
+    def filter(self, **field_values: Any) -> list[ChallengeBuilderEntry]:
+        """Get the challenge builders whose high-level keys have the values, in registry order."""
+        return [self._entries[position] for position in self.get_positions(**field_values)]
+
+    def _add_staged_entries(self) -> None:
+        """Add the staged challenge builders to the registry, keeping it in order."""
+        staged_entries = sorted(self._staged_entries, key=lambda staged_entry: staged_entry[0])
+        self._staged_entries = []
+
+        if not staged_entries:
+            return
+
+        # Most of the time, challenge builders are added after every other one
+        if not self._entry_order or staged_entries[0][0] > self._entry_order[-1]:
+            for entry_order, entry in staged_entries:
+                self._entries.append(entry)
+                self._entry_order.append(entry_order)
+                self._index_entry(len(self._entries) - 1)
+            return
+
+        merged_entries = sorted(
+            [*zip(self._entry_order, self._entries), *staged_entries],
+            key=lambda staged_entry: staged_entry[0],
+        )
+        self._entry_order = [entry_order for entry_order, _ in merged_entries]
+        self._entries = [entry for _, entry in merged_entries]
+        self._rebuild_indexes()
+
+    def _index_entry(self, position: int) -> None:
+        """Add the challenge builder at the position to the indexes."""
+        high_level_key, func = self._entries[position]
+        self._functions_per_key.setdefault(high_level_key, []).append(func)
+
+        for field_name, field_value in high_level_key:
+            self._positions_per_field_value[(field_name, field_value)].append(position)
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the indexes after challenge builders have been inserted before others."""
+        self._functions_per_key = {}
+        self._positions_per_field_value = defaultdict(list)
+
+        for position in range(len(self._entries)):
+            self._index_entry(position)
+
 
 class ChallengeBuilder:
     """Registrable-style class that registers challenge builders to easily generate them."""
 
-    _registry: list[tuple[HighLevelKey, ChallengeBuilderFunction]] = []
+    _registry: ChallengeBuilderRegistry = ChallengeBuilderRegistry()
 
-    def __iter__(self) -> Iterator[tuple[HighLevelKey, ChallengeBuilderFunction]]:
+    def __iter__(self) -> Iterator[ChallengeBuilderEntry]:
         """Iterate over the registry."""
         yield from self._registry
 
+    def __len__(self) -> int:
+        """Get the number of registered challenge builders."""
+        return len(self._registry)
+
+    def __getitem__(self, index: int) -> ChallengeBuilderEntry:
+        """Get the challenge builder at the index in the registry."""
+        return self._registry[index]
+
     @classmethod
     def register(
         cls, high_level_key: Union[str, HighLevelKey]
@@ -63,27 +383,16 @@ class ChallengeBuilder:
         )
 
         def decorator(func: ChallengeBuilderFunction) -> ChallengeBuilderFunction:
-            # Registry count before registering
-            registry_count = len(ChallengeBuilder._registry)  # noqa: WPS437
-
-            # Register the challenge builder
-            ChallengeBuilder._registry.append((parsed_high_level_key, func))  # noqa: WPS437
-
-            # Get the count after removing duplicates
-            registry_count_after_duplicates_removed = len(
-                set(ChallengeBuilder._registry)  # noqa: WPS437
-            )
-
-            # If the count is the same, then we didn't add a new challenge builder
-            if registry_count == registry_count_after_duplicates_removed:
-                raise ValueError(
-                    f"Challenge builder already registered for: ({parsed_high_level_key}, {func})."
-                )
-
+            ChallengeBuilder._registry.add(parsed_high_level_key, func)  # noqa: WPS437
             return func
 
         return decorator
 
+    @classmethod
+    def register_family(cls, family: ChallengeFamily) -> None:
+        """Register a family of challenges, which is only built once its challenges are needed."""
+        cls._registry.add_family(family)
+
     @classmethod
     def register_with_modifiers(
         cls,
@@ -105,20 +414,26 @@ class ChallengeBuilder:
     @classmethod
     def count_available_functions_per_key(cls) -> dict[HighLevelKey, int]:
         """List all keys and how many functions connect with them."""
-        key_counts: dict[HighLevelKey, int] = {}
-
-        # Sort the registry by the high-level key
-        sorted_registry = sorted(cls._registry, key=lambda x: x[0].key)
-
-        for k, g in groupby(sorted_registry, key=lambda x: x[0]):
-            key_counts[k] = len(list(g))
-
-        return key_counts
+        key_counts = {
+            high_level_key: len(cls._registry.get_functions(high_level_key))
+            for high_level_key in cls._registry.keys()
+        }
+        return dict(sorted(key_counts.items(), key=lambda key_count: key_count[0].key))
 
     @classmethod
     def list_available(cls) -> list[HighLevelKey]:
         """List all available high-level keys."""
-        return list({key for key, _ in cls._registry})
+        return cls._registry.keys()
+
+    @classmethod
+    def get_functions(cls, high_level_key: HighLevelKey) -> list[ChallengeBuilderFunction]:
+        """Get the challenge builders registered for the high-level key."""
+        return cls._registry.get_functions(high_level_key)
+
+    @classmethod
+    def filter(cls, **field_values: Any) -> list[ChallengeBuilderEntry]:
+        """Get the challenge builders whose high-level keys have the values for their fields."""
+        return cls._registry.filter(**field_values)
 
     @staticmethod
     def modify_challenge_builder_function_output(  # noqa: WPS602
@@ -127,12 +442,6 @@ class ChallengeBuilder:
         """Modify the output of a challenge builder function."""
 
         def wrapper() -> ChallengeBuilderOutput:
-            # Call the original function
-            output = function().dict(by_alias=True)
-            output = deepcopy(output)
-            # Modify the output
-            always_merger.merge(output, modified_kwargs)
-            # Return the modified output
-            return ChallengeBuilderOutput.parse_obj(output)
+            return merge_into_model(function(), modified_kwargs)
 
         return wrapper
@@ -0,0 +1,114 @@
+import random
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from convert_case import snake_case
+
+from arena_missions.builders.challenge_builder import ChallengeBuilder, ChallengeBuilderEntry
+from arena_missions.structures import HighLevelKey
+
+
+def parse_field_name(field_name: str) -> str:
+    """Parse the name of a field of the high-level key, such as `target-object`."""
+    parsed_field_name = snake_case(field_name.strip().lstrip("#"))
+
+    if parsed_field_name not in HighLevelKey.__fields__:
+        raise ValueError(f"High-level keys do not have the field `{parsed_field_name}`.")
+
+    return parsed_field_name
+
+
+def parse_field_value(field_name: str, field_value: str) -> Any:
+    """Parse the value for the field of the high-level key, the same way the key itself is."""
+    model_field = HighLevelKey.__fields__[field_name]
+    parsed_value, validation_errors = model_field.validate(field_value, {}, loc=field_name)
+
+    if validation_errors:
+        raise ValueError(f"`{field_value}` is not a valid value for `{field_name}`.")
+
+    return parsed_value
+
+
+def parse_challenge_query(query_parts: Sequence[str]) -> dict[str, Any]:
+    """Parse the parts of a query for challenges into the values for each field.
+
+    Each part is written like a part of a high-level key, such as `action=pickup`, or
+    `to-receptacle-is-container` for a flag. Separate values with commas to match any of them,
+    such as `target-object=Apple,Bowl_01`.
+    """
+    field_values: dict[str, Any] = {}
+
+    for query_part in query_parts:
+        field_name, _, field_value = query_part.partition("=")
+        field_name = parse_field_name(field_name)
+
+        # Flags are true if they are given without a value
+        if not field_value and HighLevelKey.__fields__[field_name].outer_type_ is bool:
+            field_value = "true"
+
+        allowed_values = {
+            parse_field_value(field_name, allowed_value.strip())
+            for allowed_value in field_value.split(",")
+        }
+        field_values[field_name] = (
+            allowed_values.pop() if len(allowed_values) == 1 else frozenset(allowed_values)
+        )
+
+    return field_values
+
+
+def sample_challenge_builders(
+    challenge_builder_entries: Sequence[ChallengeBuilderEntry],
+    *,
+    num_per_group: int,
+    group_by: Sequence[str] = ("action",),
+    rng: Optional[random.Random] = None,
+) -> list[ChallengeBuilderEntry]:
+    """Sample up to `num_per_group` challenge builders for each group, keeping their order.
+
+    Challenge builders are grouped by the values of the `group_by` fields of their high-level
+    keys, so that every action, or every combination of action and target object, is covered.
+    """
+    rng = rng or random.Random()
+    positions_per_group: dict[tuple[Any, ...], list[int]] = {}
+
+    for position, (high_level_key, _) in enumerate(challenge_builder_entries):
+        group = tuple(getattr(high_level_key, field_name) for field_name in group_by)
+        positions_per_group.setdefault(group, []).append(position)
+
+    sampled_positions = sorted(
+        sampled_position
+        for group_positions in positions_per_group.values()
+        for sampled_position in rng.sample(
+            group_positions, k=min(num_per_group, len(group_positions))
+        )
+    )
+    return [challenge_builder_entries[position] for position in sampled_positions]
+
+
+def select_challenge_builders(
+    challenge_builder: ChallengeBuilder,
+    query_parts: Sequence[str] = (),
+    *,
+    num_per_group: Optional[int] = None,
+    group_by: Sequence[str] = ("action",),
+    rng_seed: Optional[int] = None,
+) -> list[ChallengeBuilderEntry]:
+    """Select the challenge builders that match the query, and sample them if asked to.
+
+    The `group_by` fields are written the same way as in the query, such as `target-object`.
+    Only the challenge families that could match the query are built.
+    """
+    group_by = [parse_field_name(field_name) for field_name in group_by]
+
+    challenge_builder_entries = challenge_builder.filter(**parse_challenge_query(query_parts))
+
+    if num_per_group is None:
+        return challenge_builder_entries
+
+    return sample_challenge_builders(
+        challenge_builder_entries,
+        num_per_group=num_per_group,
+        group_by=group_by,
+        rng=random.Random(rng_seed),
+    )
@@ -1,9 +1,13 @@
+import hashlib
+import multiprocessing
 import random
 from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, get_args
 
 from arena_missions.builders.challenge_builder import (
     ChallengeBuilder,
+    ChallengeBuilderEntry,
     ChallengeBuilderFunction,
     ChallengeBuilderOutput,
 )
@@ -12,6 +16,32 @@ from arena_missions.constants.arena import OfficeLayout
 from arena_missions.structures import CDF, CDFScene, HighLevelKey, Mission, RequiredObject
 
 
+# The mission builder and challenge builders used by each worker process when generating missions
+# in parallel
+_worker_mission_builder: Optional["MissionBuilder"] = None
+_worker_challenge_builder_entries: list[ChallengeBuilderEntry] = []
+
+
+def _initialise_worker(
+    mission_builder: "MissionBuilder", challenge_builder_entries: list[ChallengeBuilderEntry]
+) -> None:
+    """Store the mission builder and the challenge builders to run for the worker process."""
+    global _worker_mission_builder, _worker_challenge_builder_entries  # noqa: WPS420
+    _worker_mission_builder = mission_builder  # noqa: WPS442
+    _worker_challenge_builder_entries = challenge_builder_entries  # noqa: WPS442
+
+
+def _generate_mission_in_worker(entry_index: int, rng_seed: int) -> Mission:
+    """Generate the mission for the challenge builder at the index."""
+    if _worker_mission_builder is None:
+        raise RuntimeError("The worker process has not been given a mission builder.")
+
+    high_level_key, challenge_builder_function = _worker_challenge_builder_entries[entry_index]
+    return _worker_mission_builder.generate_mission(
+        high_level_key, challenge_builder_function, rng=random.Random(rng_seed)
+    )
+
+
 class MissionBuilder:
     """Build missions for the Arena."""
 
@@ -31,19 +61,101 @@ class MissionBuilder:
         """Convert the Unity Scene RNG seed to a string for the `floor_plan`."""
         return str(self._unity_scene_rng_seed) if self._unity_scene_rng_seed is not None else "-1"
 
-    def generate_all_missions(self) -> Iterator[Mission]:
-        """Generate all missions."""
-        yield from (
-            self.generate_mission(high_level_key, challenge_builder_function)
-            for high_level_key, challenge_builder_function in self.challenge_builder
+    def generate_all_missions(
+        self, *, num_workers: int = 1, rng_seed: Optional[int] = None
+    ) -> Iterator[Mission]:
+        """Generate all missions, in the same order as the challenge builder registry."""
+        yield from self.generate_missions(
+            list(self.challenge_builder), num_workers=num_workers, rng_seed=rng_seed
         )
 
+    def generate_missions(
+        self,
+        challenge_builder_entries: list[ChallengeBuilderEntry],
+        *,
+        num_workers: int = 1,
+        rng_seed: Optional[int] = None,
+    ) -> Iterator[Mission]:
+        """Generate the missions for the challenge builders, in the same order.
+
+        When there is more than one worker, the missions are generated in a pool of processes and
+        streamed back in order. Each mission gets its own RNG, seeded from the `rng_seed` and its
+        high-level key, so the missions are identical for any number of workers, and whether they
+        are generated with all the other missions or not. Without a seed, a new one is picked
+        every time.
+        """
+        if rng_seed is None:
+            rng_seed = random.getrandbits(64)
+
+        mission_rng_seeds = self.get_mission_rng_seeds(challenge_builder_entries, rng_seed)
+
+        if num_workers <= 1:
+            yield from (
+                self.generate_mission(
+                    high_level_key, challenge_builder_function, rng=random.Random(mission_rng_seed)
+                )
+                for (high_level_key, challenge_builder_function), mission_rng_seed in zip(
+                    challenge_builder_entries, mission_rng_seeds
+                )
+            )
+            return
+
+        # The challenge builders are closures which cannot be pickled, so forking lets the workers
+        # inherit them and only the index of each challenge builder is sent to them.
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_initialise_worker,
+            initargs=(self, challenge_builder_entries),
+        ) as executor:
+            yield from executor.map(
+                _generate_mission_in_worker,
+                range(len(challenge_builder_entries)),
+                mission_rng_seeds,
+                chunksize=max(1, len(challenge_builder_entries) // (num_workers * 4)),
+            )
+
+    def get_mission_rng_seeds(
+        self, challenge_builder_entries: list[ChallengeBuilderEntry], rng_seed: int
+    ) -> list[int]:
+        """Derive the RNG seed for the mission of each challenge builder from the master seed.
+
+        Seeds come from the high-level key of each mission, and how many challenge builders for
+        the same key are registered before it, so they do not change when challenges for other
+        keys are registered.
+        """
+        function_positions_per_key: dict[HighLevelKey, dict[int, int]] = {}
+        mission_rng_seeds = []
+
+        for high_level_key, challenge_builder_function in challenge_builder_entries:
+            if high_level_key not in function_positions_per_key:
+                function_positions_per_key[high_level_key] = {
+                    id(func): position
+                    for position, func in enumerate(
+                        self.challenge_builder.get_functions(high_level_key)
+                    )
+                }
+
+            function_position = function_positions_per_key[high_level_key][
+                id(challenge_builder_function)
+            ]
+            mission_hash = hashlib.sha256(
+                f"{rng_seed}:{high_level_key.key}:{function_position}".encode()
+            ).digest()
+            mission_rng_seeds.append(int.from_bytes(mission_hash[:8], "big"))
+
+        return mission_rng_seeds
+
     def generate_mission(
-        self, high_level_key: HighLevelKey, challenge_builder_function: ChallengeBuilderFunction
+        self,
+        high_level_key: HighLevelKey,
+        challenge_builder_function: ChallengeBuilderFunction,
+        *,
+        rng: Optional[random.Random] = None,
     ) -> Mission:
         """Generate a mission."""
         builder_output = challenge_builder_function()
-        cdf = self.generate_cdf(builder_output)
+        cdf = self.generate_cdf(builder_output, rng=rng)
         return Mission(
             high_level_key=high_level_key,
             plan=builder_output.plan,
@@ -52,12 +164,22 @@ class MissionBuilder:
             randomise_start_position=builder_output.randomise_start_position,
         )
 
-    def generate_cdf(self, challenge_builder_output: ChallengeBuilderOutput) -> CDF:
-        """Generate a challenge."""
+    def generate_cdf(
+        self,
+        challenge_builder_output: ChallengeBuilderOutput,
+        *,
+        rng: Optional[random.Random] = None,
+    ) -> CDF:
+        """Generate a challenge.
+
+        Any choices that the challenge builder leaves open are made with the `rng`, or randomly
+        if there isn't one.
+        """
+        rng = rng or random.Random()
         required_objects = [
             *challenge_builder_output.required_objects_list,
             *self.generate_default_arena_objects_if_required(
-                challenge_builder_output.include_all_default_objects
+                challenge_builder_output.include_all_default_objects, rng=rng
             ),
         ]
 
@@ -66,7 +188,7 @@ class MissionBuilder:
             floor_plan=self.cdf_floor_plan,
             required_objects=required_objects,
             layoutOverride=self.generate_office_layout_if_required(
-                challenge_builder_output.office_layout
+                challenge_builder_output.office_layout, rng=rng
             ),
         )
         return CDF(
@@ -76,18 +198,20 @@ class MissionBuilder:
         )
 
     def generate_default_arena_objects_if_required(
-        self, include_all_default_objects: Optional[bool]
+        self, include_all_default_objects: Optional[bool], *, rng: Optional[random.Random] = None
     ) -> list[RequiredObject]:
         """Generate default arena objects."""
         if include_all_default_objects is None:
-            include_all_default_objects = random.choice([True, False])
+            include_all_default_objects = (rng or random.Random()).choice([True, False])
 
         return (
             self.required_object_builder.default_objects() if include_all_default_objects else []
         )
 
     def generate_office_layout_if_required(
-        self, office_layout: Optional[OfficeLayout]
+        self, office_layout: Optional[OfficeLayout], *, rng: Optional[random.Random] = None
     ) -> OfficeLayout:
         """Generate office layout."""
-        return office_layout if office_layout else random.choice(get_args(OfficeLayout))
+        if office_layout:
+            return office_layout
+        return (rng or random.Random()).choice(get_args(OfficeLayout))
@@ -1,11 +1,20 @@
 from typing import Literal, Optional
 
 from arena_missions.constants.arena import OfficeRoom
-from arena_missions.structures import ObjectInstanceId, RequiredObject, RequiredObjectState
+from arena_missions.structures import (
+    FrozenRequiredObject,
+    ObjectInstanceId,
+    RequiredObject,
+    RequiredObjectState,
+)
 
 
 class RequiredObjectBuilder:
-    """Simplify object building within the arena."""
+    """Simplify object building within the arena.
+
+    Objects are only made from known-good constants, so they are created without being validated,
+    and are validated once they are added to a CDF.
+    """
 
     num_doors: int = 7
     num_light_switches: int = 8
@@ -16,26 +25,42 @@ class RequiredObjectBuilder:
     max_num_lab1_desks: int = 5
     max_num_lab2_desks: int = 3
 
+    _default_objects: Optional[tuple[FrozenRequiredObject, ...]] = None
+
     def default_objects(self) -> list[RequiredObject]:
-        """Generate all default objects for the arena."""
-        return [
-            *self.doors(),
-            *self.light_switches(),
-            *self.broken_cords(),
-            *self.fuse_boxes(),
-            *self.computer_monitors(),
-        ]
+        """Get all default objects for the arena.
+
+        These are the same for every mission, so they are only built once and are shared between
+        every mission. They are frozen so that changing one cannot change every other mission.
+        """
+        if self._default_objects is None:
+            self._default_objects = tuple(
+                FrozenRequiredObject.from_required_object(required_object)
+                for required_object in (
+                    *self.doors(),
+                    *self.light_switches(),
+                    *self.broken_cords(),
+                    *self.fuse_boxes(),
+                    *self.computer_monitors(),
+                )
+            )
+
+        return list(self._default_objects)
 
     def color_changer(self) -> RequiredObject:
         """Generate the color changer for the arena."""
-        return RequiredObject.from_string("ColorChangerStation_1")
+        return RequiredObject.trusted(name=ObjectInstanceId("ColorChangerStation_1"))
 
     def doors(self, *, is_open: bool = True) -> list[RequiredObject]:
         """Generate all 7 doors for the arena."""
         return [
-            RequiredObject(
-                name=ObjectInstanceId.parse(f"Door_01_{door_num}"),
-                state=[RequiredObjectState.from_parts("isOpen", "true" if is_open else "false")],
+            RequiredObject.trusted(
+                name=ObjectInstanceId(f"Door_01_{door_num}"),
+                state=[
+                    RequiredObjectState.from_trusted_parts(
+                        "isOpen", "true" if is_open else "false"
+                    )
+                ],
             )
             for door_num in range(1, self.num_doors + 1)
         ]
@@ -43,8 +68,8 @@ class RequiredObjectBuilder:
     def light_switches(self) -> list[RequiredObject]:
         """Generate all 8 light switches for the arena."""
         return [
-            RequiredObject(
-                name=ObjectInstanceId.parse(f"LightSwitch_01_{switch_num}"),
+            RequiredObject.trusted(
+                name=ObjectInstanceId(f"LightSwitch_01_{switch_num}"),
             )
             for switch_num in range(1, self.num_light_switches + 1)
         ]
@@ -52,10 +77,12 @@ class RequiredObjectBuilder:
     def broken_cords(self, *, is_on: bool = False) -> list[RequiredObject]:
         """Generate all 3 broken cords for the arena."""
         return [
-            RequiredObject(
-                name=ObjectInstanceId.parse(f"Broken_Cord_01_{cord_num}"),
+            RequiredObject.trusted(
+                name=ObjectInstanceId(f"Broken_Cord_01_{cord_num}"),
                 state=[
-                    RequiredObjectState.from_parts("isToggledOn", "true" if is_on else "false")
+                    RequiredObjectState.from_trusted_parts(
+                        "isToggledOn", "true" if is_on else "false"
+                    )
                 ],
             )
             for cord_num in range(1, self.num_broken_cords + 1)
@@ -64,11 +91,11 @@ class RequiredObjectBuilder:
     def fuse_boxes(self) -> list[RequiredObject]:
         """Generate all fuse boxes for the arena."""
         gray_fuse_boxes = [
-            RequiredObject(name=ObjectInstanceId.parse(f"FuseBox_01_{fuse_box_num}"))
+            RequiredObject.trusted(name=ObjectInstanceId(f"FuseBox_01_{fuse_box_num}"))
             for fuse_box_num in range(1, self.num_gray_fuse_boxes + 1)
         ]
         red_fuse_boxes = [
-            RequiredObject(name=ObjectInstanceId.parse(f"FuseBox_02_{fuse_box_num}"))
+            RequiredObject.trusted(name=ObjectInstanceId(f"FuseBox_02_{fuse_box_num}"))
             for fuse_box_num in range(1, self.num_red_fuse_boxes + 1)
         ]
         return [*gray_fuse_boxes, *red_fuse_boxes]
@@ -76,88 +103,90 @@ class RequiredObjectBuilder:
     def computer_monitors(self) -> list[RequiredObject]:
         """Generate all computer monitors for the arena."""
         return [
-            RequiredObject(name=ObjectInstanceId.parse(f"Computer_Monitor_01_{monitor_num}"))
+            RequiredObject.trusted(name=ObjectInstanceId(f"Computer_Monitor_01_{monitor_num}"))
             for monitor_num in range(1, self.num_computer_monitors + 1)
         ]
 
     def freeze_ray(self) -> RequiredObject:
         """Generate the freeze ray for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("FreezeRay_1"))
+        return RequiredObject.trusted(name=ObjectInstanceId("FreezeRay_1"))
 
     def emotion_tester(self) -> RequiredObject:
         """Generate the emotion tester for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("TAMPrototypeHead_01_1"))
+        return RequiredObject.trusted(name=ObjectInstanceId("TAMPrototypeHead_01_1"))
 
     def portal_generator(self) -> RequiredObject:
         """Generate the portal generator for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("PortalGenerator_10000"))
+        return RequiredObject.trusted(name=ObjectInstanceId("PortalGenerator_10000"))
 
     def laser(self) -> RequiredObject:
         """Generate the laser for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("Laser_1"))
+        return RequiredObject.trusted(name=ObjectInstanceId("Laser_1"))
 
     def gravity_pad(self) -> RequiredObject:
         """Generate the gravity pad for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("GravityPad_1"))
+        return RequiredObject.trusted(name=ObjectInstanceId("GravityPad_1"))
 
     def fridge(self, *, room: OfficeRoom = "BreakRoom", is_open: bool = False) -> RequiredObject:
         """Generate the fridge for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("FridgeLower_02_1"),
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("FridgeLower_02_1"),
             state=[
-                RequiredObjectState.from_parts("isOpen", "true" if is_open else "false"),
-                RequiredObjectState.from_parts("removeInitialContainedItems", "true"),
+                RequiredObjectState.from_trusted_parts("isOpen", "true" if is_open else "false"),
+                RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true"),
             ],
             roomLocation=[room],
         )
 
     def freezer(self, *, room: OfficeRoom = "BreakRoom", is_open: bool = False) -> RequiredObject:
         """Generate the freezer for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("FridgeUpper_02_1"),
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("FridgeUpper_02_1"),
             state=[
-                RequiredObjectState.from_parts("isOpen", "true" if is_open else "false"),
-                RequiredObjectState.from_parts("removeInitialContainedItems", "true"),
+                RequiredObjectState.from_trusted_parts("isOpen", "true" if is_open else "false"),
+                RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true"),
             ],
             roomLocation=[room],
         )
 
     def time_machine(self, *, room: OfficeRoom = "BreakRoom") -> RequiredObject:
         """Generate the time machine for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("YesterdayMachine_01_1"), roomLocation=[room]
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("YesterdayMachine_01_1"), roomLocation=[room]
         )
 
     def carrot_maker(self, *, room: OfficeRoom = "Lab2") -> RequiredObject:
         """Generate the carrot maker for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("EAC_Machine_1"), roomLocation=[room])
+        return RequiredObject.trusted(name=ObjectInstanceId("EAC_Machine_1"), roomLocation=[room])
 
     def microwave(self, *, room: OfficeRoom = "BreakRoom") -> RequiredObject:
         """Generate the microwave for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("Microwave_01_1"),
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("Microwave_01_1"),
             state=[
-                RequiredObjectState.from_parts("removeInitialContainedItems", "true"),
-                RequiredObjectState.from_parts("isEmpty", "true"),
+                RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true"),
+                RequiredObjectState.from_trusted_parts("isEmpty", "true"),
             ],
             roomLocation=[room],
         )
 
     def robotic_arm(self, *, is_arm_lifted: bool = True) -> RequiredObject:
         """Generate the robotic arm for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("RoboticArm_01_1"),
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("RoboticArm_01_1"),
             state=[
-                RequiredObjectState.from_parts("isToggledOn", "true" if is_arm_lifted else "false")
+                RequiredObjectState.from_trusted_parts(
+                    "isToggledOn", "true" if is_arm_lifted else "false"
+                )
             ],
         )
 
     def fork_lift(self, *, is_fork_lifted: bool = True) -> RequiredObject:
         """Generate the fork lift for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("ForkLift_1"),
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("ForkLift_1"),
             state=[
-                RequiredObjectState.from_parts(
+                RequiredObjectState.from_trusted_parts(
                     "isToggledOn", "true" if is_fork_lifted else "false"
                 )
             ],
@@ -167,8 +196,8 @@ class RequiredObjectBuilder:
         self, *, fill_with: Optional[Literal["Coffee", "Water"]] = None
     ) -> RequiredObject:
         """Generate the coffee pot for the arena."""
-        coffee_pot = RequiredObject(
-            name=ObjectInstanceId.parse("CoffeePot_01_1"), roomLocation=["BreakRoom"]
+        coffee_pot = RequiredObject.trusted(
+            name=ObjectInstanceId("CoffeePot_01_1"), roomLocation=["BreakRoom"]
         )
 
         if fill_with == "Coffee":
@@ -182,29 +211,29 @@ class RequiredObjectBuilder:
 
     def coffee_unmaker(self) -> RequiredObject:
         """Generate the coffee unmaker for the arena."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("CoffeeUnMaker_01_1"), roomLocation=["BreakRoom"]
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("CoffeeUnMaker_01_1"), roomLocation=["BreakRoom"]
         )
 
     def breakroom_table(self) -> RequiredObject:
         """Create the round table in the breakroom."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("TableRound_02_1"),
-            state=[RequiredObjectState.from_parts("removeInitialContainedItems", "true")],
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("TableRound_02_1"),
+            state=[RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true")],
             roomLocation=["BreakRoom"],
         )
 
     def breakroom_countertop(self) -> RequiredObject:
         """Create the countertop in the breakroom."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("KitchenCounterTop_02_1"),
-            state=[RequiredObjectState.from_parts("removeInitialContainedItems", "true")],
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("KitchenCounterTop_02_1"),
+            state=[RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true")],
             roomLocation=["BreakRoom"],
         )
 
     def printer(self) -> RequiredObject:
         """Generate the printer for the arena."""
-        return RequiredObject(name=ObjectInstanceId.parse("Printer_3D_1"))
+        return RequiredObject.trusted(name=ObjectInstanceId("Printer_3D_1"))
 
     def main_office_desks(self) -> list[RequiredObject]:
         """Returns office desks in main office."""
@@ -218,9 +247,13 @@ class RequiredObjectBuilder:
 
         for desk_name in desk_names:
             desk_objects.append(
-                RequiredObject(
-                    name=ObjectInstanceId.parse(f"{desk_name}_1"),
-                    state=[RequiredObjectState.from_parts("removeInitialContainedItems", "true")],
+                RequiredObject.trusted(
+                    name=ObjectInstanceId(f"{desk_name}_1"),
+                    state=[
+                        RequiredObjectState.from_trusted_parts(
+                            "removeInitialContainedItems", "true"
+                        )
+                    ],
                     roomLocation=["MainOffice"],
                 )
             )
@@ -229,36 +262,36 @@ class RequiredObjectBuilder:
 
     def reception_desk(self) -> RequiredObject:
         """Returns the reception desk in the reception."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("ReceptionDesk_1"),
-            state=[RequiredObjectState.from_parts("removeInitialContainedItems", "true")],
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("ReceptionDesk_1"),
+            state=[RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true")],
             roomLocation=["Reception"],
         )
 
     def manager_desk(self) -> RequiredObject:
         """Returns the manager desk in the small office."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("ManagerDesk_1"),
-            state=[RequiredObjectState.from_parts("removeInitialContainedItems", "true")],
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("ManagerDesk_1"),
+            state=[RequiredObjectState.from_trusted_parts("removeInitialContainedItems", "true")],
             roomLocation=["SmallOffice"],
         )
 
     def warehouse_cabinet(self) -> RequiredObject:
         """Returns the warehouse cabinet."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("KitchenCabinet_02_1"), roomLocation=["Warehouse"]
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("KitchenCabinet_02_1"), roomLocation=["Warehouse"]
         )
 
     def warehouse_metal_table(self) -> RequiredObject:
         """Returns the warehouse metal table."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("Table_Metal_01_1"), roomLocation=["Warehouse"]
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("Table_Metal_01_1"), roomLocation=["Warehouse"]
         )
 
     def warehouse_wooden_table(self) -> RequiredObject:
         """Returns the warehouse wooden table."""
-        return RequiredObject(
-            name=ObjectInstanceId.parse("SM_Prop_Table_02_1"), roomLocation=["Warehouse"]
+        return RequiredObject.trusted(
+            name=ObjectInstanceId("SM_Prop_Table_02_1"), roomLocation=["Warehouse"]
         )
 
     def lab1_desks(self) -> list[RequiredObject]:
@@ -268,8 +301,8 @@ class RequiredObjectBuilder:
         desks = []
 
         for desk_idx in range(1, self.max_num_lab1_desks + 1):
-            desk_id = ObjectInstanceId.parse(desk_format.format(instance_count=desk_idx))
-            desk = RequiredObject(name=desk_id)
+            desk_id = ObjectInstanceId(desk_format.format(instance_count=desk_idx))
+            desk = RequiredObject.trusted(name=desk_id)
             desk.update_room("Lab1")
             desks.append(desk)
 
@@ -282,8 +315,8 @@ class RequiredObjectBuilder:
         desks = []
 
         for desk_idx in range(1, self.max_num_lab2_desks + 1):
-            desk_id = ObjectInstanceId.parse(desk_format.format(instance_count=desk_idx))
-            desk = RequiredObject(name=desk_id)
+            desk_id = ObjectInstanceId(desk_format.format(instance_count=desk_idx))
+            desk = RequiredObject.trusted(name=desk_id)
             desk.update_room("Lab2")
             desks.append(desk)
 
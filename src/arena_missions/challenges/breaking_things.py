@@ -171,7 +171,8 @@ def create_break_object_on_desks_challenges(
     with_color_variants: bool = False,
 ) -> None:
     """Register challenges."""
-    target_desk = random.choice(desks)
+    # Seed the choice with the object so that the registered challenges are the same every time
+    target_desk = random.Random(str(object_instance_id)).choice(desks)
     required_object_builder = RequiredObjectBuilder()
 
     # Turn the fork lift on
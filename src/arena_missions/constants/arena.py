@@ -1,5 +1,7 @@
+from collections.abc import Mapping
 from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Literal
 
 import orjson
@@ -449,19 +451,41 @@ FluidType = Literal["Water", "Milk", "Coffee", "None"]
 
 
 @lru_cache(maxsize=1)
-def load_object_id_to_readable_name_map() -> dict[ObjectIds, str]:
-    """Load mapping of Object ID to a readable name."""
+def load_object_id_to_readable_name_map() -> Mapping[ObjectIds, str]:
+    """Load mapping of Object ID to a readable name.
+
+    The mapping is shared by everything that uses it, so it cannot be changed.
+    """
     json_file = Path(__file__).parent.joinpath("object_id_to_readable_name.json")
     mapping = orjson.loads(json_file.read_bytes())
-    return mapping
+    return MappingProxyType(mapping)
 
 
 @lru_cache(maxsize=1)
+def load_readable_name_to_object_ids_map() -> Mapping[str, frozenset[ObjectIds]]:
+    """Load mapping of each readable name to every Object ID with that name."""
+    object_ids_per_readable_name: dict[str, set[ObjectIds]] = {}
+    for object_id, readable_name in load_object_id_to_readable_name_map().items():
+        object_ids_per_readable_name.setdefault(readable_name, set()).add(object_id)
+
+    return MappingProxyType(
+        {
+            readable_name: frozenset(object_ids)
+            for readable_name, object_ids in object_ids_per_readable_name.items()
+        }
+    )
+
+
 def get_all_readable_names() -> list[str]:
     """Get all the readable names."""
-    return list(set(load_object_id_to_readable_name_map().values()))
+    return list(load_readable_name_to_object_ids_map().keys())
+
+
+def get_object_ids_with_readable_name(name: str) -> frozenset[ObjectIds]:
+    """Get every Object ID with the readable name, if there are any."""
+    return load_readable_name_to_object_ids_map().get(name, frozenset())
 
 
 def is_readable_name(name: str) -> bool:
     """Check if the name is a readable name."""
-    return name in get_all_readable_names()
+    return name in load_readable_name_to_object_ids_map()
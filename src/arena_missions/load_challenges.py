@@ -1,52 +1,154 @@
-from arena_missions.challenges.ambiguous_pickup import register_ambiguous_pickup_challenges
-from arena_missions.challenges.breaking_things import (
-    register_breaking_things_challenges,
-    register_breaking_things_on_desks_challenges,
-)
-from arena_missions.challenges.clean_dirty_plate import register_clean_dirty_plates
-from arena_missions.challenges.fill_object_in_sink import register_fill_objects_in_sink
-from arena_missions.challenges.objects_in_containers import (
-    register_objects_with_freezer_challenges,
-    register_objects_with_fridge_challenges,
-    register_warehouse_cabinet_challenges,
-)
-from arena_missions.challenges.operate_carrot_maker import register_carrot_maker_challenges
-from arena_missions.challenges.operate_microwave import register_heat_things
-from arena_missions.challenges.operate_printer import register_print_things
-from arena_missions.challenges.operate_time_machine import (
-    register_repair_broken_things,
-    register_repair_carrots,
-)
-from arena_missions.challenges.pickup_from_printer import register_pickup_from_printer_challenges
-from arena_missions.challenges.pickup_stack import register_pickup_plate_stack_challenges
-from arena_missions.challenges.place_stack import (
-    register_place_bowl_stack_from_gravity_pad,
-    register_place_plate_stack_challenges,
+from arena_missions.builders.challenge_builder import ChallengeBuilder, ChallengeFamily
+
+
+CHALLENGE_FAMILIES = (
+    ChallengeFamily(
+        module="arena_missions.challenges.objects_in_containers",
+        register_function="register_objects_with_fridge_challenges",
+        actions=frozenset(("pickup", "place")),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.objects_in_containers",
+        register_function="register_objects_with_freezer_challenges",
+        actions=frozenset(("pickup", "place")),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.objects_in_containers",
+        register_function="register_warehouse_cabinet_challenges",
+        actions=frozenset(("pickup", "place")),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.ambiguous_pickup",
+        register_function="register_ambiguous_pickup_challenges",
+        actions=frozenset(("pickup",)),
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.pickup_stack",
+        register_function="register_pickup_plate_stack_challenges",
+        actions=frozenset(("pickup",)),
+        target_objects=frozenset(("FoodPlate_01",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.place_stack",
+        register_function="register_place_plate_stack_challenges",
+        actions=frozenset(("place",)),
+        target_objects=frozenset(("FoodPlate_01",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    # "Interaction" challenges / ones that are "nicher"
+    ChallengeFamily(
+        module="arena_missions.challenges.operate_time_machine",
+        register_function="register_repair_broken_things",
+        actions=frozenset(("interact",)),
+        target_objects=frozenset(("Bowl_01", "FoodPlate_01")),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.operate_carrot_maker",
+        register_function="register_carrot_maker_challenges",
+        actions=frozenset(("interact",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.fill_object_in_sink",
+        register_function="register_fill_objects_in_sink",
+        actions=frozenset(("fill",)),
+        target_objects=frozenset(
+            ("Bowl_01", "CoffeeMug_Boss", "CoffeeMug_Yellow", "CoffeePot_01")
+        ),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.operate_microwave",
+        register_function="register_heat_things",
+        actions=frozenset(("interact",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.clean_dirty_plate",
+        register_function="register_clean_dirty_plates",
+        actions=frozenset(("clean",)),
+        target_objects=frozenset(("FoodPlate_01",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.using_coffee_unmaker",
+        register_function="register_coffee_unmaker_challenges",
+        actions=frozenset(("interact",)),
+        target_objects=frozenset(
+            ("Bowl_01", "CoffeeMug_Boss", "CoffeeMug_Yellow", "CoffeePot_01")
+        ),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.operate_printer",
+        register_function="register_print_things",
+        actions=frozenset(("interact",)),
+        target_objects=frozenset(
+            (
+                "Printer_Cartridge_Figure",
+                "Printer_Cartridge_Hammer",
+                "Printer_Cartridge_Lever",
+                "Printer_Cartridge_Mug",
+            )
+        ),
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.using_color_changer",
+        register_function="register_color_changer_challenges",
+        actions=frozenset(("interact",)),
+        register_kwargs={"enable_start_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.operate_time_machine",
+        register_function="register_repair_carrots",
+        actions=frozenset(("interact",)),
+        target_objects=frozenset(("Carrot_01",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.pickup_from_printer",
+        register_function="register_pickup_from_printer_challenges",
+        actions=frozenset(("pickup",)),
+        target_objects=frozenset(
+            (
+                "Printer_3D_1_Spawned_ActionFigure",
+                "Printer_3D_1_Spawned_CoffeeMug_Yellow",
+                "Printer_3D_1_Spawned_FuseBox_01_Lever",
+                "Printer_3D_1_Spawned_Hammer",
+            )
+        ),
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.place_stack",
+        register_function="register_place_bowl_stack_from_gravity_pad",
+        actions=frozenset(("place",)),
+        target_objects=frozenset(("Bowl_01",)),
+        register_kwargs={"enable_color_variants": True},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.breaking_things",
+        register_function="register_breaking_things_on_desks_challenges",
+        actions=frozenset(("break",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
+    ChallengeFamily(
+        module="arena_missions.challenges.breaking_things",
+        register_function="register_breaking_things_challenges",
+        actions=frozenset(("break",)),
+        register_kwargs={"enable_color_variants": False},
+    ),
 )
-from arena_missions.challenges.using_coffee_unmaker import register_coffee_unmaker_challenges
-from arena_missions.challenges.using_color_changer import register_color_changer_challenges
 
 
 def load_challenges() -> None:
-    """Run all the register functions to load the challenges."""
-    register_objects_with_fridge_challenges(enable_color_variants=False)
-    register_objects_with_freezer_challenges(enable_color_variants=False)
-    register_warehouse_cabinet_challenges(enable_color_variants=False)
-    register_ambiguous_pickup_challenges()
-    register_pickup_plate_stack_challenges(enable_color_variants=False)
-    register_place_plate_stack_challenges(enable_color_variants=False)
+    """Add every family of challenges to the registry.
 
-    # "Interaction" challenges / ones that are "nicher"
-    register_repair_broken_things(enable_color_variants=False)
-    register_carrot_maker_challenges(enable_color_variants=False)
-    register_fill_objects_in_sink(enable_color_variants=False)
-    register_heat_things(enable_color_variants=False)
-    register_clean_dirty_plates(enable_color_variants=False)
-    register_coffee_unmaker_challenges(enable_color_variants=False)
-    register_print_things()
-    register_color_changer_challenges(enable_start_color_variants=False)
-    register_repair_carrots(enable_color_variants=False)
-    register_pickup_from_printer_challenges()
-    register_place_bowl_stack_from_gravity_pad(enable_color_variants=True)
-    register_breaking_things_on_desks_challenges(enable_color_variants=False)
-    register_breaking_things_challenges(enable_color_variants=False)
+    The challenges in each family are only built once something looks for them.
+    """
+    for challenge_family in CHALLENGE_FAMILIES:
+        ChallengeBuilder.register_family(challenge_family)
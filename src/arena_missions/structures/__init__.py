@@ -2,7 +2,12 @@ from arena_missions.structures.cdf import CDF, CDFPortal, CDFScene
 from arena_missions.structures.high_level_key import HighLevelKey
 from arena_missions.structures.mission import Mission, MissionTrajectory
 from arena_missions.structures.object_id import ObjectId, ObjectInstanceId
-from arena_missions.structures.required_object import RequiredObject, RequiredObjectState
+from arena_missions.structures.required_object import (
+    FrozenRequiredObject,
+    FrozenRequiredObjectState,
+    RequiredObject,
+    RequiredObjectState,
+)
 from arena_missions.structures.state_condition import (
     AndExpression,
     CanBeSeenExpression,
@@ -1,11 +1,13 @@
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator, validator
 
 from arena_missions.constants.arena import OfficeLayout, OfficeRoom
+from arena_missions.structures.object_id import ObjectInstanceId
 from arena_missions.structures.required_object import RequiredObject
 from arena_missions.structures.state_condition import StateCondition
 from arena_missions.structures.task_goal import TaskGoal
+from arena_missions.structures.trusted import validate_trusted
 
 
 CDF_GAME_INTERACTIONS: dict[str, Any] = {  # noqa: WPS407
@@ -53,6 +55,29 @@ class CDFScene(BaseModel):
     blacklisted_layouts: Optional[list[OfficeLayout]] = None
     completely_random_visual: bool = Field(default=False, alias="completelyRandomVisual")
 
+    @root_validator(pre=True)
+    @classmethod
+    def validate_required_object_names(
+        cls, values: dict[str, Any]  # noqa: WPS110
+    ) -> dict[str, Any]:
+        """Check the names of every required object at once, when parsing a CDF.
+
+        This reports every object that does not exist in the Arena together, rather than only the
+        first one.
+        """
+        ObjectInstanceId.validate_many(
+            required_object["name"]
+            for required_object in values.get("required_objects", [])
+            if isinstance(required_object, dict) and isinstance(required_object.get("name"), str)
+        )
+        return values
+
+    @validator("required_objects", each_item=True)
+    @classmethod
+    def validate_trusted_required_objects(cls, required_object: RequiredObject) -> RequiredObject:
+        """Validate any required objects that were created without being validated."""
+        return validate_trusted(required_object)
+
     @validator("floor_plan")
     @classmethod
     def check_floor_plan_is_numeric(cls, floor_plan: str) -> str:
@@ -1,3 +1,4 @@
+import random
 from datetime import datetime
 from typing import Any, Optional, Union
 from uuid import uuid4
@@ -66,12 +67,16 @@ class Mission(BaseModel):
         *,
         include_randomness: bool = True,
         randomise_start_position: bool = True,
+        rng: Optional[random.Random] = None,
     ) -> MissionTrajectory:
-        """Convert the challenge to a list of single trajectories."""
+        """Convert the challenge to a list of single trajectories.
+
+        If an `rng` is given, it is used for the randomness in the session ID.
+        """
         return MissionTrajectory(
             high_level_key=self.high_level_key,
             session_id=self.create_session_id(
-                session_id_prefix, include_randomness=include_randomness
+                session_id_prefix, include_randomness=include_randomness, rng=rng
             ),
             utterances=self.plan,
             preparation_utterances=self.preparation_plan,
@@ -80,7 +85,13 @@ class Mission(BaseModel):
             randomise_start_position=randomise_start_position,
         )
 
-    def create_session_id(self, prefix: str, *, include_randomness: bool = True) -> str:
+    def create_session_id(
+        self,
+        prefix: str,
+        *,
+        include_randomness: bool = True,
+        rng: Optional[random.Random] = None,
+    ) -> str:
         """Create a session ID for the trajectory."""
         safe_high_level_key = (
             str(self.high_level_key).replace("=", "--").replace("#", "_").lstrip("_")
@@ -88,6 +99,13 @@ class Mission(BaseModel):
 
         now = datetime.now()
         date_chunk = f"{now.year:02d}{now.month:02d}{now.day:02d}"
-        randomness = f"-{shortuuid.uuid()[:5]}" if include_randomness else ""
+        randomness = ""
+        if include_randomness:
+            random_chunk = (
+                "".join(rng.choices(shortuuid.get_alphabet(), k=5))
+                if rng
+                else shortuuid.uuid()[:5]
+            )
+            randomness = f"-{random_chunk}"
 
         return f"{prefix}.{date_chunk}/{safe_high_level_key}{randomness}"
@@ -1,21 +1,36 @@
-from collections.abc import Generator
-from typing import Any, Callable, Literal, Union, cast, get_args
+from collections.abc import Generator, Iterable
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Literal, Union, cast, get_args
 from typing_extensions import Self
 
-from arena_missions.constants.arena import ObjectIds, load_object_id_to_readable_name_map
+from arena_missions.constants.arena import (
+    ObjectIds,
+    get_object_ids_with_readable_name,
+    load_object_id_to_readable_name_map,
+)
 
 
+OBJECT_IDS = frozenset(get_args(ObjectIds))
+
+
+@lru_cache(maxsize=4096)
 def convert_object_instance_id_to_object_id(object_instance: str) -> str:
     """Convert object instance to object id.
 
-    We need to remove everything after the last "_".
+    We need to remove everything after the last "_". The same instances are in almost every CDF,
+    so they are cached.
     """
-    return object_instance[::-1].split("_", 1)[1][::-1]
+    object_id, separator, _ = object_instance.rpartition("_")
+    if not separator:
+        raise ValueError("Object instance ID must end with an instance number after a '_'")
+    return object_id
 
 
 class ObjectId(str):  # noqa: WPS600
     """An object ID in the Arena."""
 
+    _interned_object_ids: ClassVar[dict[str, "ObjectId"]] = {}
+
     @classmethod
     def __get_validators__(cls) -> Generator[Callable[..., Self], None, None]:
         """Return a generator of validators for this type."""
@@ -23,15 +38,22 @@ class ObjectId(str):  # noqa: WPS600
 
     @classmethod
     def validate(cls, v: Any) -> Self:
-        """Validate the object ID."""
+        """Validate the object ID.
+
+        Every valid object ID is only created once, and is reused whenever it is validated again.
+        """
         if not isinstance(v, str):
             raise TypeError("Object ID must be a string")
 
+        object_id = cls._interned_object_ids.get(v)
+        if object_id is not None:
+            return cast(Self, object_id)
+
         # Make sure the ID is one of the literals
-        if v not in get_args(ObjectIds):
+        if v not in OBJECT_IDS:
             raise ValueError("Object ID is not valid and does not exist in the Arena.")
 
-        return cls(v)
+        return cast(Self, cls._interned_object_ids.setdefault(str(v), cls(v)))
 
     def __repr__(self) -> str:
         """Return a string representation of the object ID."""
@@ -42,6 +64,15 @@ class ObjectId(str):  # noqa: WPS600
         """Parse the input."""
         return cls.validate(v)
 
+    @classmethod
+    def from_readable_name(cls, readable_name: str) -> frozenset[Self]:
+        """Return every object ID in the Arena with the readable name."""
+        return frozenset(
+            cls.parse(object_id)
+            for object_id in get_object_ids_with_readable_name(readable_name)
+            if object_id in OBJECT_IDS
+        )
+
     @property
     def readable_name(self) -> str:
         """Return the readable name of the object."""
@@ -55,6 +86,8 @@ class ObjectId(str):  # noqa: WPS600
 class ObjectInstanceId(str):  # noqa: WPS600
     """An object instance ID in the Arena."""
 
+    _interned_object_instance_ids: ClassVar[dict[str, "ObjectInstanceId"]] = {}
+
     @classmethod
     def __get_validators__(cls) -> Generator[Callable[..., Self], None, None]:
         """Return a generator of validators for this type."""
@@ -62,10 +95,18 @@ class ObjectInstanceId(str):  # noqa: WPS600
 
     @classmethod
     def validate(cls, v: Any) -> Self:
-        """Validate the object instance ID."""
+        """Validate the object instance ID.
+
+        Every valid object instance ID is only created once, and is reused whenever it is
+        validated again.
+        """
         if not isinstance(v, str):
             raise TypeError("Object instance ID must be a string")
 
+        object_instance_id = cls._interned_object_instance_ids.get(v)
+        if object_instance_id is not None:
+            return cast(Self, object_instance_id)
+
         # Make sure it has an object ID in it
         ObjectId.parse(convert_object_instance_id_to_object_id(v))
 
@@ -79,7 +120,28 @@ class ObjectInstanceId(str):  # noqa: WPS600
         if not (instance_number.isdigit() or instance_number == "*"):
             raise ValueError("Object instance ID end with a digit or a '*'")
 
-        return cls(v)
+        return cast(Self, cls._interned_object_instance_ids.setdefault(str(v), cls(v)))
+
+    @classmethod
+    def validate_many(cls, object_instance_ids: Iterable[str]) -> list[Self]:
+        """Validate many object instance IDs at once, such as every object in a CDF.
+
+        Each distinct ID is only validated once, and every invalid ID is reported together.
+        """
+        object_instance_ids = list(object_instance_ids)
+        validated_ids: dict[str, Self] = {}
+        invalid_ids: list[str] = []
+
+        for object_instance_id in dict.fromkeys(object_instance_ids):
+            try:
+                validated_ids[object_instance_id] = cls.validate(object_instance_id)
+            except (TypeError, ValueError):
+                invalid_ids.append(repr(object_instance_id))
+
+        if invalid_ids:
+            raise ValueError(f"Invalid object instance IDs: {', '.join(invalid_ids)}")
+
+        return [validated_ids[object_instance_id] for object_instance_id in object_instance_ids]
 
     def __repr__(self) -> str:
         """Return a string representation of the object instance ID."""
@@ -98,7 +160,9 @@ class ObjectInstanceId(str):  # noqa: WPS600
     @property
     def readable_name(self) -> str:
         """Return the readable name of the object instance."""
-        return self.object_id.readable_name
+        return load_object_id_to_readable_name_map()[
+            cast(ObjectIds, convert_object_instance_id_to_object_id(self))
+        ]
 
     @property
     def with_asterisk(self) -> Self:
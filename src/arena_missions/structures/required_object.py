@@ -1,6 +1,6 @@
 from typing import Any, Literal, Optional, Union, get_args
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 from arena_missions.constants.arena import (
     BooleanStr,
@@ -11,6 +11,12 @@ from arena_missions.constants.arena import (
     SpawnRelation,
 )
 from arena_missions.structures.object_id import ObjectId, ObjectInstanceId
+from arena_missions.structures.trusted import (
+    assign_field,
+    construct_trusted,
+    is_trusted,
+    mark_field_as_changed,
+)
 
 
 RequiredObjectStateValue = Union[BooleanStr, FluidType]
@@ -21,6 +27,8 @@ class RequiredObjectState(BaseModel, validate_assignment=True):
 
     __root__: dict[RequiredObjectStateName, RequiredObjectStateValue]
 
+    _is_trusted: bool = PrivateAttr(default=False)
+
     def __len__(self) -> int:
         """Get the length of the state."""
         return len(self.__root__)
@@ -32,6 +40,13 @@ class RequiredObjectState(BaseModel, validate_assignment=True):
         """Create a required object spawn state from parts."""
         return cls.parse_obj({state_name: state_value})
 
+    @classmethod
+    def from_trusted_parts(
+        cls, state_name: RequiredObjectStateName, state_value: RequiredObjectStateValue
+    ) -> "RequiredObjectState":
+        """Create a required object spawn state from known-good parts, without validating it."""
+        return construct_trusted(cls, __root__={state_name: state_value})
+
     @validator("__root__")
     @classmethod
     def ensure_only_one_key(
@@ -96,11 +111,21 @@ class RequiredObject(BaseModel, validate_assignment=True):
     current_portal: str = Field(default="", alias="currentPortal")
     dino_food: str = Field(default="", alias="dinoFood")
 
+    _is_trusted: bool = PrivateAttr(default=False)
+
     @classmethod
     def from_string(cls, object_instance_id: str) -> "RequiredObject":
         """Instantiate a RequiredObject from the object instance ID."""
         return cls(name=ObjectInstanceId.parse(object_instance_id))
 
+    @classmethod
+    def trusted(cls, **field_values: Any) -> "RequiredObject":
+        """Create a required object from known-good values, without validating it.
+
+        The object is validated once it is added to a CDF.
+        """
+        return construct_trusted(cls, **field_values)
+
     @validator("state", "location", each_item=True)
     @classmethod
     def ensure_each_state_has_only_one_key(cls, state: dict[str, str]) -> dict[str, str]:
@@ -164,6 +189,7 @@ class RequiredObject(BaseModel, validate_assignment=True):
         """Set the receptacle this object is in."""
         # Clear any existing location set
         self.location.clear()
+        mark_field_as_changed(self, "location")
 
         # If there is no receptacle to add, return
         if not receptacle:
@@ -177,7 +203,7 @@ class RequiredObject(BaseModel, validate_assignment=True):
             self.room_location.clear()
             return
 
-        self.room_location = [room]  # noqa: WPS601
+        assign_field(self, "room_location", [room])
 
     def update_color(self, color: Optional[ObjectColor]) -> None:
         """Set the color of this object."""
@@ -185,18 +211,24 @@ class RequiredObject(BaseModel, validate_assignment=True):
             self.colors.clear()
             return
 
-        self.colors = [color]  # noqa: WPS601
+        assign_field(self, "colors", [color])
 
     def update_state(
         self, state_name: RequiredObjectStateName, state_value: Optional[RequiredObjectStateValue]
     ) -> None:
         """Update the state of this object."""
         # Remove the state from the list if it already exists
-        self.state = [state for state in self.state if state.name != state_name]  # noqa: WPS601
+        assign_field(self, "state", [state for state in self.state if state.name != state_name])
 
         # Add the state to the list if it is not None
-        if state_value is not None:
-            self.state.append(RequiredObjectState.parse_obj({state_name: state_value}))
+        if state_value is None:
+            return
+
+        self.state.append(
+            RequiredObjectState.from_trusted_parts(state_name, state_value)
+            if is_trusted(self)
+            else RequiredObjectState.parse_obj({state_name: state_value})
+        )
 
     def add_state(
         self, state_name: RequiredObjectStateName, state_value: Optional[RequiredObjectStateValue]
@@ -207,3 +239,122 @@ class RequiredObject(BaseModel, validate_assignment=True):
     def remove_state(self, state_name: RequiredObjectStateName) -> None:
         """Remove the state from this object."""
         return self.update_state(state_name, None)
+
+
+class FrozenDict(dict[Any, Any]):  # noqa: WPS600
+    """Dict that cannot be changed, but is still serialised like any other dict."""
+
+    def __setitem__(self, key: Any, value: Any) -> None:  # noqa: WPS110
+        """Frozen dicts cannot be changed."""
+        raise TypeError("Frozen dicts cannot be changed")
+
+    def __delitem__(self, key: Any) -> None:
+        """Frozen dicts cannot be changed."""
+        raise TypeError("Frozen dicts cannot be changed")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Copy and pickle the dict without setting each item on it."""
+        return (type(self), (dict(self),))
+
+    def _raise_frozen(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Frozen dicts cannot be changed")
+
+    clear = _raise_frozen
+    pop = _raise_frozen
+    popitem = _raise_frozen
+    setdefault = _raise_frozen
+    update = _raise_frozen
+    __ior__ = _raise_frozen
+
+
+class FrozenRequiredObjectState(RequiredObjectState, allow_mutation=False):
+    """Spawn state of a frozen required object, which cannot be changed."""
+
+    @classmethod
+    def from_state(cls, state: RequiredObjectState) -> "FrozenRequiredObjectState":
+        """Create a frozen copy of a validated state."""
+        return cls.construct(__root__=FrozenDict(state.__root__))
+
+
+class FrozenRequiredObject(RequiredObject, allow_mutation=False):
+    """Required object that is shared between many CDFs, so it cannot be changed.
+
+    Every field is stored as a tuple or a frozen dict, so it cannot be changed in place either.
+    Since it never changes, it is only serialised once, and every CDF it is in reuses that.
+    """
+
+    _serialised: dict[tuple[tuple[str, Any], ...], dict[str, Any]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_required_object(cls, required_object: RequiredObject) -> "FrozenRequiredObject":
+        """Create a frozen copy of the required object, after validating it."""
+        validated_object = RequiredObject.parse_obj(required_object.dict(by_alias=True))
+        field_values = {
+            field_name: _freeze_value(field_value)
+            for field_name, field_value in validated_object.__dict__.items()
+        }
+        field_values["state"] = tuple(
+            FrozenRequiredObjectState.from_state(state) for state in validated_object.state
+        )
+        return cls.construct(_fields_set=validated_object.__fields_set__, **field_values)
+
+    def dict(self, **kwargs: Any) -> dict[str, Any]:  # noqa: WPS125
+        """Serialise the object, reusing the serialised form from before when possible."""
+        if kwargs.get("include") or kwargs.get("exclude"):
+            return _copy_serialised_value(super().dict(**kwargs))
+
+        cache_key = tuple(sorted(kwargs.items()))
+        if cache_key not in self._serialised:
+            self._serialised[cache_key] = super().dict(**kwargs)
+
+        return _copy_serialised_value(self._serialised[cache_key])
+
+    def update_receptacle(self, receptacle: Optional[ObjectInstanceId]) -> None:
+        """Frozen objects cannot be changed."""
+        raise TypeError(f"{self.name} is frozen and cannot be changed")
+
+    def update_room(self, room: Optional[OfficeRoom]) -> None:
+        """Frozen objects cannot be changed."""
+        raise TypeError(f"{self.name} is frozen and cannot be changed")
+
+    def update_color(self, color: Optional[ObjectColor]) -> None:
+        """Frozen objects cannot be changed."""
+        raise TypeError(f"{self.name} is frozen and cannot be changed")
+
+    def update_state(
+        self, state_name: RequiredObjectStateName, state_value: Optional[RequiredObjectStateValue]
+    ) -> None:
+        """Frozen objects cannot be changed."""
+        raise TypeError(f"{self.name} is frozen and cannot be changed")
+
+
+def _freeze_value(field_value: Any) -> Any:
+    """Replace the lists and dicts within a validated value with tuples and frozen dicts."""
+    if isinstance(field_value, dict):
+        return FrozenDict(
+            (item_key, _freeze_value(item_value)) for item_key, item_value in field_value.items()
+        )
+
+    if isinstance(field_value, list):
+        return tuple(_freeze_value(item_value) for item_value in field_value)
+
+    return field_value
+
+
+def _copy_serialised_value(serialised_value: Any) -> Any:
+    """Copy the lists and dicts of a serialised value, which is much faster than a deep copy.
+
+    Frozen values are serialised as tuples, which are turned back into lists.
+    """
+    if isinstance(serialised_value, dict):
+        return {
+            item_key: _copy_serialised_value(item_value)
+            for item_key, item_value in serialised_value.items()
+        }
+
+    if isinstance(serialised_value, (list, tuple)):
+        return [_copy_serialised_value(item_value) for item_value in serialised_value]
+
+    return serialised_value
@@ -0,0 +1,103 @@
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def construct_trusted(model_type: type[ModelT], **field_values: Any) -> ModelT:
+    """Create the model from values that are known to be valid, without validating them.
+
+    This is only for code paths that build models from known-good constants. The model is marked
+    as trusted until `validate_trusted()` is called on it, which happens when it is added to a
+    CDF, so every model is still validated once before it is used.
+    """
+    # Unlike validation, constructing the model keeps any aliases as extra values
+    field_names = {
+        model_field.alias: field_name for field_name, model_field in model_type.__fields__.items()
+    }
+    model = model_type.construct(
+        **{
+            field_names.get(field_name, field_name): field_value
+            for field_name, field_value in field_values.items()
+        }
+    )
+    object.__setattr__(model, "_is_trusted", True)  # noqa: WPS609
+    return model
+
+
+def is_trusted(model: Any) -> bool:
+    """Check if the model was created without being validated, and has not been validated yet."""
+    return getattr(model, "_is_trusted", False)
+
+
+def assign_field(model: BaseModel, field_name: str, field_value: Any) -> None:
+    """Set the field on the model, only validating it if the model is not trusted."""
+    if not is_trusted(model):
+        setattr(model, field_name, field_value)
+        return
+
+    # Replace the values rather than changing them in place, like validated assignment does, since
+    # copies made when a model is validated share the same values
+    object.__setattr__(  # noqa: WPS609
+        model, "__dict__", {**model.__dict__, field_name: field_value}
+    )
+    model.__fields_set__.add(field_name)
+
+
+def mark_field_as_changed(model: BaseModel, field_name: str) -> None:
+    """Make sure a field that was changed in place is validated with the rest of the model."""
+    if is_trusted(model):
+        model.__fields_set__.add(field_name)
+
+
+def validate_trusted(model: ModelT) -> ModelT:
+    """Validate the fields that were set on a trusted model, and any trusted models within them.
+
+    Fields that were never set still have their defaults, which are always valid. Models that are
+    not trusted have already been validated, and are returned as they are.
+    """
+    if not is_trusted(model):
+        return model
+
+    field_values = dict(model.__dict__)
+    validation_errors: list[ErrorWrapper] = []
+
+    for field_name in model.__fields__.keys() & model.__fields_set__:
+        model_field = model.__fields__[field_name]
+        validated_value, field_errors = model_field.validate(
+            _validate_nested_models(field_values[field_name]),
+            field_values,
+            loc=model_field.alias,
+            cls=type(model),
+        )
+        if field_errors:
+            validation_errors.append(field_errors)
+        else:
+            field_values[field_name] = validated_value
+
+    if validation_errors:
+        raise ValidationError(validation_errors, type(model))
+
+    object.__setattr__(model, "__dict__", field_values)  # noqa: WPS609
+    object.__setattr__(model, "_is_trusted", False)  # noqa: WPS609
+    return model
+
+
+def _validate_nested_models(field_value: Any) -> Any:
+    """Validate any trusted models within the value of a field."""
+    if isinstance(field_value, BaseModel):
+        return validate_trusted(field_value)
+
+    if isinstance(field_value, list):
+        return [_validate_nested_models(item_value) for item_value in field_value]
+
+    if isinstance(field_value, dict):
+        return {
+            item_key: _validate_nested_models(item_value)
+            for item_key, item_value in field_value.items()
+        }
+
+    return field_value
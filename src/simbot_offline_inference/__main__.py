@@ -2,8 +2,10 @@ import typer
 
 from simbot_offline_inference.commands import (
     generate_trajectories,
+    merge_evaluation_shards,
     print_challenges_per_high_level_key,
     print_high_level_keys,
+    replay_saved_actions,
     run_background_services,
     run_their_evaluation,
     run_trajectories,
@@ -26,6 +28,8 @@ app.command(rich_help_panel="Generation")(generate_trajectories)
 app.command(rich_help_panel="Generation")(run_trajectories)
 
 app.command(rich_help_panel="Evaluation")(run_their_evaluation)
+app.command(rich_help_panel="Evaluation")(merge_evaluation_shards)
+app.command(rich_help_panel="Evaluation")(replay_saved_actions)
 
 
 if __name__ == "__main__":
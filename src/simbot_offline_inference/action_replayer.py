@@ -0,0 +1,178 @@
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack
+from typing import Any, Literal, NamedTuple, Optional
+
+from loguru import logger
+from rich.live import Live
+from rich.panel import Panel
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeElapsedColumn
+
+from arena_missions.constants.arena import OfficeRoom
+from arena_wrapper.enums.object_output_wrapper import ObjectOutputType
+from simbot_offline_inference.orchestrators import ArenaOrchestrator
+
+
+# Arguments for each action are under the lowercase name of the action, except for these
+ACTION_ARGUMENT_KEYS = {"Rotate": "rotation"}  # noqa: WPS407
+
+
+class ReplayInstance(NamedTuple):
+    """Saved actions for a mission that can be replayed in the Arena."""
+
+    mission_id: str
+    cdf: dict[str, Any]
+    predicted_actions: list[dict[str, Any]]
+    original_goal_completion_status: Optional[bool] = None
+
+    # The agent is moved to the same random start position as when the actions were predicted
+    session_id: Optional[str] = None
+    start_room: Optional[OfficeRoom] = None
+    randomise_start_position: bool = False
+
+
+class ReplayResult(NamedTuple):
+    """Result of replaying the saved actions for a mission."""
+
+    mission_id: str
+    goal_completion_status: bool
+    subgoal_completion_status: list[Literal[0, 1]]
+    original_goal_completion_status: Optional[bool]
+    num_actions: int
+    num_interactions: int
+    duration: float
+
+    @property
+    def matches_original(self) -> bool:
+        """Check if the mission ended the same way as when the actions were first predicted."""
+        if self.original_goal_completion_status is None:
+            return True
+        return self.goal_completion_status == self.original_goal_completion_status
+
+
+def references_object_by_mask(action: dict[str, Any]) -> bool:
+    """Check if the action refers to an object with a mask over the current images."""
+    action_type = action.get("type", "")
+    action_arguments = action.get(ACTION_ARGUMENT_KEYS.get(action_type, action_type.lower()))
+
+    if not isinstance(action_arguments, dict):
+        return False
+
+    action_object = action_arguments.get("object")
+    return isinstance(action_object, dict) and "mask" in action_object
+
+
+def batch_actions(
+    actions: list[dict[str, Any]], *, max_batch_size: int
+) -> Iterator[list[dict[str, Any]]]:
+    """Split the actions into as few batches for the Arena as possible.
+
+    Masks are matched to objects using the images from before the batch is sent, so any action
+    that refers to an object by its mask needs to start a new batch.
+    """
+    actions_batch: list[dict[str, Any]] = []
+
+    for action in actions:
+        if actions_batch and (
+            len(actions_batch) >= max_batch_size or references_object_by_mask(action)
+        ):
+            yield actions_batch
+            actions_batch = []
+
+        actions_batch.append(action)
+
+    if actions_batch:
+        yield actions_batch
+
+
+class ActionReplayer:
+    """Replay saved actions in the Arena and score the goals again, without the Experience Hub.
+
+    This isolates the throughput of the Arena, and checks that previous results still hold, such
+    as after upgrading the Arena.
+    """
+
+    def __init__(
+        self,
+        arena_orchestrator: ArenaOrchestrator,
+        *,
+        max_actions_per_interaction: int = 10,
+        object_output_type: ObjectOutputType = ObjectOutputType.OBJECT_MASK,
+    ) -> None:
+        self._arena_orchestrator = arena_orchestrator
+        self._max_actions_per_interaction = max_actions_per_interaction
+        self._object_output_type = object_output_type
+
+        self.progress = Progress(
+            "{task.description}",
+            BarColumn(bar_width=None),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            expand=True,
+        )
+
+    def replay_missions(self, instances: list[ReplayInstance]) -> Iterator[ReplayResult]:
+        """Replay the saved actions for every mission."""
+        task_id = self.progress.add_task("Replaying saved actions", total=len(instances))
+
+        context_manager_stack = ExitStack()
+        context_manager_stack.enter_context(self._display_progress())
+        context_manager_stack.enter_context(self._arena_orchestrator)
+
+        with context_manager_stack:
+            for instance in instances:
+                yield self.replay_mission(instance)
+                self.progress.advance(task_id)
+
+    def replay_mission(self, instance: ReplayInstance) -> ReplayResult:
+        """Replay the saved actions for a single mission."""
+        self._arena_orchestrator.launch_new_game(
+            instance.cdf, object_output_type=self._object_output_type
+        )
+
+        if instance.randomise_start_position and instance.session_id is not None:
+            self._arena_orchestrator.go_to_random_start_position(
+                instance.session_id, instance.start_room
+            )
+
+        start_time = time.perf_counter()
+        num_interactions = 0
+
+        for actions_batch in batch_actions(
+            instance.predicted_actions, max_batch_size=self._max_actions_per_interaction
+        ):
+            # The Arena crashes if it is sent actions after every goal is complete
+            if self._arena_orchestrator.get_goals_status()[1]:
+                logger.warning(f"All goals for {instance.mission_id} are complete, stopping early")
+                break
+
+            return_val, action_status = self._arena_orchestrator.execute_action(
+                actions_batch, self._object_output_type, ""
+            )
+            num_interactions += 1
+
+            if not return_val:
+                logger.debug(
+                    f"Replayed actions failed, as they might have before: {action_status}"
+                )
+
+        duration = time.perf_counter() - start_time
+        (
+            _,
+            goal_completion_status,
+            subgoal_completion_status,
+        ) = self._arena_orchestrator.get_goals_status()
+
+        return ReplayResult(
+            mission_id=instance.mission_id,
+            goal_completion_status=goal_completion_status,
+            subgoal_completion_status=subgoal_completion_status,
+            original_goal_completion_status=instance.original_goal_completion_status,
+            num_actions=len(instance.predicted_actions),
+            num_interactions=num_interactions,
+            duration=duration,
+        )
+
+    def _display_progress(self) -> Live:
+        """Display the progress bar."""
+        return Live(Panel(self.progress, padding=(1, 4), border_style="yellow"))
@@ -1,6 +1,6 @@
 import random
 from functools import partial
-from typing import Any, Literal
+from typing import Any, Literal, Optional
 
 from convert_case import title_case
 
@@ -11,6 +11,9 @@ ArenaAction = dict[str, Any]
 class ArenaActionBuilder:
     """Generate actions for the Arena."""
 
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._rng = rng or random.Random()
+
     def random_navigation(self) -> ArenaAction:
         """Return a random action."""
         methods = [
@@ -24,7 +27,7 @@ class ArenaActionBuilder:
             # partial(self.look, direction="down"),
         ]
 
-        return random.choice(methods)(magnitude=random.randint(0, 360))  # noqa: WPS432
+        return self._rng.choice(methods)(magnitude=self._rng.randint(0, 360))  # noqa: WPS432
 
     def get_language_instruction_from_action(self, action: ArenaAction) -> str:
         """Return a language instruction from an action."""
@@ -1,4 +1,8 @@
-from typing import Any
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Literal, NamedTuple, Optional
 
 import httpx
 from loguru import logger
@@ -6,11 +10,33 @@ from loguru import logger
 from arena_missions.structures import CDF, MissionTrajectory
 from arena_wrapper.exceptions import RaycastMissedException
 from simbot_offline_inference.inference_controller import SimBotInferenceController
+from simbot_offline_inference.job_queue import TrajectoryQueue
+from simbot_offline_inference.live_metrics import live_metrics
 from simbot_offline_inference.metrics import EvaluationMetrics, WandBCallback
+from simbot_offline_inference.preparation_cache import (
+    PreparationActionCache,
+    PreparationActions,
+)
+from simbot_offline_inference.scheduling import MissionHistory, get_mission_key
+from simbot_offline_inference.tracing import tracer
+
+
+class PreparedTrajectory(NamedTuple):
+    """Trajectory with all the work that does not need the Arena already done."""
+
+    trajectory: MissionTrajectory
+    preparation_session_id: str
+    cdf_as_dict: dict[str, Any]
+    has_been_evaluated: bool
 
 
 class SimBotArenaEvaluator:
-    """Handle the evaluation of the experience hub on the arena."""
+    """Handle the evaluation of the experience hub on the arena.
+
+    When pipelining is enabled, only the Arena-bound work stays on the critical path. While one
+    trajectory is running in the Arena, the next one is prepared in the background, and the
+    outputs of the previous one are saved and sent to WandB in the background.
+    """
 
     def __init__(
         self,
@@ -20,6 +46,9 @@ class SimBotArenaEvaluator:
         *,
         enforce_successful_preparation: bool = False,
         should_resume_previous_wandb_run: bool = False,
+        enable_pipelining: bool = False,
+        mission_history: Optional[MissionHistory] = None,
+        preparation_cache: Optional[PreparationActionCache] = None,
     ) -> None:
         self._inference_controller = inference_controller
         self._evaluation_metrics = evaluation_metrics
@@ -27,58 +56,170 @@ class SimBotArenaEvaluator:
 
         self._enforce_successful_preparation = enforce_successful_preparation
         self._should_resume_previous_wandb_run = should_resume_previous_wandb_run
+        self._enable_pipelining = enable_pipelining
+        self._mission_history = mission_history
+        self._preparation_cache = preparation_cache
+
+        # Only exists while running a pipelined evaluation
+        self._finaliser: Optional[ThreadPoolExecutor] = None
+        self._pending_finalisations: list[Future[None]] = []
 
     def run_evaluation(self, trajectories: list[MissionTrajectory]) -> None:
         """Run the evaluation on all the test data."""
-        with self._inference_controller:
-            self._wandb_callback.start_evaluation(resume=self._should_resume_previous_wandb_run)
+        with self._evaluation_session(num_trajectories=len(trajectories)):
+            if self._enable_pipelining:
+                self._run_pipelined_evaluation(trajectories)
+            else:
+                for instance in trajectories:
+                    self.run_evaluation_step(instance)
+
+    def run_evaluation_from_queue(self, trajectory_queue: TrajectoryQueue) -> None:
+        """Run trajectories from the queue until there are none left.
+
+        Multiple workers can share the same queue, and each one only runs the trajectories it has
+        claimed. Trajectories from the queue are not pipelined.
+
+        The checkpoint is kept once the queue is empty, since it is the record of every trajectory
+        this worker ran, which is what the results are merged from. A trajectory that fails goes
+        back on the queue, and the worker carries on with the next one.
+        """
+        with self._evaluation_session(
+            num_trajectories=trajectory_queue.count()["pending"], keep_checkpoint=True
+        ):
+            while True:
+                claimed_trajectory = trajectory_queue.claim()
+                if claimed_trajectory is None:
+                    break
+
+                with trajectory_queue.keep_alive(claimed_trajectory):
+                    try:
+                        self.run_evaluation_step(claimed_trajectory.trajectory)
+                    except Exception as err:
+                        logger.exception(f"Failed to run `{claimed_trajectory.trajectory_key}`")
+                        trajectory_queue.mark_failed(claimed_trajectory, repr(err))
+                        continue
+
+                # No other worker runs the trajectory once it is done, so its result must already
+                # be on disk
+                self._evaluation_metrics.save_checkpoint()
+                trajectory_queue.mark_done(claimed_trajectory)
+
+            logger.info(f"No trajectories left in the queue: {trajectory_queue.count()}")
+
+    def prepare_trajectory(self, trajectory: MissionTrajectory) -> PreparedTrajectory:
+        """Do all the work for the trajectory that does not need the Arena."""
+        preparation_session_id = trajectory.create_preparation_session_id()
+        has_been_evaluated = self._has_mission_been_evaluated(trajectory)
 
-            if self._should_resume_previous_wandb_run:
-                self._evaluation_metrics.restore_checkpoint()
+        if not has_been_evaluated:
+            self._wandb_callback.prepare_trajectory(trajectory, preparation_session_id)
 
-            for instance in trajectories:
-                self.run_evaluation_step(instance)
+        return PreparedTrajectory(
+            trajectory=trajectory,
+            preparation_session_id=preparation_session_id,
+            cdf_as_dict=trajectory.cdf_as_dict,
+            has_been_evaluated=has_been_evaluated,
+        )
 
-            self._wandb_callback.finish_evaluation()
-            self._evaluation_metrics.delete_checkpoint()
+    def run_evaluation_step(
+        self,
+        trajectory: MissionTrajectory,
+        prepared_trajectory: Optional[PreparedTrajectory] = None,
+    ) -> None:
+        """Run a single evaluation step, with guards in case something goes wrong."""
+        if prepared_trajectory is None:
+            prepared_trajectory = self.prepare_trajectory(trajectory)
 
-            logger.info("Finished evaluation!")
+        live_metrics.record_mission_dequeued()
 
-    def run_evaluation_step(self, trajectory: MissionTrajectory) -> None:
-        """Run a single evaluation step, with guards in case something goes wrong."""
-        if self._has_mission_been_evaluated(trajectory):
+        if prepared_trajectory.has_been_evaluated:
             logger.info("Skipping mission because it was already evaluated.")
             return None
 
         logger.info(f"Running evaluation for '{trajectory.session_id}'")
 
+        start_time = time.perf_counter()
+        has_finished = False
         try:
-            return self.run_trajectory_in_the_arena(trajectory)
+            has_finished = self._run_trajectory_with_recovery(trajectory, prepared_trajectory)
+        finally:
+            if self._mission_history is not None:
+                self._mission_history.record(
+                    get_mission_key(trajectory),
+                    time.perf_counter() - start_time,
+                    has_failed=not has_finished,
+                )
 
-        except httpx.ConnectTimeout:
-            logger.error("Failed to establish a connection to the arena.")
+        return None
 
-            if self._inference_controller.restart_arena():
-                logger.info("Restarted the arena. Retrying...")
-                return self.run_trajectory_in_the_arena(trajectory)
+    def run_trajectory_in_the_arena(
+        self,
+        trajectory: MissionTrajectory,
+        prepared_trajectory: Optional[PreparedTrajectory] = None,
+    ) -> None:
+        """Run a single trajectory in the arena, from start to finish."""
+        if prepared_trajectory is None:
+            prepared_trajectory = self.prepare_trajectory(trajectory)
 
-        except RaycastMissedException:
-            logger.error("Current trajectory will be ignored due to a RaycastMissed exception.")
+        tracer.start_trajectory(trajectory.mission_id or trajectory.session_id)
+        try:
+            with tracer.span("trajectory", session_id=trajectory.session_id):
+                self._run_trajectory_in_the_arena(trajectory, prepared_trajectory)
+        finally:
+            tracer.finish_trajectory()
 
-            if self._inference_controller.restart_arena():
-                logger.info("Successfully restarted arena. Skipping current trajectory...")
-                return None
+    def prepare_arena_for_trajectory(  # noqa: WPS231
+        self,
+        trajectory: MissionTrajectory,
+        preparation_session_id: str,
+        cdf_as_dict: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Prepare the arena to run the trajectory."""
+        if cdf_as_dict is None:
+            cdf_as_dict = trajectory.cdf_as_dict
 
-        raise RuntimeError("Failed to run the trajectory in the arena.")
+        logger.info("Sending CDF to the arena")
+        with tracer.span("launch_game"):
+            self._inference_controller.launch_game(cdf_as_dict)
 
-    def run_trajectory_in_the_arena(self, trajectory: MissionTrajectory) -> None:
-        """Run a single trajectory in the arena, from start to finish."""
-        preparation_session_id = trajectory.create_preparation_session_id()
+        logger.debug("Verifying Experience Hub is healthy")
+        with tracer.span("healthcheck"):
+            is_experience_hub_healthy = self._inference_controller.healthcheck()
+
+        if not is_experience_hub_healthy:
+            raise AssertionError("The Experience Hub is not healthy.")
 
-        self._wandb_callback.start_trajectory(trajectory, preparation_session_id)
+        if trajectory.preparation_utterances:
+            logger.debug("Running preparation steps")
+
+            with tracer.span("preparation_utterances"):
+                self._run_preparation_utterances(trajectory, preparation_session_id, cdf_as_dict)
+
+        if self._enforce_successful_preparation:
+            if not self._inference_controller.trajectory_preparation_completed:
+                raise AssertionError("The subgoal status is 0, so preparation failed")
+
+        if trajectory.randomise_start_position:
+            logger.info("Randomising start position")
+            self._inference_controller.go_to_random_start_position(
+                trajectory.session_id,
+                trajectory.cdf.start_room if isinstance(trajectory.cdf, CDF) else None,
+            )
+
+    def _run_trajectory_in_the_arena(
+        self, trajectory: MissionTrajectory, prepared_trajectory: PreparedTrajectory
+    ) -> None:
+        """Run the trajectory, which has already been prepared, in the arena."""
+        preparation_session_id = prepared_trajectory.preparation_session_id
+
+        self._run_off_critical_path(
+            self._wandb_callback.start_trajectory, trajectory, preparation_session_id
+        )
 
         try:
-            self.prepare_arena_for_trajectory(trajectory, preparation_session_id)
+            self.prepare_arena_for_trajectory(
+                trajectory, preparation_session_id, prepared_trajectory.cdf_as_dict
+            )
         except AssertionError:
             logger.warning("Preparation failed. Skipping...")
             self._finish_trajectory(
@@ -94,14 +235,16 @@ class SimBotArenaEvaluator:
                 break
 
             try:
-                actions_for_utterance = self._inference_controller.handle_utterance(
-                    trajectory.session_id, utterance
-                )
+                with tracer.span("utterance", utterance=utterance):
+                    actions_for_utterance = self._inference_controller.handle_utterance(
+                        trajectory.session_id, utterance
+                    )
             except AssertionError:
                 logger.error("Unrecoverable exception occurred, exiting...")
                 break
 
             actions_for_session.extend(actions_for_utterance)
+            live_metrics.record_utterance(len(actions_for_utterance))
             processed_utterance_counter += 1
 
         self._finish_trajectory(
@@ -110,38 +253,174 @@ class SimBotArenaEvaluator:
             processed_utterance_counter=processed_utterance_counter,
         )
 
-    def prepare_arena_for_trajectory(  # noqa: WPS231
-        self, trajectory: MissionTrajectory, preparation_session_id: str
-    ) -> None:
-        """Prepare the arena to run the trajectory."""
-        logger.info("Sending CDF to the arena")
-        self._inference_controller.launch_game(trajectory.cdf_as_dict)
+    def _run_trajectory_with_recovery(
+        self, trajectory: MissionTrajectory, prepared_trajectory: PreparedTrajectory
+    ) -> bool:
+        """Run the trajectory, restarting the Arena if it breaks.
 
-        logger.debug("Verifying Experience Hub is healthy")
-        if not self._inference_controller.healthcheck():
-            raise AssertionError("The Experience Hub is not healthy.")
+        Return True if the trajectory finished, or False if it had to be skipped.
+        """
+        try:
+            self.run_trajectory_in_the_arena(trajectory, prepared_trajectory)
+            return True
 
-        if trajectory.preparation_utterances:
-            logger.debug("Running preparation steps")
+        except httpx.ConnectTimeout:
+            logger.error("Failed to establish a connection to the arena.")
+
+            if self._inference_controller.restart_arena():
+                logger.info("Restarted the arena. Retrying...")
+                self.run_trajectory_in_the_arena(trajectory, prepared_trajectory)
+                return True
+
+        except RaycastMissedException:
+            logger.error("Current trajectory will be ignored due to a RaycastMissed exception.")
+
+            if self._inference_controller.restart_arena():
+                logger.info("Successfully restarted arena. Skipping current trajectory...")
+                return False
+
+        raise RuntimeError("Failed to run the trajectory in the arena.")
+
+    def _run_preparation_utterances(
+        self,
+        trajectory: MissionTrajectory,
+        preparation_session_id: str,
+        cdf_as_dict: dict[str, Any],
+    ) -> None:
+        """Prepare the scene, replaying the actions from a previous run of the CDF if we can.
 
+        If the replayed actions do not prepare the scene, the game is relaunched and the
+        Experience Hub prepares it instead.
+        """
+        if self._preparation_cache is None:
             for prep_utterance in trajectory.preparation_utterances:
                 self._inference_controller.handle_utterance(preparation_session_id, prep_utterance)
+            return
 
-        if self._enforce_successful_preparation:
-            if not self._inference_controller.trajectory_preparation_completed:
-                raise AssertionError("The subgoal status is 0, so preparation failed")
+        cache_key = self._preparation_cache.get_key(cdf_as_dict, trajectory.preparation_utterances)
+        cached_preparation_actions = self._preparation_cache.load(cache_key)
 
-        if trajectory.randomise_start_position:
-            logger.info("Randomising start position")
+        if cached_preparation_actions is not None:
+            if self._replay_preparation_actions(trajectory, cached_preparation_actions):
+                logger.debug("Prepared the scene by replaying the actions from a previous run")
+                return
+
+            logger.warning(
+                "Replaying the preparation actions did not prepare the scene, so relaunching the game and using the Experience Hub instead"
+            )
+            self._preparation_cache.delete(cache_key)
+            with tracer.span("relaunch_game"):
+                self._inference_controller.launch_game(cdf_as_dict)
+
+        preparation_actions: PreparationActions = []
+        for prep_utterance in trajectory.preparation_utterances:
+            action_batches: list[list[dict[str, Any]]] = []
+            self._inference_controller.handle_utterance(
+                preparation_session_id, prep_utterance, executed_action_batches=action_batches
+            )
+            preparation_actions.append(action_batches)
+
+        if self._inference_controller.trajectory_preparation_completed:
+            self._preparation_cache.save(cache_key, preparation_actions)
+
+    def _replay_preparation_actions(
+        self, trajectory: MissionTrajectory, preparation_actions: PreparationActions
+    ) -> bool:
+        """Replay the actions for each preparation utterance, and check the scene is prepared."""
+        with tracer.span("replay_preparation_actions"):
+            for prep_utterance, action_batches in zip(
+                trajectory.preparation_utterances, preparation_actions
+            ):
+                if not self._inference_controller.replay_actions(action_batches, prep_utterance):
+                    return False
+
+        return self._inference_controller.trajectory_preparation_completed
+
+    @contextmanager
+    def _evaluation_session(
+        self, *, num_trajectories: int, keep_checkpoint: bool = False
+    ) -> Iterator[None]:
+        """Set up everything for an evaluation, and finish it once all trajectories have run."""
+        with self._inference_controller:
+            self._wandb_callback.start_evaluation(resume=self._should_resume_previous_wandb_run)
 
-            # Go to random viewpoint
-            logger.debug("Going to random viewpoint")
-            if isinstance(trajectory.cdf, CDF):
-                self._inference_controller.go_to_random_viewpoint(trajectory.cdf.start_room)
+            if self._should_resume_previous_wandb_run:
+                self._evaluation_metrics.restore_checkpoint()
 
-            # Randomise the start position
-            logger.debug("Randomising start position")
-            self._inference_controller.randomise_start_position()
+            live_metrics.start_evaluation(num_trajectories)
+
+            try:
+                yield
+            finally:
+                # Make sure the results so far are on disk so that we can resume from them
+                self._evaluation_metrics.save_checkpoint()
+                # Send the buffered logs now, as they are lost if the evaluation failed
+                self._wandb_callback.flush_logs()
+
+            self._wandb_callback.finish_evaluation()
+            if not keep_checkpoint:
+                self._evaluation_metrics.delete_checkpoint()
+
+            logger.info("Finished evaluation!")
+
+    def _run_pipelined_evaluation(self, trajectories: list[MissionTrajectory]) -> None:
+        """Run the trajectories, overlapping everything that does not need the Arena.
+
+        There is only one worker for each side of the pipeline so that the WandB calls and the
+        metric updates happen in the same order as the trajectories.
+        """
+        prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetcher")
+        self._finaliser = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finaliser")
+
+        try:
+            next_prepared_trajectory = (
+                prefetcher.submit(self.prepare_trajectory, trajectories[0])
+                if trajectories
+                else None
+            )
+
+            for trajectory_idx, trajectory in enumerate(trajectories):
+                if next_prepared_trajectory is None:
+                    raise AssertionError("The next trajectory should have been prepared.")
+
+                prepared_trajectory = next_prepared_trajectory.result()
+
+                # Start preparing the next trajectory while this one is running
+                next_prepared_trajectory = (
+                    prefetcher.submit(self.prepare_trajectory, trajectories[trajectory_idx + 1])
+                    if trajectory_idx + 1 < len(trajectories)
+                    else None
+                )
+
+                self.run_evaluation_step(trajectory, prepared_trajectory)
+                self._raise_for_failed_finalisations()
+
+        finally:
+            prefetcher.shutdown(wait=True)
+            self._finaliser.shutdown(wait=True)
+            self._finaliser = None
+
+        self._raise_for_failed_finalisations(wait=True)
+
+    def _run_off_critical_path(self, func: Callable[..., None], *args: Any, **kwargs: Any) -> None:
+        """Run the function in the background if pipelining, otherwise run it now."""
+        if self._finaliser is None:
+            func(*args, **kwargs)
+            return
+
+        self._pending_finalisations.append(self._finaliser.submit(func, *args, **kwargs))
+
+    def _raise_for_failed_finalisations(self, *, wait: bool = False) -> None:
+        """Surface any errors from the background finalisation, and forget the finished ones."""
+        still_pending: list[Future[None]] = []
+
+        for finalisation in self._pending_finalisations:
+            if wait or finalisation.done():
+                finalisation.result()
+            else:
+                still_pending.append(finalisation)
+
+        self._pending_finalisations = still_pending
 
     def _has_mission_been_evaluated(self, trajectory: MissionTrajectory) -> bool:
         """Check if the mission has already been evaluated.
@@ -159,22 +438,51 @@ class SimBotArenaEvaluator:
         actions_for_session: list[Any],
         processed_utterance_counter: int,
     ) -> None:
-        """Log the results for the trajectory."""
-        (
-            goal_completion_status,
-            subgoal_completion_status,
-        ) = self._inference_controller.get_goal_completion_status()
+        """Log the results for the trajectory.
 
+        Everything that needs the Arena is collected first, so that the rest can happen off the
+        critical path.
+        """
+        with tracer.span("finish_trajectory"):
+            (
+                goal_completion_status,
+                subgoal_completion_status,
+            ) = self._inference_controller.get_goal_completion_status()
+            last_game_state = self._inference_controller.get_latest_game_state()
+
+        self._run_off_critical_path(
+            self._record_trajectory_results,
+            trajectory,
+            goal_completion_status=goal_completion_status,
+            subgoal_completion_status=subgoal_completion_status,
+            actions_for_session=actions_for_session,
+            last_game_state=last_game_state,
+            remaining_utterances=trajectory.utterances[processed_utterance_counter:],
+        )
+
+    def _record_trajectory_results(
+        self,
+        trajectory: MissionTrajectory,
+        *,
+        goal_completion_status: bool,
+        subgoal_completion_status: list[Literal[0, 1]],
+        actions_for_session: list[Any],
+        last_game_state: dict[str, Any],
+        remaining_utterances: list[str],
+    ) -> None:
+        """Update the metrics and send the results to WandB."""
         self._evaluation_metrics.update(
             mission_id=trajectory.mission_id or trajectory.session_id,
             mission_group=trajectory.mission_group,
             is_mission_completed=goal_completion_status,
             subgoal_completion_status=subgoal_completion_status,
             predicted_actions=actions_for_session,
-            last_game_state=self._inference_controller.get_latest_game_state(),
-            remaining_utterances=trajectory.utterances[processed_utterance_counter:],
+            last_game_state=last_game_state,
+            remaining_utterances=remaining_utterances,
         )
 
+        live_metrics.record_mission(trajectory.mission_group, is_success=goal_completion_status)
+
         self._wandb_callback.finish_trajectory(
             trajectory,
             evaluation_metrics=self._evaluation_metrics,
@@ -1,12 +1,10 @@
+import os
 import random
 from pathlib import Path
+from typing import Optional
 
 from loguru import logger
 
-from arena_missions.builders import ChallengeBuilder, MissionBuilder, RequiredObjectBuilder
-from arena_missions.structures import MissionTrajectory
-from simbot_offline_inference.commands.run_trajectories_in_arena import run_trajectories_in_arena
-from simbot_offline_inference.metrics import WandBTrajectoryGenerationCallback
 from simbot_offline_inference.settings import Settings
 
 
@@ -20,22 +18,59 @@ def generate_trajectories(
     *,
     session_id_prefix: str = "T",
     enable_randomisation_in_session_id: bool = True,
+    num_workers: Optional[int] = None,
+    rng_seed: Optional[int] = None,
+    query: Optional[list[str]] = None,
+    num_per_group: Optional[int] = None,
+    group_by: str = "action",
 ) -> None:
-    """Generate trajectories from the missions."""
+    """Generate trajectories from the missions.
+
+    Missions are generated in parallel across all CPUs unless `num_workers` is given. Set the
+    `rng_seed` to generate the same missions and session IDs every time, whatever the number of
+    workers.
+
+    To only generate some of the missions, query the fields of their high-level keys with
+    `--query action=pickup --query target-object=Apple,Bowl_01`, and sample up to
+    `num_per_group` missions for each value of the comma-separated `group_by` fields.
+    """
+    from arena_missions.builders import (  # noqa: WPS433
+        ChallengeBuilder,
+        MissionBuilder,
+        RequiredObjectBuilder,
+        select_challenge_builders,
+    )
+
     settings = Settings()
     settings.put_settings_in_environment()
     settings.prepare_file_system()
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    logger.info("Loading missions...")
+    challenge_builder_entries = select_challenge_builders(
+        ChallengeBuilder(),
+        query or [],
+        num_per_group=num_per_group,
+        group_by=group_by.split(","),
+        rng_seed=rng_seed,
+    )
+
+    logger.info(f"Generating {len(challenge_builder_entries)} missions...")
     missions = list(
-        MissionBuilder(ChallengeBuilder(), RequiredObjectBuilder()).generate_all_missions()
+        MissionBuilder(ChallengeBuilder(), RequiredObjectBuilder()).generate_missions(
+            challenge_builder_entries,
+            num_workers=num_workers or os.cpu_count() or 1,
+            rng_seed=rng_seed,
+        )
     )
     logger.info(f"Loaded {len(missions)} missions")
 
+    # Session IDs are created in this process, so they only depend on the order of the missions
+    session_id_rng = random.Random(rng_seed) if rng_seed is not None else None
     trajectories = [
         mission.convert_to_trajectory(
-            session_id_prefix, include_randomness=enable_randomisation_in_session_id
+            session_id_prefix,
+            include_randomness=enable_randomisation_in_session_id,
+            rng=session_id_rng,
         )
         for mission in missions
     ]
@@ -62,6 +97,12 @@ def run_trajectories(
     randomise_order: bool = False,
 ) -> None:
     """Run trajectories from disk."""
+    from arena_missions.structures import MissionTrajectory  # noqa: WPS433
+    from simbot_offline_inference.commands.run_trajectories_in_arena import (  # noqa: WPS433
+        run_trajectories_in_arena,
+    )
+    from simbot_offline_inference.metrics import WandBTrajectoryGenerationCallback  # noqa: WPS433
+
     if not trajectories_dir.is_dir():
         raise NotADirectoryError("The given path is not a directory.")
 
@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from loguru import logger
+from rich import print as rich_print
+from rich.table import Table
+
+from simbot_offline_inference.metrics.evaluation import (
+    merge_metrics_states,
+    rebuild_metrics_state_from_journals,
+    summarise_metrics_state,
+)
+from simbot_offline_inference.settings import Settings
+
+
+def load_shard_results(results_dir: Path, results_file_name: Path) -> list[dict[str, Any]]:
+    """Load the results from every shard, making sure that none of them are missing.
+
+    When workers share a trajectory queue, each worker saves its own results, so there can be
+    multiple results for each shard.
+    """
+    results_glob = f"{results_file_name.stem}.*{results_file_name.suffix}"
+    shard_results = [
+        orjson.loads(results_path.read_bytes())
+        for results_path in sorted(results_dir.glob(results_glob))
+    ]
+
+    if not shard_results:
+        raise FileNotFoundError(f"There are no shard results matching `{results_glob}`.")
+
+    num_shards = {results["metadata"]["num_shards"] for results in shard_results}
+    if len(num_shards) > 1:
+        raise AssertionError(f"The shards are from different splits: {sorted(num_shards)}")
+
+    expected_shard_indices = set(range(num_shards.pop()))
+    shard_indices = {results["metadata"]["shard_index"] for results in shard_results}
+    if shard_indices != expected_shard_indices:
+        missing_shards = sorted(expected_shard_indices.difference(shard_indices))
+        raise AssertionError(f"Cannot merge the shards, missing results for {missing_shards}")
+
+    return shard_results
+
+
+def find_worker_journals(journals_dir: Path, checkpoint_file_name: Path) -> list[Path]:
+    """Find the checkpoint journal of every worker that ran trajectories from a queue."""
+    return sorted(
+        journals_dir.glob(f"{checkpoint_file_name.stem}.*worker-*{checkpoint_file_name.suffix}")
+    )
+
+
+def merge_worker_and_shard_metrics(
+    shard_results: list[dict[str, Any]], worker_journals: list[Path]
+) -> dict[str, Any]:
+    """Merge the metrics from every shard and worker.
+
+    The metrics for workers that shared a trajectory queue are rebuilt from their journals, since
+    a worker that died never saved its results.
+    """
+    metrics_states = [
+        results["metrics"] for results in shard_results if not results["metadata"].get("worker_id")
+    ]
+    worker_metrics_states = [
+        results["metrics"] for results in shard_results if results["metadata"].get("worker_id")
+    ]
+
+    if worker_journals:
+        logger.info(f"Rebuilding the metrics from {len(worker_journals)} worker journals")
+        metrics_states.append(rebuild_metrics_state_from_journals(worker_journals))
+    elif worker_metrics_states:
+        logger.warning(
+            "There are no worker journals, so the results of any workers that died are missing"
+        )
+        metrics_states.extend(worker_metrics_states)
+
+    return merge_metrics_states(metrics_states)
+
+
+def merge_evaluation_shards(
+    results_dir: Optional[Path] = None,
+    output_path: Optional[Path] = None,
+    journals_dir: Optional[Path] = None,
+) -> None:
+    """Merge the results from each shard or worker, as if the evaluation ran on a single host."""
+    settings = Settings()
+    results_dir = results_dir or settings.evaluation_results.parent
+    output_path = output_path or results_dir.joinpath(settings.evaluation_results.name)
+    journals_dir = journals_dir or settings.evaluation_metrics_checkpoint.parent
+
+    shard_results = load_shard_results(results_dir, Path(settings.evaluation_results.name))
+    logger.info(f"Merging the results from {len(shard_results)} shards")
+
+    merged_metrics = merge_worker_and_shard_metrics(
+        shard_results,
+        find_worker_journals(journals_dir, Path(settings.evaluation_metrics_checkpoint.name)),
+    )
+    summary = summarise_metrics_state(merged_metrics)
+
+    output_path.write_bytes(
+        orjson.dumps(
+            {
+                "metadata": {"num_merged_shards": len(shard_results)},
+                "metrics": merged_metrics,
+                "summary": summary,
+            },
+            option=orjson.OPT_INDENT_2,
+        )
+    )
+    logger.info(f"Saved the merged results to `{output_path}`")
+
+    summary_table = Table("Metric", "Value", title="Merged evaluation results")
+    for metric_name, metric_value in summary.items():
+        summary_table.add_row(metric_name, f"{metric_value:.4f}")
+    rich_print(summary_table)
@@ -0,0 +1,143 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+import orjson
+from loguru import logger
+from rich import print as rich_print
+from rich.table import Table
+
+from simbot_offline_inference.settings import Settings
+
+
+if TYPE_CHECKING:
+    from arena_missions.structures import MissionTrajectory
+    from simbot_offline_inference.action_replayer import ReplayInstance, ReplayResult
+
+
+def get_original_goal_completion_status(last_game_state: dict[str, Any]) -> Optional[bool]:
+    """Get whether every goal was complete at the end of the original run."""
+    challenge_progress = last_game_state.get("challengeProgress") or {}
+    challenge_goals = challenge_progress.get("ChallengeGoals")
+
+    if not challenge_goals:
+        return None
+
+    return all(goal.get("isFinished", False) for goal in challenge_goals)
+
+
+def load_replay_instances(
+    trajectories: list["MissionTrajectory"], evaluation_output_dir: Path
+) -> list["ReplayInstance"]:
+    """Load the saved actions for every trajectory that has been evaluated."""
+    from arena_missions.structures import CDF  # noqa: WPS433
+    from simbot_offline_inference.action_replayer import ReplayInstance  # noqa: WPS433
+
+    replay_instances = []
+
+    for trajectory in trajectories:
+        mission_id = trajectory.mission_id or trajectory.session_id
+        output_path = evaluation_output_dir.joinpath(f"{mission_id}.json")
+
+        if not output_path.exists():
+            continue
+
+        if trajectory.preparation_utterances:
+            logger.warning(f"Skipping {mission_id} since its preparation needs the Experience Hub")
+            continue
+
+        mission_outputs = orjson.loads(output_path.read_bytes())
+        replay_instances.append(
+            ReplayInstance(
+                mission_id=mission_id,
+                cdf=trajectory.cdf_as_dict,
+                predicted_actions=mission_outputs["predicted_actions"],
+                original_goal_completion_status=get_original_goal_completion_status(
+                    mission_outputs["last_game_state"]
+                ),
+                session_id=trajectory.session_id,
+                start_room=trajectory.cdf.start_room if isinstance(trajectory.cdf, CDF) else None,
+                randomise_start_position=trajectory.randomise_start_position,
+            )
+        )
+
+    return replay_instances
+
+
+def print_replay_summary(replay_results: list["ReplayResult"]) -> None:
+    """Print the scores and throughput of the replayed missions."""
+    num_subgoals = sum(len(result.subgoal_completion_status) for result in replay_results)
+    num_actions = sum(result.num_actions for result in replay_results)
+    num_interactions = sum(result.num_interactions for result in replay_results)
+    total_duration = sum(result.duration for result in replay_results)
+
+    summary_table = Table("Metric", "Value", title="Replayed missions")
+    summary_table.add_row("Missions replayed", str(len(replay_results)))
+    summary_table.add_row(
+        "Success rate",
+        f"{sum(result.goal_completion_status for result in replay_results) / len(replay_results):.4f}",
+    )
+    summary_table.add_row(
+        "Subgoal success rate",
+        f"{sum(sum(result.subgoal_completion_status) for result in replay_results) / max(num_subgoals, 1):.4f}",
+    )
+    summary_table.add_row(
+        "Missions with a different result",
+        str(sum(not result.matches_original for result in replay_results)),
+    )
+    summary_table.add_row(
+        "Actions per interaction", f"{num_actions / max(num_interactions, 1):.2f}"
+    )
+    summary_table.add_row("Actions per second", f"{num_actions / max(total_duration, 1e-9):.2f}")
+    rich_print(summary_table)
+
+
+def replay_saved_actions(
+    trajectories_dir: Optional[Path] = None, max_actions_per_interaction: int = 10
+) -> None:
+    """Replay the saved actions for every evaluated mission in the Arena, without any model.
+
+    By default, the missions are from the T1 evaluation set. Otherwise, the trajectories are
+    loaded from the directory.
+    """
+    from arena_missions.structures import MissionTrajectory  # noqa: WPS433
+    from emma_common.logging import setup_rich_logging  # noqa: WPS433
+    from simbot_offline_inference.action_replayer import ActionReplayer  # noqa: WPS433
+    from simbot_offline_inference.commands.run_their_evaluation import (  # noqa: WPS433
+        process_their_trajectory_data,
+    )
+    from simbot_offline_inference.orchestrators import ArenaOrchestrator  # noqa: WPS433
+
+    settings = Settings()
+    settings.put_settings_in_environment()
+    settings.prepare_file_system()
+
+    setup_rich_logging()
+
+    if trajectories_dir is None:
+        trajectories = process_their_trajectory_data(
+            settings.trajectory_dir.joinpath("valid.json"), session_id_prefix="T1"
+        )
+    else:
+        trajectories = [
+            MissionTrajectory.parse_file(trajectory_file)
+            for trajectory_file in trajectories_dir.rglob("*.json")
+        ]
+
+    replay_instances = load_replay_instances(trajectories, settings.evaluation_output_dir)
+    logger.info(f"Found saved actions for {len(replay_instances)} missions")
+
+    if not replay_instances:
+        return
+
+    action_replayer = ActionReplayer(
+        ArenaOrchestrator(), max_actions_per_interaction=max_actions_per_interaction
+    )
+
+    replay_results = []
+    with open(settings.replay_results, "wb") as replay_results_file:
+        for replay_result in action_replayer.replay_missions(replay_instances):
+            replay_results.append(replay_result)
+            replay_results_file.write(orjson.dumps(replay_result._asdict()) + b"\n")
+
+    logger.info(f"Saved the results of every replayed mission to `{settings.replay_results}`")
+    print_replay_summary(replay_results)
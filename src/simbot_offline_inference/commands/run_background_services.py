@@ -1,11 +1,12 @@
-from emma_experience_hub.commands.simbot.cli import (
-    run_background_services as run_exp_hub_background_services,
-)
 from simbot_offline_inference.settings import Settings
 
 
 def run_background_services() -> None:
     """Run the background services for the Experience Hub."""
+    from emma_experience_hub.commands.simbot.cli import (  # noqa: WPS433
+        run_background_services as run_exp_hub_background_services,
+    )
+
     settings = Settings()
     settings.put_settings_in_environment()
 
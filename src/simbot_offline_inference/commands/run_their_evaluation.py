@@ -2,16 +2,20 @@ import json
 from collections.abc import Iterator
 from pathlib import Path
 from shutil import rmtree
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
 from loguru import logger
 from rich.progress import track
 
-from arena_missions.structures import MissionTrajectory
-from simbot_offline_inference.commands.run_trajectories_in_arena import run_trajectories_in_arena
-from simbot_offline_inference.metrics import MissionGroup, WandBEvaluationCallback
+from simbot_offline_inference.metrics.completed_missions import CompletedMissionIndex
+from simbot_offline_inference.metrics.evaluation import MissionGroup
 from simbot_offline_inference.settings import Settings
+from simbot_offline_inference.sharding import Shard
+
+
+if TYPE_CHECKING:
+    from arena_missions.structures import MissionTrajectory
 
 
 def extract_mission_group_from_description(mission_desc: str) -> Optional[MissionGroup]:
@@ -40,8 +44,10 @@ def extract_mission_group_from_description(mission_desc: str) -> Optional[Missio
 
 def process_their_trajectory_data(
     in_file: Path, session_id_prefix: str
-) -> list[MissionTrajectory]:
+) -> list["MissionTrajectory"]:
     """Process the trajectory data from their evaluation sets."""
+    from arena_missions.structures import MissionTrajectory  # noqa: WPS433, WPS442
+
     task_data = json.loads(in_file.read_bytes())
 
     test_instances: list[MissionTrajectory] = []
@@ -72,27 +78,86 @@ def process_their_trajectory_data(
     return test_instances
 
 
+def remove_previous_shard_run(
+    settings: Settings, shard: Shard, instances: list["MissionTrajectory"]
+) -> None:
+    """Remove the outputs and files from a previous run of the shard.
+
+    The outputs and the index of completed missions are shared by every shard, so only the
+    missions in this shard are removed from them.
+    """
+    mission_ids = [instance.mission_id or instance.session_id for instance in instances]
+    for mission_id in mission_ids:
+        settings.evaluation_output_dir.joinpath(f"{mission_id}.json").unlink(missing_ok=True)
+
+    CompletedMissionIndex(settings.evaluation_output_dir, settings.evaluation_output_index).forget(
+        mission_ids
+    )
+
+    for shared_path in (
+        settings.evaluation_results,
+        settings.evaluation_metrics_checkpoint,
+        settings.trajectory_queue_path,
+    ):
+        shard_path = shard.path_for(shared_path)
+        shard_path.unlink(missing_ok=True)
+
+        # Remove the files from every worker that ran the shard from a queue too
+        for worker_path in shard_path.parent.glob(
+            f"{shard_path.stem}.worker-*{shard_path.suffix}"
+        ):
+            worker_path.unlink()
+
+
 def run_their_evaluation(
     wandb_project: str = "alexa-arena-evaluation",
     *,
     force_from_scratch: bool = False,
+    shard_index: int = 0,
+    num_shards: int = 1,
 ) -> None:
-    """Run the evaluation on the test set."""
+    """Run the evaluation on the test set.
+
+    To split the evaluation across multiple machines, run each shard with its own
+    `--shard-index` and the same `--num-shards`, then merge the results with
+    `merge-evaluation-shards`. Every machine agrees on which missions belong to each shard.
+    """
+    from simbot_offline_inference.commands.run_trajectories_in_arena import (  # noqa: WPS433
+        run_trajectories_in_arena,
+    )
+    from simbot_offline_inference.metrics import WandBEvaluationCallback  # noqa: WPS433
+
     settings = Settings()
 
-    if force_from_scratch:
-        logger.info(
-            "Removing any previously run missions so that all missions can be run from scratch."
-        )
-        rmtree(settings.evaluation_output_dir)
+    shard = Shard(index=shard_index, count=num_shards)
+    shard.validate()
 
     trajectory_data_path = settings.trajectory_dir.joinpath("valid.json")
 
     logger.info(f"Loading test data from {trajectory_data_path}")
     instances = process_their_trajectory_data(trajectory_data_path, session_id_prefix="T1")
 
+    if shard.is_sharded:
+        instances = shard.select(instances)
+        logger.info(f"Running the {len(instances)} missions in {shard.name}")
+
+    if force_from_scratch and shard.is_sharded:
+        logger.info(
+            f"Removing the missions previously run in {shard.name} to run them from scratch."
+        )
+        remove_previous_shard_run(settings, shard, instances)
+
+    elif force_from_scratch:
+        logger.info(
+            "Removing any previously run missions so that all missions can be run from scratch."
+        )
+        rmtree(settings.evaluation_output_dir)
+        settings.evaluation_output_index.unlink(missing_ok=True)
+        settings.evaluation_results.unlink(missing_ok=True)
+
     run_trajectories_in_arena(
         instances,
+        shard=shard,
         wandb_callback=WandBEvaluationCallback(
             project=wandb_project,
             entity=settings.wandb_entity,
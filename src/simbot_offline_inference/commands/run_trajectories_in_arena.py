@@ -1,25 +1,62 @@
+from typing import TYPE_CHECKING
+
 from loguru import logger
-from torchmetrics import MeanMetric
-
-from arena_missions.structures import MissionTrajectory
-from emma_common.logging import setup_rich_logging
-from simbot_offline_inference.arena_evaluator import SimBotArenaEvaluator
-from simbot_offline_inference.inference_controller import SimBotInferenceController
-from simbot_offline_inference.metrics import EvaluationMetrics, WandBCallback
-from simbot_offline_inference.orchestrators import ArenaOrchestrator, ExperienceHubOrchestrator
+
 from simbot_offline_inference.settings import Settings
+from simbot_offline_inference.sharding import Shard
+
+
+if TYPE_CHECKING:
+    from arena_missions.structures import MissionTrajectory
+    from simbot_offline_inference.metrics import WandBCallback
 
 
 def run_trajectories_in_arena(
-    instances: list[MissionTrajectory], *, wandb_callback: WandBCallback
+    instances: list["MissionTrajectory"],
+    *,
+    wandb_callback: "WandBCallback",
+    shard: Shard = Shard(),
 ) -> None:
-    """Run the evaluation."""
+    """Run the evaluation.
+
+    When running one shard of a larger evaluation, the instances should already be those for the
+    shard. Each shard keeps its own checkpoint and results, so they can share storage.
+    """
+    # The Arena, the Experience Hub and their dependencies are slow to import, so only import
+    # them when they are needed.
+    from emma_common.logging import setup_rich_logging  # noqa: WPS433
+    from simbot_offline_inference.arena_evaluator import SimBotArenaEvaluator  # noqa: WPS433
+    from simbot_offline_inference.inference_controller import (  # noqa: WPS433
+        SimBotInferenceController,
+    )
+    from simbot_offline_inference.job_queue import TrajectoryQueue  # noqa: WPS433
+    from simbot_offline_inference.live_metrics import (  # noqa: WPS433
+        LiveMetricsExporter,
+        live_metrics,
+    )
+    from simbot_offline_inference.metrics import EvaluationMetrics, MeanMetric  # noqa: WPS433
+    from simbot_offline_inference.orchestrators import (  # noqa: WPS433
+        ArenaOrchestrator,
+        ExperienceHubOrchestrator,
+    )
+    from simbot_offline_inference.preparation_cache import (  # noqa: WPS433
+        PreparationActionCache,
+    )
+    from simbot_offline_inference.scheduling import (  # noqa: WPS433
+        MissionHistory,
+        schedule_trajectories,
+    )
+    from simbot_offline_inference.tracing import tracer  # noqa: WPS433
+
     settings = Settings()
     settings.put_settings_in_environment()
     settings.prepare_file_system()
 
     setup_rich_logging()
 
+    if settings.enable_tracing:
+        tracer.configure(settings.trace_dir, settings.trace_format)
+
     logger.info("Preparing orchestrators and evaluators")
     arena_orchestrator = ArenaOrchestrator()
     experience_hub_orchestrator = ExperienceHubOrchestrator(
@@ -34,11 +71,49 @@ def run_trajectories_in_arena(
     inference_controller = SimBotInferenceController(
         arena_orchestrator, experience_hub_orchestrator
     )
+
+    evaluation_metrics_checkpoint = shard.path_for(settings.evaluation_metrics_checkpoint)
+    evaluation_results_path = shard.path_for(settings.evaluation_results)
+
+    # Other shards might have written outputs, so only resume if this shard has a checkpoint
+    should_resume_previous_wandb_run = (
+        evaluation_metrics_checkpoint.exists()
+        if shard.is_sharded
+        else settings.should_resume_previous_wandb_run
+    )
+
+    mission_history = MissionHistory(settings.mission_history)
+    if settings.scheduling_policy != "in_order":
+        logger.info(f"Scheduling the instances with the `{settings.scheduling_policy}` policy")
+        instances = schedule_trajectories(instances, settings.scheduling_policy, mission_history)
+
+    trajectory_queue = None
+    if settings.use_trajectory_queue:
+        # Every worker adds the same instances, and the queue ignores any it already has
+        trajectory_queue = TrajectoryQueue(
+            shard.path_for(settings.trajectory_queue_path),
+            lease_duration=settings.trajectory_queue_lease_duration,
+            max_attempts=settings.trajectory_queue_max_attempts,
+        )
+        num_new_instances = trajectory_queue.enqueue(instances)
+        logger.info(f"Added {num_new_instances} new instances to the queue")
+
+        # The queue keeps track of what has already run, so each worker only needs to keep the
+        # metrics for the trajectories it runs itself. The results are merged from the checkpoint
+        # of every worker, including any that died, so nothing a worker finished is lost.
+        evaluation_metrics_checkpoint = trajectory_queue.path_for_worker(
+            evaluation_metrics_checkpoint
+        )
+        evaluation_results_path = trajectory_queue.path_for_worker(evaluation_results_path)
+        should_resume_previous_wandb_run = False
+
     evaluation_metrics = EvaluationMetrics(
         settings.evaluation_output_dir,
-        settings.evaluation_metrics_checkpoint,
+        evaluation_metrics_checkpoint,
         MeanMetric(),
         MeanMetric(),
+        completed_missions_index_path=settings.evaluation_output_index,
+        evaluation_results_path=evaluation_results_path,
     )
 
     evaluator = SimBotArenaEvaluator(
@@ -46,10 +121,37 @@ def run_trajectories_in_arena(
         evaluation_metrics,
         wandb_callback,
         enforce_successful_preparation=settings.enforce_successful_preparation,
-        should_resume_previous_wandb_run=settings.should_resume_previous_wandb_run,
+        should_resume_previous_wandb_run=should_resume_previous_wandb_run,
+        enable_pipelining=settings.enable_pipelined_evaluation,
+        mission_history=mission_history,
+        preparation_cache=(
+            PreparationActionCache(settings.preparation_cache_dir)
+            if settings.enable_preparation_replay
+            else None
+        ),
     )
 
-    logger.info(f"Running evaluation for {len(instances)} instances...")
-    evaluator.run_evaluation(instances)
+    live_metrics_exporter = LiveMetricsExporter(
+        live_metrics, host=settings.live_metrics_host, port=settings.live_metrics_port
+    )
+    if settings.enable_live_metrics:
+        live_metrics_exporter.start()
+
+    try:
+        if trajectory_queue is not None:
+            logger.info(f"Running instances from the queue as `{trajectory_queue.worker_id}`...")
+            evaluator.run_evaluation_from_queue(trajectory_queue)
+        else:
+            logger.info(f"Running evaluation for {len(instances)} instances...")
+            evaluator.run_evaluation(instances)
+    finally:
+        live_metrics_exporter.stop()
+
+        # Save whatever finished, so the merge knows this shard ran even if the evaluation failed
+        evaluation_metrics.save_results(
+            shard_index=shard.index,
+            num_shards=shard.count,
+            worker_id=trajectory_queue.worker_id if trajectory_queue is not None else None,
+        )
 
     logger.info("Done!")
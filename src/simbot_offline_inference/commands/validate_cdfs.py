@@ -1,4 +1,6 @@
+import os
 from pathlib import Path
+from typing import Optional
 
 from loguru import logger
 from rich import box, print as rich_print
@@ -6,18 +8,19 @@ from rich.columns import Columns
 from rich.panel import Panel
 from rich.table import Table
 
-from arena_missions.builders import ChallengeBuilder
-from arena_missions.builders.mission_builder import MissionBuilder
-from arena_missions.builders.required_objects_builder import RequiredObjectBuilder
-from arena_missions.structures import Mission
-from emma_common.logging import setup_rich_logging
-from simbot_offline_inference.challenge_validator import CDFValidationInstance, ChallengeValidator
-from simbot_offline_inference.orchestrators import ArenaOrchestrator
 from simbot_offline_inference.settings import Settings
 
 
 def validate_cdfs(directory: Path) -> None:
     """Validate the CDFs in the directory."""
+    from arena_missions.structures import Mission  # noqa: WPS433
+    from emma_common.logging import setup_rich_logging  # noqa: WPS433
+    from simbot_offline_inference.challenge_validator import (  # noqa: WPS433
+        CDFValidationInstance,
+        ChallengeValidator,
+    )
+    from simbot_offline_inference.orchestrators import ArenaOrchestrator  # noqa: WPS433
+
     settings = Settings()
     settings.put_settings_in_environment()
     settings.prepare_file_system()
@@ -41,15 +44,50 @@ def validate_cdfs(directory: Path) -> None:
     logger.info("Done.")
 
 
-def validate_generated_missions() -> None:
-    """Validate all missions from the `MissionBuilder`."""
+def validate_generated_missions(
+    num_workers: Optional[int] = None,
+    rng_seed: Optional[int] = None,
+    query: Optional[list[str]] = None,
+    num_per_group: Optional[int] = None,
+    group_by: str = "action",
+) -> None:
+    """Validate all missions from the `MissionBuilder`.
+
+    Missions are generated in parallel across all CPUs unless `num_workers` is given. Use
+    `--query` and `--num-per-group` to only validate some of the missions, the same way as when
+    generating trajectories.
+    """
+    from arena_missions.builders import (  # noqa: WPS433
+        ChallengeBuilder,
+        MissionBuilder,
+        RequiredObjectBuilder,
+        select_challenge_builders,
+    )
+    from emma_common.logging import setup_rich_logging  # noqa: WPS433
+    from simbot_offline_inference.challenge_validator import (  # noqa: WPS433
+        CDFValidationInstance,
+        ChallengeValidator,
+    )
+    from simbot_offline_inference.orchestrators import ArenaOrchestrator  # noqa: WPS433
+
     settings = Settings()
     settings.put_settings_in_environment()
     settings.prepare_file_system()
 
     setup_rich_logging()
 
-    missions = MissionBuilder(ChallengeBuilder(), RequiredObjectBuilder()).generate_all_missions()
+    challenge_builder_entries = select_challenge_builders(
+        ChallengeBuilder(),
+        query or [],
+        num_per_group=num_per_group,
+        group_by=group_by.split(","),
+        rng_seed=rng_seed,
+    )
+    missions = MissionBuilder(ChallengeBuilder(), RequiredObjectBuilder()).generate_missions(
+        challenge_builder_entries,
+        num_workers=num_workers or os.cpu_count() or 1,
+        rng_seed=rng_seed,
+    )
     cdfs = [
         CDFValidationInstance(cdf=mission.cdf, path=mission.high_level_key.key)
         for mission in missions
@@ -66,6 +104,8 @@ def validate_generated_missions() -> None:
 
 def print_high_level_keys() -> None:
     """Print all the high level keys from the registered challenge builder."""
+    from arena_missions.builders import ChallengeBuilder  # noqa: WPS433
+
     keys = sorted([str(key) for key in ChallengeBuilder.list_available()])
     columns = Columns(keys)
     panel = Panel(
@@ -79,6 +119,8 @@ def print_high_level_keys() -> None:
 
 def print_challenges_per_high_level_key() -> None:
     """Print the challenges that exist per high-level key."""
+    from arena_missions.builders import ChallengeBuilder  # noqa: WPS433
+
     table = Table(box=box.ROUNDED, style="yellow", highlight=True)
     table.add_column("High-level key")
     table.add_column("Num. challenges")
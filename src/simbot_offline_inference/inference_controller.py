@@ -1,10 +1,11 @@
 import time
 from contextlib import ExitStack
-from typing import Any, Literal
+from typing import Any, Literal, Optional
 
 from loguru import logger
 
 from arena_wrapper.enums.object_output_wrapper import ObjectOutputType
+from simbot_offline_inference.live_metrics import live_metrics
 from simbot_offline_inference.orchestrators import ArenaOrchestrator, ExperienceHubOrchestrator
 
 
@@ -30,6 +31,7 @@ class SimBotInferenceController:
 
         self.randomise_start_position = self._arena_orchestrator.randomise_start_position
         self.go_to_random_viewpoint = self._arena_orchestrator.go_to_random_viewpoint
+        self.go_to_random_start_position = self._arena_orchestrator.go_to_random_start_position
 
     def __enter__(self) -> None:
         """Initialize the services."""
@@ -88,11 +90,17 @@ class SimBotInferenceController:
         return goal_completion_status, subgoal_completion_status
 
     def handle_utterance(  # noqa: WPS231
-        self, session_id: str, utterance: str
+        self,
+        session_id: str,
+        utterance: str,
+        *,
+        executed_action_batches: Optional[list[list[dict[str, Any]]]] = None,
     ) -> list[dict[str, Any]]:
         """Handle execution of a single utterance in the arena.
 
-        Return a list of all actions taken for the current utterance.
+        Return a list of all actions taken for the current utterance. If given, the actions sent
+        to the arena in each step that were executed successfully are also added to
+        `executed_action_batches`, so that they can be replayed with `replay_actions`.
         """
         actions_taken: list[dict[str, Any]] = []
         previous_action_statuses: list[Any] = []
@@ -136,6 +144,11 @@ class SimBotInferenceController:
             )
             logger.debug(f"Received response from arena: {return_val}, {action_status}")
 
+            # Only keep the batches that worked, since replaying one that failed would fail again
+            # even though the Experience Hub recovered from it
+            if executed_action_batches is not None and interaction_actions and return_val:
+                executed_action_batches.append(interaction_actions)
+
             # Update the previous action statuses so it goes back to the arena
             if not should_return_control or not return_val:
                 if action_status is not None:
@@ -160,6 +173,23 @@ class SimBotInferenceController:
 
         return actions_taken
 
+    def replay_actions(self, action_batches: list[list[dict[str, Any]]], utterance: str) -> bool:
+        """Execute actions in the arena without asking the Experience Hub.
+
+        Each batch is sent to the arena on its own, in the same way as when it was first
+        executed. Return False if any of the batches could not be executed.
+        """
+        for actions in action_batches:
+            return_val, action_status = self._arena_orchestrator.execute_action(
+                actions, self._object_output_type, utterance
+            )
+
+            if not return_val:
+                logger.error(f"Could not replay the actions {actions}: {action_status}")
+                return False
+
+        return True
+
     def get_latest_game_state(self) -> dict[str, Any]:
         """Get the latest game state for the evaluation output."""
         if self._arena_orchestrator.response is None:
@@ -209,6 +239,7 @@ class SimBotInferenceController:
 
     def restart_arena(self) -> bool:
         """Restart the Arena."""
+        live_metrics.record_arena_restart()
         self._arena_orchestrator.kill_unity_instance()
 
         logger.info("Waiting for 30 seconds before restarting the arena...")
@@ -0,0 +1,268 @@
+import os
+import socket
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Event, Thread
+from typing import Literal, NamedTuple, Optional
+
+from loguru import logger
+
+from arena_missions.structures import MissionTrajectory
+
+
+TrajectoryStatus = Literal["pending", "running", "done", "failed"]
+
+CREATE_TRAJECTORIES_TABLE = """
+CREATE TABLE IF NOT EXISTS trajectories (
+    trajectory_key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    trajectory TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    lease_expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+)
+"""
+
+CREATE_STATUS_INDEX = """
+CREATE INDEX IF NOT EXISTS trajectories_by_status ON trajectories (status, position)
+"""
+
+
+def default_worker_id() -> str:
+    """Get an ID for this worker that is unique across every machine sharing the queue."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ClaimedTrajectory(NamedTuple):
+    """A trajectory that a worker has leased from the queue."""
+
+    trajectory_key: str
+    trajectory: MissionTrajectory
+    worker_id: str
+    attempt: int
+
+
+class TrajectoryQueue:
+    """Queue of trajectories, backed by SQLite, that multiple workers can run together.
+
+    Each worker claims a trajectory with a lease, which it needs to renew with a heartbeat for as
+    long as it is running the trajectory. If a worker dies, its lease expires and the trajectory
+    goes back on the queue for another worker to claim. Trajectories that fail are retried until
+    they have been attempted `max_attempts` times.
+
+    The database uses SQLite's default rollback journal rather than WAL, since WAL does not work
+    when the database is shared between machines over a network filesystem.
+    """
+
+    def __init__(
+        self,
+        database_path: Path,
+        *,
+        lease_duration: float = 600,
+        max_attempts: int = 3,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        self._database_path = database_path
+        self._lease_duration = lease_duration
+        self._max_attempts = max_attempts
+        self.worker_id = worker_id or default_worker_id()
+
+        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(CREATE_TRAJECTORIES_TABLE)
+            connection.execute(CREATE_STATUS_INDEX)
+
+    @property
+    def lease_duration(self) -> float:
+        """Get how long a lease lasts without a heartbeat, in seconds."""
+        return self._lease_duration
+
+    def path_for_worker(self, path: Path) -> Path:
+        """Get the path to use for a file that each worker needs its own copy of."""
+        return path.with_name(f"{path.stem}.worker-{self.worker_id}{path.suffix}")
+
+    def enqueue(self, trajectories: Iterable[MissionTrajectory]) -> int:
+        """Add the trajectories to the queue, and return how many were new.
+
+        Trajectories are identified by their mission ID, or session ID if they do not have one, so
+        every worker can safely enqueue the same trajectories.
+        """
+        with self._transaction() as connection:
+            (next_position,) = connection.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM trajectories"
+            ).fetchone()
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO trajectories (trajectory_key, position, trajectory) VALUES (?, ?, ?)",  # noqa: E501
+                (
+                    (trajectory.mission_id or trajectory.session_id, position, trajectory.json())
+                    for position, trajectory in enumerate(trajectories, start=next_position)
+                ),
+            )
+            return cursor.rowcount
+
+    def claim(self) -> Optional[ClaimedTrajectory]:
+        """Lease the next trajectory to run, or return None if there are none left to run."""
+        now = time.time()
+
+        with self._transaction() as connection:
+            # Give up on any trajectories whose workers keep dying while running them
+            connection.execute(
+                """
+                UPDATE trajectories
+                SET status = 'failed', error = 'The lease expired', worker_id = NULL
+                WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?
+                """,
+                (now, self._max_attempts),
+            )
+
+            claimable_row = connection.execute(
+                """
+                SELECT trajectory_key, trajectory, attempts FROM trajectories
+                WHERE status = 'pending' OR (status = 'running' AND lease_expires_at < ?)
+                ORDER BY position
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+
+            if claimable_row is None:
+                return None
+
+            trajectory_key, trajectory_json, attempts = claimable_row
+            connection.execute(
+                """
+                UPDATE trajectories
+                SET status = 'running', worker_id = ?, lease_expires_at = ?, attempts = ?
+                WHERE trajectory_key = ?
+                """,
+                (self.worker_id, now + self._lease_duration, attempts + 1, trajectory_key),
+            )
+
+        if attempts:
+            logger.warning(
+                f"Retrying `{trajectory_key}`, which has been attempted {attempts} times"
+            )
+
+        return ClaimedTrajectory(
+            trajectory_key=trajectory_key,
+            trajectory=MissionTrajectory.parse_raw(trajectory_json),
+            worker_id=self.worker_id,
+            attempt=attempts + 1,
+        )
+
+    def heartbeat(self, claimed_trajectory: ClaimedTrajectory) -> bool:
+        """Renew the lease on the trajectory, and return False if the lease has been lost."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE trajectories SET lease_expires_at = ?
+                WHERE trajectory_key = ? AND status = 'running' AND worker_id = ?
+                """,
+                (
+                    time.time() + self._lease_duration,
+                    claimed_trajectory.trajectory_key,
+                    claimed_trajectory.worker_id,
+                ),
+            )
+            return cursor.rowcount > 0
+
+    def mark_done(self, claimed_trajectory: ClaimedTrajectory) -> None:
+        """Mark the trajectory as done."""
+        self._finish(claimed_trajectory, status="done")
+
+    def mark_failed(self, claimed_trajectory: ClaimedTrajectory, error: str) -> None:
+        """Put the trajectory back on the queue, unless it has already used up all its attempts."""
+        status: TrajectoryStatus = (
+            "failed" if claimed_trajectory.attempt >= self._max_attempts else "pending"
+        )
+        self._finish(claimed_trajectory, status=status, error=error)
+
+    def count(self) -> dict[TrajectoryStatus, int]:
+        """Count the number of trajectories with each status."""
+        status_counts: dict[TrajectoryStatus, int] = {
+            "pending": 0,
+            "running": 0,
+            "done": 0,
+            "failed": 0,
+        }
+        with self._transaction() as connection:
+            for status, trajectory_count in connection.execute(
+                "SELECT status, COUNT(*) FROM trajectories GROUP BY status"
+            ):
+                status_counts[status] = trajectory_count
+        return status_counts
+
+    @contextmanager
+    def keep_alive(self, claimed_trajectory: ClaimedTrajectory) -> Iterator[None]:
+        """Renew the lease in the background for as long as the trajectory is running."""
+        has_finished = Event()
+
+        def send_heartbeats() -> None:  # noqa: WPS430
+            while not has_finished.wait(self._lease_duration / 3):
+                if not self.heartbeat(claimed_trajectory):
+                    logger.error(
+                        f"Lost the lease on `{claimed_trajectory.trajectory_key}`, another worker might run it too"
+                    )
+                    return
+
+        heartbeat_thread = Thread(target=send_heartbeats, name="queue-heartbeat", daemon=True)
+        heartbeat_thread.start()
+
+        try:
+            yield
+        finally:
+            has_finished.set()
+            heartbeat_thread.join()
+
+    def _finish(
+        self,
+        claimed_trajectory: ClaimedTrajectory,
+        *,
+        status: TrajectoryStatus,
+        error: Optional[str] = None,
+    ) -> None:
+        """Release the lease on the trajectory with its new status."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE trajectories
+                SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL
+                WHERE trajectory_key = ? AND status = 'running' AND worker_id = ?
+                """,
+                (
+                    status,
+                    error,
+                    claimed_trajectory.trajectory_key,
+                    claimed_trajectory.worker_id,
+                ),
+            )
+
+        if not cursor.rowcount:
+            logger.warning(
+                f"The lease on `{claimed_trajectory.trajectory_key}` expired before it finished, so it was not marked as {status}"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run everything within the context as a single transaction.
+
+        Each transaction takes the write lock straight away so that two workers cannot claim the
+        same trajectory. A new connection is used every time, so that the queue can be used from
+        multiple threads.
+        """
+        connection = sqlite3.connect(self._database_path, timeout=60, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
@@ -0,0 +1,267 @@
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Callable, Optional, TypeVar, cast
+
+from loguru import logger
+
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+# Upper bounds of the latency buckets, in seconds
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(**labels: str) -> str:
+    """Format the labels for a sample in the Prometheus text format."""
+    formatted_labels = ",".join(
+        '{0}="{1}"'.format(label_name, label_value.replace("\\", "\\\\").replace('"', '\\"'))
+        for label_name, label_value in labels.items()
+    )
+    return f"{{{formatted_labels}}}"
+
+
+class Histogram:
+    """Cumulative histogram of observed values, such as the latency of a request."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._bucket_counts = [0] * (len(self._buckets) + 1)
+        self._total = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    @property
+    def count(self) -> int:
+        """Get the number of observed values."""
+        return self._count
+
+    def observe(self, value: float) -> None:  # noqa: WPS110
+        """Add a value to the histogram."""
+        with self._lock:
+            self._bucket_counts[bisect_left(self._buckets, value)] += 1
+            self._total += value
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe how long everything within the context takes, in seconds."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time)
+
+    def wrap(self, func: T) -> T:
+        """Wrap the function so that the duration of every call to it is observed."""
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.time():
+                return func(*args, **kwargs)
+
+        return cast(T, wrapper)
+
+    def render(self, metric_name: str) -> list[str]:
+        """Render the histogram in the Prometheus text format."""
+        with self._lock:
+            bucket_counts = list(self._bucket_counts)
+            total = self._total
+            count = self._count
+
+        lines = []
+        cumulative_count = 0
+        for upper_bound, bucket_count in zip(self._buckets, bucket_counts):
+            cumulative_count += bucket_count
+            labels = _format_labels(le=str(upper_bound))
+            lines.append(f"{metric_name}_bucket{labels} {cumulative_count}")
+
+        lines.extend(
+            [
+                f"{metric_name}_bucket{_format_labels(le='+Inf')} {count}",
+                f"{metric_name}_sum {total}",
+                f"{metric_name}_count {count}",
+            ]
+        )
+        return lines
+
+
+class LiveMetrics:
+    """Metrics about the evaluation as it runs, for monitoring long-running evaluations.
+
+    These are always collected since they are cheap to update, but they are only published when
+    the `LiveMetricsExporter` is running.
+    """
+
+    def __init__(self) -> None:
+        self.arena_interact_latency = Histogram()
+        self.experience_hub_predict_latency = Histogram()
+
+        self._start_time = time.monotonic()
+        self._missions_remaining = 0
+        self._missions_completed: Counter[tuple[str, bool]] = Counter()
+        self._utterance_count = 0
+        self._action_count = 0
+        self._arena_restart_count = 0
+        self._lock = Lock()
+
+    @property
+    def missions_per_hour(self) -> float:
+        """Get the number of missions that have been completed per hour."""
+        elapsed_hours = (time.monotonic() - self._start_time) / 3600
+        return sum(self._missions_completed.values()) / elapsed_hours if elapsed_hours else 0
+
+    @property
+    def actions_per_utterance(self) -> float:
+        """Get the average number of actions taken for each utterance."""
+        return self._action_count / self._utterance_count if self._utterance_count else 0
+
+    def start_evaluation(self, num_missions: int) -> None:
+        """Start measuring the throughput of the evaluation."""
+        with self._lock:
+            self._start_time = time.monotonic()
+            self._missions_remaining = num_missions
+
+    def record_mission_dequeued(self) -> None:
+        """Record that a mission has been taken from the queue to run."""
+        with self._lock:
+            self._missions_remaining = max(self._missions_remaining - 1, 0)
+
+    def record_mission(self, mission_group: Optional[str], *, is_success: bool) -> None:
+        """Record the result of a mission."""
+        with self._lock:
+            self._missions_completed[(mission_group or "unknown", is_success)] += 1
+
+    def record_utterance(self, num_actions: int) -> None:
+        """Record how many actions were taken for an utterance."""
+        with self._lock:
+            self._utterance_count += 1
+            self._action_count += num_actions
+
+    def record_arena_restart(self) -> None:
+        """Record that the Arena has been restarted."""
+        with self._lock:
+            self._arena_restart_count += 1
+
+    def render(self) -> str:
+        """Render all the metrics in the Prometheus text format."""
+        with self._lock:
+            missions_completed = dict(self._missions_completed)
+            lines = [
+                "# TYPE simbot_missions_remaining gauge",
+                f"simbot_missions_remaining {self._missions_remaining}",
+                "# TYPE simbot_missions_per_hour gauge",
+                f"simbot_missions_per_hour {self.missions_per_hour}",
+                "# TYPE simbot_utterances_total counter",
+                f"simbot_utterances_total {self._utterance_count}",
+                "# TYPE simbot_actions_total counter",
+                f"simbot_actions_total {self._action_count}",
+                "# TYPE simbot_actions_per_utterance gauge",
+                f"simbot_actions_per_utterance {self.actions_per_utterance}",
+                "# TYPE simbot_arena_restarts_total counter",
+                f"simbot_arena_restarts_total {self._arena_restart_count}",
+            ]
+
+        lines.append("# TYPE simbot_missions_total counter")
+        for (mission_group, is_success), mission_count in sorted(missions_completed.items()):
+            labels = _format_labels(mission_group=mission_group, success=str(is_success).lower())
+            lines.append(f"simbot_missions_total{labels} {mission_count}")
+
+        lines.append("# TYPE simbot_arena_interact_latency_seconds histogram")
+        lines.extend(self.arena_interact_latency.render("simbot_arena_interact_latency_seconds"))
+        lines.append("# TYPE simbot_experience_hub_predict_latency_seconds histogram")
+        lines.extend(
+            self.experience_hub_predict_latency.render(
+                "simbot_experience_hub_predict_latency_seconds"
+            )
+        )
+
+        return "\n".join(lines) + "\n"
+
+
+class LiveMetricsExporter:
+    """Serve the live metrics over HTTP so that they can be scraped by Prometheus."""
+
+    def __init__(self, metrics: LiveMetrics, *, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self._metrics = metrics
+        self._host = host
+        self._port = port
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[Thread] = None
+
+    @property
+    def port(self) -> int:
+        """Get the port the metrics are served on, which is chosen by the OS if given 0."""
+        if self._server is None:
+            return self._port
+        return self._server.server_address[1]
+
+    def __enter__(self) -> "LiveMetricsExporter":
+        """Start serving the metrics."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any, **kwargs: Any) -> None:
+        """Stop serving the metrics."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start serving the metrics from a background thread."""
+        if self._server is not None:
+            return
+
+        self._server = ThreadingHTTPServer((self._host, self._port), self._build_request_handler())
+        self._server.daemon_threads = True
+        self._thread = Thread(
+            target=self._server.serve_forever, name="live-metrics-exporter", daemon=True
+        )
+        self._thread.start()
+
+        logger.info(f"Serving live metrics on http://{self._host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving the metrics."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+        self._server = None
+        self._thread = None
+
+    def _build_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        """Build the handler that responds to each scrape."""
+        metrics = self._metrics
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):  # noqa: WPS431
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)  # noqa: WPS432
+                    return
+
+                response_body = metrics.render().encode()
+                self.send_response(200)  # noqa: WPS432
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(response_body)))
+                self.end_headers()
+                self.wfile.write(response_body)
+
+            def log_message(self, *args: Any) -> None:
+                """Do not log every scrape."""
+                pass  # noqa: WPS420
+
+        return MetricsRequestHandler
+
+
+live_metrics = LiveMetrics()
@@ -1,6 +1,42 @@
-from simbot_offline_inference.metrics.evaluation import EvaluationMetrics, MissionGroup
-from simbot_offline_inference.metrics.wandb import (
-    WandBCallback,
-    WandBEvaluationCallback,
-    WandBTrajectoryGenerationCallback,
+from typing import TYPE_CHECKING, Any
+
+from simbot_offline_inference.metrics.aggregators import MeanMetric, SumMetric, nan_to_zero
+from simbot_offline_inference.metrics.completed_missions import CompletedMissionIndex
+from simbot_offline_inference.metrics.evaluation import (
+    EvaluationMetrics,
+    MissionGroup,
+    MissionMetrics,
+    merge_metrics_states,
+    rebuild_metrics_state_from_journals,
+    summarise_metrics_state,
 )
+from simbot_offline_inference.metrics.journal import MetricsJournal
+
+
+if TYPE_CHECKING:
+    from simbot_offline_inference.metrics.wandb import (
+        BackgroundWandBLogger,
+        WandBCallback,
+        WandBEvaluationCallback,
+        WandBTrajectoryGenerationCallback,
+    )
+
+
+_WANDB_CALLBACKS = frozenset(
+    (
+        "BackgroundWandBLogger",
+        "WandBCallback",
+        "WandBEvaluationCallback",
+        "WandBTrajectoryGenerationCallback",
+    )
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Only import the WandB callbacks when they are used, since wandb is slow to import."""
+    if name in _WANDB_CALLBACKS:
+        from simbot_offline_inference.metrics import wandb as wandb_callbacks  # noqa: WPS433
+
+        return getattr(wandb_callbacks, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,77 @@
+import math
+from typing import Any
+from typing_extensions import Self
+
+
+class SumMetric:
+    """Running sum of values."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+
+    def update(self, value: float) -> None:  # noqa: WPS110
+        """Add a value to the sum."""
+        self.total += value
+
+    def compute(self) -> float:
+        """Get the sum of all the values."""
+        return self.total
+
+    def merge(self, other: "SumMetric") -> None:
+        """Add the values from another metric into this one."""
+        self.total += other.total
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialise the state of the metric."""
+        return {"total": self.total}
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> Self:
+        """Rebuild the metric from its serialised state."""
+        metric = cls()
+        metric.total = state["total"]
+        return metric
+
+
+class MeanMetric:
+    """Running, optionally weighted, mean of values.
+
+    Like the torchmetrics version, the mean of no values is NaN.
+    """
+
+    def __init__(self) -> None:
+        self.weighted_total = 0.0
+        self.total_weight = 0.0
+
+    def update(self, value: float, weight: float = 1) -> None:  # noqa: WPS110
+        """Add a value to the mean."""
+        self.weighted_total += value * weight
+        self.total_weight += weight
+
+    def compute(self) -> float:
+        """Get the mean of all the values."""
+        if not self.total_weight:
+            return math.nan
+        return self.weighted_total / self.total_weight
+
+    def merge(self, other: "MeanMetric") -> None:
+        """Add the values from another metric into this one."""
+        self.weighted_total += other.weighted_total
+        self.total_weight += other.total_weight
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialise the state of the metric."""
+        return {"weighted_total": self.weighted_total, "total_weight": self.total_weight}
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> Self:
+        """Rebuild the metric from its serialised state."""
+        metric = cls()
+        metric.weighted_total = state["weighted_total"]
+        metric.total_weight = state["total_weight"]
+        return metric
+
+
+def nan_to_zero(value: float) -> float:  # noqa: WPS110
+    """Replace NaN with 0, such as for the mean of no values."""
+    return 0 if math.isnan(value) else value
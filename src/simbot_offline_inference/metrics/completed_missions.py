@@ -0,0 +1,147 @@
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from threading import Lock
+
+from loguru import logger
+
+
+class CompletedMissionIndex:
+    """In-memory set of the missions that have already been evaluated.
+
+    The set is built once on startup, either from the index file or, if there isn't one yet, from
+    a single walk over the evaluation output directory. Every completed mission is appended to the
+    index file, so that other workers sharing the same storage can see it too. Checking a mission
+    only looks at the set in memory; call `refresh_if_stale()` to read whatever other workers have
+    appended, which only reads the index at most once every `refresh_interval` seconds.
+
+    The index is only ever appended to, so that no worker can lose what another has written.
+    Forgotten missions are appended as tombstones, which are lines starting with `-`.
+    """
+
+    def __init__(
+        self, evaluation_output_dir: Path, index_path: Path, *, refresh_interval: float = 30
+    ) -> None:
+        self._evaluation_output_dir = evaluation_output_dir
+        self._index_path = index_path
+        self._refresh_interval = refresh_interval
+
+        self._completed_missions: set[str] = set()
+        self._index_offset = 0
+        self._last_refresh_time = time.monotonic()
+        self._lock = Lock()
+
+        self._load()
+
+    def __contains__(self, mission_id: object) -> bool:
+        """Check if the mission has been completed, as of the last refresh."""
+        return mission_id in self._completed_missions
+
+    def __len__(self) -> int:
+        """Get the number of completed missions."""
+        return len(self._completed_missions)
+
+    def add(self, mission_id: str) -> None:
+        """Mark the mission as completed."""
+        with self._lock:
+            self._completed_missions.add(mission_id)
+            self._append_to_index([mission_id])
+
+    def refresh_if_stale(self) -> None:
+        """Refresh the missions, unless they were refreshed within the last `refresh_interval`."""
+        if time.monotonic() - self._last_refresh_time >= self._refresh_interval:
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Apply the missions that other workers have added or forgotten since we last checked."""
+        with self._lock:
+            self._last_refresh_time = time.monotonic()
+            if not self._index_path.exists():
+                return
+
+            with open(self._index_path, "rb") as index_file:
+                index_file.seek(self._index_offset)
+                new_entries = index_file.read()
+
+            # Ignore any trailing line that another worker is still writing
+            complete_entries, _, _ = new_entries.rpartition(b"\n")
+            if not complete_entries:
+                return
+
+            self._index_offset += len(complete_entries) + 1
+            for index_entry in complete_entries.decode().split("\n"):
+                if index_entry.startswith("-"):
+                    self._completed_missions.discard(index_entry[1:])
+                else:
+                    self._completed_missions.add(index_entry)
+
+    def forget(self, mission_ids: Iterable[str]) -> None:
+        """Forget the missions, such as to run them again, while keeping every other mission."""
+        missions_to_forget = sorted(set(mission_ids))
+
+        with self._lock:
+            self._completed_missions.difference_update(missions_to_forget)
+            if self._index_path.exists():
+                self._append_to_index(f"-{mission_id}" for mission_id in missions_to_forget)
+
+    def delete(self) -> None:
+        """Forget all completed missions and delete the index file."""
+        with self._lock:
+            self._completed_missions.clear()
+            self._index_offset = 0
+            self._index_path.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        """Build the set of completed missions."""
+        if self._index_path.exists():
+            self.refresh()
+            logger.info(f"Loaded {len(self)} completed missions from `{self._index_path}`")
+            return
+
+        if not self._evaluation_output_dir.exists():
+            return
+
+        # Session IDs can contain a "/", so the outputs for those are nested in directories
+        for directory, _, file_names in os.walk(self._evaluation_output_dir):
+            relative_directory = Path(directory).relative_to(self._evaluation_output_dir)
+            self._completed_missions.update(
+                relative_directory.joinpath(file_name[: -len(".json")]).as_posix()
+                for file_name in file_names
+                if file_name.endswith(".json")
+            )
+
+        if not self._completed_missions:
+            return
+
+        logger.info(f"Found {len(self)} completed missions in `{self._evaluation_output_dir}`")
+
+        # Write the index in one go so that future runs do not need to scan the directory again
+        self._create_index("".join(f"{mission_id}\n" for mission_id in self._completed_missions))
+
+    def _append_to_index(self, index_entries: Iterable[str]) -> None:
+        """Append each entry to the index on its own line.
+
+        Appends of a single short line are atomic, so multiple workers can share the file.
+        """
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self._index_path, "ab", buffering=0) as index_file:
+            for index_entry in index_entries:
+                index_file.write(f"{index_entry}\n".encode())
+
+    def _create_index(self, index_contents: str) -> None:
+        """Create the index file in one go, unless another worker has already created it."""
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_index_path = self._index_path.with_name(f"{self._index_path.name}.{os.getpid()}")
+        temporary_index_path.write_text(index_contents)
+
+        try:
+            # Linking fails if the index exists, so we never replace what another worker wrote
+            os.link(temporary_index_path, self._index_path)
+        except FileExistsError:
+            logger.debug("Another worker created the index first, so it is read on refresh")
+        else:
+            self._index_offset = len(index_contents.encode())
+        finally:
+            temporary_index_path.unlink()
@@ -1,9 +1,12 @@
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Literal, Optional, get_args
 
 import orjson
-import torch
-from torchmetrics import MeanMetric, SumMetric
+
+from simbot_offline_inference.metrics.aggregators import MeanMetric, SumMetric, nan_to_zero
+from simbot_offline_inference.metrics.completed_missions import CompletedMissionIndex
+from simbot_offline_inference.metrics.journal import MetricsJournal
 
 
 MissionGroup = Literal[
@@ -22,8 +25,84 @@ MissionGroup = Literal[
 ]
 
 
-class EvaluationMetrics:
-    """Metrics for evaluating the agent's performance."""
+class MissionMetrics:
+    """Running totals of the metrics over every evaluated mission.
+
+    Only the totals are kept, so metrics from separate runs can be merged as if every mission had
+    been evaluated in a single run.
+    """
+
+    def __init__(
+        self,
+        success_rate_metric: Optional[MeanMetric] = None,
+        subgoal_completion_rate_metric: Optional[MeanMetric] = None,
+        per_mission_group_success_rate: Optional[dict[str, MeanMetric]] = None,
+    ) -> None:
+        self.games_played = SumMetric()
+
+        self.success_rate = success_rate_metric or MeanMetric()
+        self.subgoal_completion_rate = subgoal_completion_rate_metric or MeanMetric()
+
+        self.per_mission_group_success_rate = per_mission_group_success_rate or {
+            mission_group: MeanMetric() for mission_group in get_args(MissionGroup)
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialise the running metrics so that partial results can be merged later."""
+        return {
+            "games_played": self.games_played.to_dict(),
+            "success_rate": self.success_rate.to_dict(),
+            "subgoal_completion_rate": self.subgoal_completion_rate.to_dict(),
+            "per_mission_group_success_rate": {
+                mission_group: success_rate.to_dict()
+                for mission_group, success_rate in self.per_mission_group_success_rate.items()
+            },
+        }
+
+    def merge(self, metrics_state: dict[str, Any]) -> None:
+        """Merge serialised metrics, such as those from another worker, into these ones."""
+        self.games_played.merge(SumMetric.from_dict(metrics_state["games_played"]))
+        self.success_rate.merge(MeanMetric.from_dict(metrics_state["success_rate"]))
+        self.subgoal_completion_rate.merge(
+            MeanMetric.from_dict(metrics_state["subgoal_completion_rate"])
+        )
+
+        for mission_group, success_rate_state in metrics_state[
+            "per_mission_group_success_rate"
+        ].items():
+            self.per_mission_group_success_rate.setdefault(mission_group, MeanMetric()).merge(
+                MeanMetric.from_dict(success_rate_state)
+            )
+
+    def record_mission(
+        self,
+        mission_group: Optional[str],
+        is_mission_completed: bool,
+        subgoal_completion_status: list[Literal[0, 1]],
+    ) -> None:
+        """Update the running metrics with the result of a single mission."""
+        self.games_played.update(1)
+        self.success_rate.update(1 if is_mission_completed else 0)
+
+        for subgoal_completion in subgoal_completion_status:
+            self.subgoal_completion_rate.update(subgoal_completion)
+
+        if mission_group:
+            self.per_mission_group_success_rate[mission_group].update(
+                1 if is_mission_completed else 0
+            )
+
+    def summarise(self) -> dict[str, float]:
+        """Get the final value of every metric."""
+        return summarise_metrics_state(self.to_dict())
+
+
+class EvaluationMetrics(MissionMetrics):
+    """Metrics for evaluating the agent's performance.
+
+    The result of every mission is appended to a journal, which is replayed to rebuild the
+    metrics when resuming an evaluation.
+    """
 
     def __init__(
         self,
@@ -32,39 +111,63 @@ class EvaluationMetrics:
         success_rate_metric: MeanMetric,
         subgoal_completion_rate_metric: MeanMetric,
         per_mission_group_success_rate: Optional[dict[str, MeanMetric]] = None,
+        completed_missions_index_path: Optional[Path] = None,
+        evaluation_results_path: Optional[Path] = None,
     ) -> None:
-        self._output_path = evaluation_output_dir
-        self._evaluation_metrics_checkpoint_path = evaluation_metrics_checkpoint_path
+        super().__init__(
+            success_rate_metric, subgoal_completion_rate_metric, per_mission_group_success_rate
+        )
 
-        self.games_played = SumMetric()
+        self._output_path = evaluation_output_dir
+        self._evaluation_results_path = evaluation_results_path
+        self._journal = MetricsJournal(evaluation_metrics_checkpoint_path)
+        self._completed_missions = CompletedMissionIndex(
+            evaluation_output_dir,
+            completed_missions_index_path
+            or evaluation_output_dir.parent.joinpath(f"{evaluation_output_dir.name}.index"),
+        )
 
-        self.success_rate = success_rate_metric
-        self.subgoal_completion_rate = subgoal_completion_rate_metric
+    def save_results(self, **metadata: Any) -> None:
+        """Save the metrics so that they outlive the checkpoint, such as for merging shards."""
+        if self._evaluation_results_path is None:
+            return
 
-        self.per_mission_group_success_rate = per_mission_group_success_rate or {
-            mission_group: MeanMetric() for mission_group in get_args(MissionGroup)
-        }
+        self._evaluation_results_path.parent.mkdir(parents=True, exist_ok=True)
+        self._evaluation_results_path.write_bytes(
+            orjson.dumps(
+                {"metadata": metadata, "metrics": self.to_dict(), "summary": self.summarise()},
+                option=orjson.OPT_INDENT_2,
+            )
+        )
 
     def restore_checkpoint(self) -> "EvaluationMetrics":
-        """Restore the evaluation metrics from the checkpoint."""
-        if not self._evaluation_metrics_checkpoint_path.exists():
+        """Restore the evaluation metrics by replaying the journal."""
+        if not self._journal.exists():
             raise FileNotFoundError(
                 "Evaluation metrics checkpoint does not exist. Why are we resuming?"
             )
 
-        return torch.load(self._evaluation_metrics_checkpoint_path)
+        for journal_entry in self._journal.replay():
+            self.record_mission(
+                mission_group=journal_entry["mission_group"],
+                is_mission_completed=journal_entry["is_mission_completed"],
+                subgoal_completion_status=journal_entry["subgoal_completion_status"],
+            )
+
+        return self
 
     def save_checkpoint(self) -> None:
-        """Create a checkpoint for the evaluation metrics."""
-        torch.save(self, self._evaluation_metrics_checkpoint_path)
+        """Make sure every journaled mission result has been written to disk."""
+        self._journal.sync()
 
     def delete_checkpoint(self) -> None:
         """Delete the checkpoint for the evaluation metrics."""
-        self._evaluation_metrics_checkpoint_path.unlink(missing_ok=True)
+        self._journal.delete()
 
     def has_mission_been_evaluated(self, mission_id: str) -> bool:
-        """Check if the mission has already been evaluated."""
-        return self._output_path.joinpath(f"{mission_id}.json").exists()
+        """Check if the mission has already been evaluated, by any worker."""
+        self._completed_missions.refresh_if_stale()
+        return mission_id in self._completed_missions
 
     def update(
         self,
@@ -77,21 +180,22 @@ class EvaluationMetrics:
         remaining_utterances: list[str],
     ) -> None:
         """Add metrics from a recently-evaluated mission."""
-        self.games_played.update(1)
-        self.success_rate.update(1 if is_mission_completed else 0)
-
-        for subgoal_completion in subgoal_completion_status:
-            self.subgoal_completion_rate.update(subgoal_completion)
-
-        if mission_group:
-            self.per_mission_group_success_rate[mission_group].update(
-                1 if is_mission_completed else 0
-            )
+        self.record_mission(mission_group, is_mission_completed, subgoal_completion_status)
 
         self._save_mission_results(
             mission_id, predicted_actions, last_game_state, remaining_utterances
         )
 
+        self._journal.append(
+            {
+                "mission_id": mission_id,
+                "mission_group": mission_group,
+                "is_mission_completed": is_mission_completed,
+                "subgoal_completion_status": subgoal_completion_status,
+            }
+        )
+        self._completed_missions.add(mission_id)
+
     def _save_mission_results(
         self,
         mission_id: str,
@@ -113,3 +217,63 @@ class EvaluationMetrics:
         output_file = self._output_path.joinpath(f"{mission_id}.json")
         output_file.parent.mkdir(parents=True, exist_ok=True)
         output_file.write_bytes(orjson.dumps(output_results))
+
+
+def merge_metrics_states(metrics_states: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Merge serialised metrics, such as the results from each shard of an evaluation.
+
+    Since only the running totals are merged, this gives the same result as if every mission had
+    been evaluated in a single run.
+    """
+    merged_metrics = MissionMetrics()
+    for metrics_state in metrics_states:
+        merged_metrics.merge(metrics_state)
+    return merged_metrics.to_dict()
+
+
+def rebuild_metrics_state_from_journals(journal_paths: Iterable[Path]) -> dict[str, Any]:
+    """Rebuild the metrics from the journals of every worker that shared a trajectory queue.
+
+    Workers that died never saved their results, but every mission they finished is in their
+    journal. If a worker lost its lease and another worker ran the same mission, the mission is
+    only counted the first time.
+    """
+    metrics = MissionMetrics()
+    recorded_mission_ids: set[str] = set()
+
+    for journal_path in journal_paths:
+        for journal_entry in MetricsJournal(journal_path).replay():
+            if journal_entry["mission_id"] in recorded_mission_ids:
+                continue
+
+            recorded_mission_ids.add(journal_entry["mission_id"])
+            metrics.record_mission(
+                mission_group=journal_entry["mission_group"],
+                is_mission_completed=journal_entry["is_mission_completed"],
+                subgoal_completion_status=journal_entry["subgoal_completion_status"],
+            )
+
+    return metrics.to_dict()
+
+
+def summarise_metrics_state(metrics_state: dict[str, Any]) -> dict[str, float]:
+    """Get the final value of every metric from the serialised metrics.
+
+    The names are the same as those logged to WandB.
+    """
+    summary = {
+        "games_played": SumMetric.from_dict(metrics_state["games_played"]).compute(),
+        "success_rate": MeanMetric.from_dict(metrics_state["success_rate"]).compute(),
+        "subgoal_success_rate": MeanMetric.from_dict(
+            metrics_state["subgoal_completion_rate"]
+        ).compute(),
+    }
+
+    for mission_group, success_rate_state in metrics_state[
+        "per_mission_group_success_rate"
+    ].items():
+        summary[f"success_rate/{mission_group}"] = nan_to_zero(
+            MeanMetric.from_dict(success_rate_state).compute()
+        )
+
+    return summary
@@ -0,0 +1,87 @@
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any, Optional
+
+import orjson
+from loguru import logger
+
+
+class MetricsJournal:
+    """Append-only JSONL journal of the results for each evaluated mission.
+
+    Every entry is flushed to the OS as soon as it is written so that nothing is lost if the
+    process dies, but we only `fsync` every `sync_every` entries to avoid paying for a disk sync
+    after every mission.
+    """
+
+    def __init__(self, journal_path: Path, *, sync_every: int = 10) -> None:
+        self._journal_path = journal_path
+        self._sync_every = sync_every
+
+        self._journal_file: Optional[IO[bytes]] = None
+        self._unsynced_entry_count = 0
+
+    @property
+    def path(self) -> Path:
+        """Get the path to the journal."""
+        return self._journal_path
+
+    def exists(self) -> bool:
+        """Check whether the journal exists on disk."""
+        return self._journal_path.exists()
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """Append an entry to the end of the journal."""
+        journal_file = self._open()
+        journal_file.write(orjson.dumps(entry) + b"\n")
+        journal_file.flush()
+
+        self._unsynced_entry_count += 1
+        if self._unsynced_entry_count >= self._sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Make sure every entry in the journal has been written to disk."""
+        if self._journal_file is None:
+            return
+
+        self._journal_file.flush()
+        os.fsync(self._journal_file.fileno())
+        self._unsynced_entry_count = 0
+
+    def replay(self) -> Iterator[dict[str, Any]]:
+        """Iterate over all the entries in the journal, in the order they were written.
+
+        If the process died while writing the last entry, that entry is skipped.
+        """
+        with open(self._journal_path, "rb") as journal_file:
+            for line_number, line in enumerate(journal_file, start=1):
+                if not line.strip():
+                    continue
+
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt entry on line {line_number} of the journal")
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if self._journal_file is None:
+            return
+
+        self.sync()
+        self._journal_file.close()
+        self._journal_file = None
+
+    def delete(self) -> None:
+        """Delete the journal."""
+        self.close()
+        self._journal_path.unlink(missing_ok=True)
+
+    def _open(self) -> IO[bytes]:
+        """Open the journal for appending, if it is not already open."""
+        if self._journal_file is None:
+            self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal_file = open(self._journal_path, "ab")  # noqa: WPS515, SIM115
+        return self._journal_file
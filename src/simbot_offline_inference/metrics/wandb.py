@@ -1,9 +1,10 @@
+import atexit
 from abc import ABC, abstractmethod
-from copy import copy
 from pathlib import Path
-from typing import Literal, Optional
+from queue import Queue
+from threading import Thread
+from typing import Any, Literal, Optional
 
-import torch
 import wandb
 from loguru import logger
 
@@ -13,12 +14,73 @@ from emma_experience_hub.constants import constants_absolute_path
 from simbot_offline_inference._version import (  # noqa: WPS436
     __version__ as offline_inference_version,
 )
+from simbot_offline_inference.metrics.aggregators import nan_to_zero
 from simbot_offline_inference.metrics.evaluation import EvaluationMetrics
 
 
 SERVICE_REGISTRY_PATH = constants_absolute_path.joinpath("simbot", "registry.yaml")
 
 
+class BackgroundWandBLogger:
+    """Send logs to WandB from a background thread.
+
+    Logs are buffered in a queue and sent in the order they were given, so that WandB network
+    latency never blocks whoever is logging. If the buffer is full, logging blocks until there is
+    space again.
+    """
+
+    def __init__(self, max_buffered_logs: int = 1000) -> None:
+        self._buffer: Queue[Optional[dict[str, Any]]] = Queue(maxsize=max_buffered_logs)
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        """Start the background thread."""
+        if self._thread is not None:
+            return
+
+        self._thread = Thread(target=self._send_logs, name="wandb-logger", daemon=True)
+        self._thread.start()
+
+        # The thread is a daemon, so make sure the buffer is sent before the interpreter exits
+        atexit.register(self.stop)
+
+    def log(  # noqa: WPS110
+        self, data: dict[str, Any], *, step: Optional[int] = None, commit: bool = True
+    ) -> None:
+        """Add the data to the buffer to be logged."""
+        if self._thread is None:
+            wandb.log(data, step=step, commit=commit)
+            return
+
+        self._buffer.put({"data": data, "step": step, "commit": commit})
+
+    def stop(self) -> None:
+        """Send everything left in the buffer and stop the background thread."""
+        if self._thread is None:
+            return
+
+        self._buffer.put(None)
+        self._thread.join()
+        self._thread = None
+        atexit.unregister(self.stop)
+
+    def _send_logs(self) -> None:
+        """Send logs from the buffer to WandB until told to stop."""
+        while True:
+            buffered_log = self._buffer.get()
+
+            if buffered_log is None:
+                self._buffer.task_done()
+                return
+
+            try:
+                wandb.log(**buffered_log)
+            except Exception:
+                logger.exception("Unable to send logs to WandB.")
+            finally:
+                self._buffer.task_done()
+
+
 class WandBCallback(ABC):
     """Base class for sending data to WandB."""
 
@@ -59,6 +121,22 @@ class WandBCallback(ABC):
         """Finish an evaluation session."""
         raise NotImplementedError
 
+    def flush_logs(self) -> None:
+        """Send any logs that are still buffered.
+
+        This is called whenever an evaluation session ends, even if the evaluation failed.
+        """
+        pass  # noqa: WPS420
+
+    def prepare_trajectory(
+        self, trajectory: MissionTrajectory, preparation_session_id: str
+    ) -> None:
+        """Do any work for the trajectory that can happen before it starts running.
+
+        This can be called from a different thread while the previous trajectory is running.
+        """
+        pass  # noqa: WPS420
+
     @abstractmethod
     def start_trajectory(self, trajectory: MissionTrajectory, preparation_session_id: str) -> None:
         """Start running a new trajectory."""
@@ -82,7 +160,8 @@ class WandBTrajectoryGenerationCallback(WandBCallback):
 
     def __post_init__(self) -> None:
         """Post init actions to perform, if needed."""
-        pass  # noqa: WPS420
+        # Run configs for trajectories that were prepared before they were started
+        self._trajectory_run_configs: dict[str, dict[str, Any]] = {}
 
     def start_evaluation(self, *, resume: bool = False) -> None:
         """No-op on start evaluation."""
@@ -92,53 +171,26 @@ class WandBTrajectoryGenerationCallback(WandBCallback):
         """No-op on end evaluation."""
         pass  # noqa: WPS420
 
+    def prepare_trajectory(
+        self, trajectory: MissionTrajectory, preparation_session_id: str
+    ) -> None:
+        """Build the run config for the trajectory ahead of time."""
+        self._trajectory_run_configs[trajectory.session_id] = self._build_run_config(
+            trajectory, preparation_session_id
+        )
+
     def start_trajectory(self, trajectory: MissionTrajectory, preparation_session_id: str) -> None:
         """Start tracking a trajectory for generation."""
-        cdf = trajectory.cdf
-        high_level_key = trajectory.high_level_key
-
-        if not high_level_key:
-            raise AssertionError("High level key is not set.")
-
-        if isinstance(cdf, CDF):
-            cdf_scene = cdf.scene
-        else:
-            raise AssertionError("CDF is not set.")
+        run_config = self._trajectory_run_configs.pop(trajectory.session_id, None)
+        if run_config is None:
+            run_config = self._build_run_config(trajectory, preparation_session_id)
 
         wandb.init(
             name=trajectory.session_id,
             entity=self.entity,
             project=self.project,
             group=self.group,
-            config={
-                "version/experience_hub": experience_hub_version,
-                "version/offline_inference": offline_inference_version,
-                "session_id": trajectory.session_id,
-                "preparation_session_id": preparation_session_id,
-                # CDF
-                "cdf/floor_plan": cdf_scene.floor_plan,
-                "cdf/scene_id": cdf_scene.scene_id,
-                "cdf/room": cdf_scene.room_location[0],
-                "cdf/layout": cdf_scene.layout_override,
-                # High level key
-                "high_level_key": str(high_level_key),
-                "high_level_key/action": high_level_key.action,
-                "high_level_key/target_object": high_level_key.target_object,
-                "high_level_key/target_object_color": high_level_key.target_object_color,
-                "high_level_key/target_object_is_ambiguous": high_level_key.target_object_is_ambiguous,
-                "high_level_key/interaction_object": high_level_key.interaction_object,
-                "high_level_key/interaction_object_color": high_level_key.interaction_object_color,
-                "high_level_key/converted_object": high_level_key.converted_object,
-                "high_level_key/converted_object_color": high_level_key.converted_object_color,
-                "high_level_key/stacked_object": high_level_key.stacked_object,
-                "high_level_key/stacked_object_color": high_level_key.stacked_object_color,
-                "high_level_key/from_receptacle": high_level_key.from_receptacle,
-                "high_level_key/from_receptacle_color": high_level_key.from_receptacle_color,
-                "high_level_key/from_receptacle_is_container": high_level_key.from_receptacle_is_container,
-                "high_level_key/to_receptacle": high_level_key.to_receptacle,
-                "high_level_key/to_receptacle_color": high_level_key.to_receptacle_color,
-                "high_level_key/to_receptacle_is_container": high_level_key.to_receptacle_is_container,
-            },
+            config=run_config,
         )
 
         # Upload the mission trajectory file
@@ -173,19 +225,72 @@ class WandBTrajectoryGenerationCallback(WandBCallback):
         # the run as failed.
         wandb.finish(exit_code=1 if subgoal_success_rate == 0 else None)
 
+    def _build_run_config(
+        self, trajectory: MissionTrajectory, preparation_session_id: str
+    ) -> dict[str, Any]:
+        """Build the config for the WandB run of the trajectory."""
+        cdf = trajectory.cdf
+        high_level_key = trajectory.high_level_key
+
+        if not high_level_key:
+            raise AssertionError("High level key is not set.")
+
+        if isinstance(cdf, CDF):
+            cdf_scene = cdf.scene
+        else:
+            raise AssertionError("CDF is not set.")
+
+        return {
+            "version/experience_hub": experience_hub_version,
+            "version/offline_inference": offline_inference_version,
+            "session_id": trajectory.session_id,
+            "preparation_session_id": preparation_session_id,
+            # CDF
+            "cdf/floor_plan": cdf_scene.floor_plan,
+            "cdf/scene_id": cdf_scene.scene_id,
+            "cdf/room": cdf_scene.room_location[0],
+            "cdf/layout": cdf_scene.layout_override,
+            # High level key
+            "high_level_key": str(high_level_key),
+            "high_level_key/action": high_level_key.action,
+            "high_level_key/target_object": high_level_key.target_object,
+            "high_level_key/target_object_color": high_level_key.target_object_color,
+            "high_level_key/target_object_is_ambiguous": high_level_key.target_object_is_ambiguous,
+            "high_level_key/interaction_object": high_level_key.interaction_object,
+            "high_level_key/interaction_object_color": high_level_key.interaction_object_color,
+            "high_level_key/converted_object": high_level_key.converted_object,
+            "high_level_key/converted_object_color": high_level_key.converted_object_color,
+            "high_level_key/stacked_object": high_level_key.stacked_object,
+            "high_level_key/stacked_object_color": high_level_key.stacked_object_color,
+            "high_level_key/from_receptacle": high_level_key.from_receptacle,
+            "high_level_key/from_receptacle_color": high_level_key.from_receptacle_color,
+            "high_level_key/from_receptacle_is_container": high_level_key.from_receptacle_is_container,
+            "high_level_key/to_receptacle": high_level_key.to_receptacle,
+            "high_level_key/to_receptacle_color": high_level_key.to_receptacle_color,
+            "high_level_key/to_receptacle_is_container": high_level_key.to_receptacle_is_container,
+        }
+
 
 class WandBEvaluationCallback(WandBCallback):
     """Track metrics across the entire validation set.
 
+    The result of each mission is logged as it happens, and the entire mission success table is
+    only uploaded every `mission_success_table_upload_interval` missions and at the end of the
+    evaluation. All logging happens in the background.
+
     According to wandb docs, the various save commands are correct.
     """
 
+    mission_success_table_upload_interval: int = 50
+
     def __post_init__(self) -> None:
         """Post init actions to perform."""
         # The `mission_success_table` tracks the success of each mission during the course of an
         # entire run, and also the session ID for that mission.`
         self._mission_success_table = wandb.Table(columns=["mission_id", "session_id", "success"])
 
+        self._wandb_logger = BackgroundWandBLogger()
+
     def start_evaluation(self, *, resume: bool = False) -> None:
         """Start running an evaluation."""
         if resume:
@@ -208,10 +313,19 @@ class WandBEvaluationCallback(WandBCallback):
         # Also upload the unity logs
         wandb.save(str(self._unity_logs))
 
+        self._wandb_logger.start()
+
     def finish_evaluation(self) -> None:
         """Finish running an evaluation."""
+        # Log the final table on its own step, since the last step has already been committed
+        self._log_mission_success_table(step_idx=None)
+        self.flush_logs()
         wandb.finish()
 
+    def flush_logs(self) -> None:
+        """Send everything left in the buffer and stop logging in the background."""
+        self._wandb_logger.stop()
+
     def start_trajectory(self, trajectory: MissionTrajectory, preparation_session_id: str) -> None:
         """No-op when starting a new trajectory."""
         pass  # noqa: WPS420
@@ -225,7 +339,7 @@ class WandBEvaluationCallback(WandBCallback):
         subgoal_completion_status: list[Literal[0, 1]],
     ) -> None:
         """Finish a trajectory."""
-        step_idx = int(evaluation_metrics.games_played.compute().item())
+        step_idx = int(evaluation_metrics.games_played.compute())
 
         if trajectory.mission_id:
             # Update the table with the mission output
@@ -233,25 +347,34 @@ class WandBEvaluationCallback(WandBCallback):
                 trajectory.mission_id, trajectory.session_id, 1 if is_success else 0
             )
 
-            # Log the table to wandb
-            wandb.log(
-                {"mission_success_table": copy(self._mission_success_table)},
+            # Only log the row for the mission, since the table grows with every mission
+            self._wandb_logger.log(
+                {
+                    "mission/mission_id": trajectory.mission_id,
+                    "mission/session_id": trajectory.session_id,
+                    "mission/success": 1 if is_success else 0,
+                },
                 commit=False,
                 step=step_idx,
             )
 
+            # Upload the full table every so often as a checkpoint
+            num_logged_missions = len(self._mission_success_table.data)
+            if num_logged_missions % self.mission_success_table_upload_interval == 0:
+                self._log_mission_success_table(step_idx=step_idx)
+
         # If we have mission groups, log them
         if evaluation_metrics.per_mission_group_success_rate:
-            wandb.log(
+            self._wandb_logger.log(
                 {
-                    f"success_rate/{mission_group}": torch.nan_to_num(success_rate.compute())
+                    f"success_rate/{mission_group}": nan_to_zero(success_rate.compute())
                     for mission_group, success_rate in evaluation_metrics.per_mission_group_success_rate.items()
                 },
                 commit=False,
                 step=step_idx,
             )
 
-        wandb.log(
+        self._wandb_logger.log(
             {
                 "success_rate": evaluation_metrics.success_rate.compute(),
                 "subgoal_success_rate": evaluation_metrics.subgoal_completion_rate.compute(),
@@ -260,5 +383,21 @@ class WandBEvaluationCallback(WandBCallback):
             step=step_idx,
         )
 
-        # Save a checkpoint of the evaluation metrics
-        evaluation_metrics.save_checkpoint()
+    def _log_mission_success_table(self, *, step_idx: Optional[int]) -> None:
+        """Upload the entire mission success table.
+
+        If there is no step, the table is logged and committed on a new step.
+        """
+        if not self._mission_success_table.data:
+            return
+
+        # Copy the rows since the table keeps changing while it is waiting to be logged
+        mission_success_table = wandb.Table(
+            columns=self._mission_success_table.columns,
+            data=[list(row) for row in self._mission_success_table.data],
+        )
+        self._wandb_logger.log(
+            {"mission_success_table": mission_success_table},
+            commit=step_idx is None,
+            step=step_idx,
+        )
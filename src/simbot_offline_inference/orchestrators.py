@@ -1,3 +1,4 @@
+import asyncio
 import random
 import subprocess
 import time
@@ -13,7 +14,10 @@ from arena_missions.constants.arena import OfficeRoom
 from arena_wrapper.arena_orchestrator import ArenaOrchestrator as AlexaArenaOrchestrator
 from arena_wrapper.enums.object_output_wrapper import ObjectOutputType
 from simbot_offline_inference.arena_action_builder import ArenaActionBuilder
+from simbot_offline_inference.live_metrics import live_metrics
+from simbot_offline_inference.scheduling import cdf_content_hash
 from simbot_offline_inference.settings import Settings
+from simbot_offline_inference.tracing import tracer
 
 
 class ExperienceHubNextActions(NamedTuple):
@@ -25,7 +29,29 @@ class ExperienceHubNextActions(NamedTuple):
 
 
 class ArenaOrchestrator(AlexaArenaOrchestrator):
-    """Wrapper for the ArenaOrchestrator."""
+    """Wrapper for the ArenaOrchestrator.
+
+    When the next game uses the same CDF as the scene that is already loaded, Arena builds that
+    can reset the scene skip reloading it from scratch. Subclasses for those builds need to
+    override `reset_scene`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        # Hash of the CDF for the scene currently loaded in the Arena
+        self._loaded_cdf_hash: Optional[str] = None
+
+        # Trace the calls within `execute_action` without needing to change the Arena wrapper
+        self.controller.interact = live_metrics.arena_interact_latency.wrap(
+            tracer.wrap("interact", self.controller.interact)
+        )
+        self.arena_request_builder.get_request_json = tracer.wrap(
+            "build_arena_request", self.arena_request_builder.get_request_json
+        )
+        self.get_images_from_metadata = tracer.wrap(  # type: ignore[method-assign]
+            "decode_images", self.get_images_from_metadata
+        )
 
     def __enter__(self) -> None:
         """Initialize the unity instance."""
@@ -56,8 +82,58 @@ class ArenaOrchestrator(AlexaArenaOrchestrator):
 
         We also need to do the dummy actions to make sure the game is ready to go.
         """
-        self.send_cdf_to_arena(mission_cdf)
-        self.send_dummy_actions_to_arena(attempts, interval, object_output_type)
+        cdf_hash = cdf_content_hash(mission_cdf)
+
+        is_scene_reset = False
+        if cdf_hash == self._loaded_cdf_hash:
+            logger.debug("The scene for the CDF is already loaded, so trying to reset it instead")
+            with tracer.span("reset_scene"):
+                is_scene_reset = self.reset_scene()
+
+        if not is_scene_reset:
+            self._loaded_cdf_hash = None
+            with tracer.span("send_cdf"):
+                self.send_cdf_to_arena(mission_cdf)
+
+        with tracer.span("wait_for_game_ready"):
+            self.send_dummy_actions_to_arena(attempts, interval, object_output_type)
+
+        self._loaded_cdf_hash = cdf_hash
+
+    def reset_scene(self) -> bool:
+        """Put the loaded scene back to how it was when it was first loaded from the CDF.
+
+        Returns False if the scene could not be reset, such as when the Arena build does not
+        support it, so that the CDF is loaded from scratch instead.
+        """
+        return False
+
+    def init_unity_instance(self) -> bool:
+        """Start the Arena, which will not have a scene loaded."""
+        self._loaded_cdf_hash = None
+        return super().init_unity_instance()
+
+    def kill_unity_instance(self) -> bool:
+        """Kill the Arena, along with the scene that was loaded."""
+        self._loaded_cdf_hash = None
+        return super().kill_unity_instance()
+
+    def execute_action(
+        self, actions: Any, object_output_type: ObjectOutputType, nlg_action: Any
+    ) -> tuple[bool, Any]:
+        """Execute the actions on the Arena instance."""
+        with tracer.span("execute_action", num_actions=len(actions)):
+            return super().execute_action(actions, object_output_type, nlg_action)
+
+    def get_reconstructed_metadata(self) -> dict[str, Any]:
+        """Get the auxiliary metadata for the current state of the Arena."""
+        with tracer.span("get_reconstructed_metadata"):
+            return super().get_reconstructed_metadata()
+
+    def get_goals_status(self) -> Any:
+        """Get the goal completion status from the Arena instance."""
+        with tracer.span("get_goals_status"):
+            return super().get_goals_status()
 
     def send_cdf_to_arena(self, mission_cdf: Any) -> None:
         """Send the CDF to the Arena instance."""
@@ -97,8 +173,13 @@ class ArenaOrchestrator(AlexaArenaOrchestrator):
 
         raise AssertionError("Exhauted all attempts")
 
-    def go_to_random_viewpoint(self, room: OfficeRoom) -> None:
-        """Go to a random viewpoint in the given room."""
+    def go_to_random_viewpoint(
+        self, room: OfficeRoom, *, rng: Optional[random.Random] = None
+    ) -> None:
+        """Go to a random viewpoint in the given room.
+
+        Give a seeded `rng` to always choose the same viewpoint.
+        """
         if not self.response:
             logger.exception("There is no reponse to get viewpoints from.")
             return
@@ -115,7 +196,7 @@ class ArenaOrchestrator(AlexaArenaOrchestrator):
         ]
 
         # Choose random viewpoint
-        chosen_viewpoint = random.choice(viewpoints_for_current_room)
+        chosen_viewpoint = (rng or random.Random()).choice(viewpoints_for_current_room)
 
         # Go to the chosen viewpoint
         logger.debug(f"Going to viewpoint: {chosen_viewpoint}")
@@ -137,10 +218,15 @@ class ArenaOrchestrator(AlexaArenaOrchestrator):
         self,
         num_steps: int = 10,
         object_output_type: ObjectOutputType = ObjectOutputType.OBJECT_MASK,
+        *,
+        rng: Optional[random.Random] = None,
     ) -> None:
-        """Randomise the start position of the agent."""
+        """Randomise the start position of the agent.
+
+        Give a seeded `rng` to always take the same steps.
+        """
         logger.debug("Randomising start position of the agent")
-        action_builder = ArenaActionBuilder()
+        action_builder = ArenaActionBuilder(rng=rng)
         actions_to_send = [action_builder.random_navigation() for _ in range(num_steps)]
 
         for action in actions_to_send:
@@ -156,6 +242,22 @@ class ArenaOrchestrator(AlexaArenaOrchestrator):
 
             time.sleep(5)
 
+    def go_to_random_start_position(
+        self, session_id: str, start_room: Optional[OfficeRoom] = None
+    ) -> None:
+        """Go to a random viewpoint in the start room, and then randomise the start position.
+
+        The randomness is seeded from the session ID, so that running or replaying the session
+        again always starts from the same position.
+        """
+        rng = random.Random(session_id)
+
+        if start_room is not None:
+            logger.debug("Going to random viewpoint")
+            self.go_to_random_viewpoint(start_room, rng=rng)
+
+        self.randomise_start_position(rng=rng)
+
     def _get_unity_execution_command(self) -> str:
         settings = Settings()
 
@@ -239,25 +341,21 @@ class ExperienceHubOrchestrator:
         """Make a prediction for the actions the agent should take."""
         prediction_request_id = str(uuid4())
 
-        self._save_auxiliary_metadata(session_id, prediction_request_id, auxiliary_metadata)
+        with tracer.span("save_auxiliary_metadata"):
+            self._save_auxiliary_metadata(session_id, prediction_request_id, auxiliary_metadata)
 
         logger.debug("Building request payload")
-        simbot_request = self._build_raw_simbot_request(
-            session_id, prediction_request_id, utterance, previous_action_statuses
-        )
+        with tracer.span("build_simbot_request"):
+            simbot_request = self._build_raw_simbot_request(
+                session_id, prediction_request_id, utterance, previous_action_statuses
+            )
 
         logger.debug(f"Sending request: {simbot_request}")
-        simbot_response = self._make_request(simbot_request)
+        with tracer.span("experience_hub_predict"):
+            with live_metrics.experience_hub_predict_latency.time():
+                simbot_response = self._make_request(simbot_request)
 
-        actions = simbot_response.get("actions")
-        if not actions:
-            raise AssertionError("No actions to return.")
-
-        return ExperienceHubNextActions(
-            interaction_actions=self._filter_dialog_actions(actions),
-            dialog_actions=self._filter_interaction_actions(actions),
-            should_return_control=self._should_return_control_for_actions(actions),
-        )
+        return self._parse_simbot_response(simbot_response)
 
     def _healthcheck(self) -> bool:
         """Verify the health of the experience hub service."""
@@ -350,6 +448,18 @@ class ExperienceHubOrchestrator:
 
         return response.json()
 
+    def _parse_simbot_response(self, simbot_response: dict[str, Any]) -> ExperienceHubNextActions:
+        """Split the actions from the experience hub response."""
+        actions = simbot_response.get("actions")
+        if not actions:
+            raise AssertionError("No actions to return.")
+
+        return ExperienceHubNextActions(
+            interaction_actions=self._filter_dialog_actions(actions),
+            dialog_actions=self._filter_interaction_actions(actions),
+            should_return_control=self._should_return_control_for_actions(actions),
+        )
+
     def _should_return_control_for_actions(self, actions: list[dict[str, Any]]) -> bool:
         """Is the agent returning control after the actions?
 
@@ -375,3 +485,150 @@ class ExperienceHubOrchestrator:
             auxiliary_metadata_cache_dir=self._auxiliary_metadata_cache_dir,
             extracted_features_cache_dir=self._cached_extracted_features_dir,
         )
+
+
+class PredictionRequest(NamedTuple):
+    """Everything needed to ask the experience hub for the next actions of a session."""
+
+    session_id: str
+    utterance: Optional[str]
+    auxiliary_metadata: dict[str, Any]
+    previous_action_statuses: list[Any]
+
+
+class AsyncExperienceHubOrchestrator(ExperienceHubOrchestrator):
+    """Orchestrator for the Experience Hub that can have many sessions in flight at once.
+
+    The experience hub runs with multiple workers and batches on the GPU, so we can keep it busy
+    by sending predict requests for several sessions concurrently. The number of requests in
+    flight is capped by `max_concurrent_requests`; any further callers wait for a free slot, which
+    applies back-pressure to whoever is producing the requests.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_concurrent_requests: int = 2,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+
+        if max_concurrent_requests < 1:
+            raise ValueError("There must be at least one concurrent request allowed.")
+
+        self._max_concurrent_requests = max_concurrent_requests
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        self._request_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._num_requests_in_flight = 0
+        self._num_requests_waiting = 0
+
+    @property
+    def num_requests_in_flight(self) -> int:
+        """Get the number of predict requests currently being handled by the experience hub."""
+        return self._num_requests_in_flight
+
+    @property
+    def num_requests_waiting(self) -> int:
+        """Get the number of predict requests waiting for a free slot."""
+        return self._num_requests_waiting
+
+    async def get_next_actions_async(
+        self,
+        session_id: str,
+        utterance: Optional[str],
+        auxiliary_metadata: dict[str, Any],
+        previous_action_statuses: list[Any],
+    ) -> ExperienceHubNextActions:
+        """Make a prediction for the actions the agent should take, without blocking the loop."""
+        async with self._create_client() as client:
+            return await self._get_next_actions_with_client(
+                client, session_id, utterance, auxiliary_metadata, previous_action_statuses
+            )
+
+    async def get_next_actions_for_sessions(
+        self, prediction_requests: list[PredictionRequest]
+    ) -> list[ExperienceHubNextActions]:
+        """Get the next actions for multiple sessions concurrently.
+
+        The requests share one client, so that they reuse its connections to the experience hub.
+        The results are returned in the same order as the requests.
+        """
+        async with self._create_client() as client:
+            return await asyncio.gather(
+                *(
+                    self._get_next_actions_with_client(client, *prediction_request)
+                    for prediction_request in prediction_requests
+                )
+            )
+
+    async def _get_next_actions_with_client(
+        self,
+        client: httpx.AsyncClient,
+        session_id: str,
+        utterance: Optional[str],
+        auxiliary_metadata: dict[str, Any],
+        previous_action_statuses: list[Any],
+    ) -> ExperienceHubNextActions:
+        """Make a prediction for the actions the agent should take, using the client."""
+        prediction_request_id = str(uuid4())
+
+        await asyncio.to_thread(
+            self._save_auxiliary_metadata, session_id, prediction_request_id, auxiliary_metadata
+        )
+
+        simbot_request = self._build_raw_simbot_request(
+            session_id, prediction_request_id, utterance, previous_action_statuses
+        )
+
+        request_slots = self._get_request_slots()
+
+        self._num_requests_waiting += 1
+        try:
+            await request_slots.acquire()
+        finally:
+            self._num_requests_waiting -= 1
+
+        self._num_requests_in_flight += 1
+        try:
+            logger.debug(f"Sending request: {simbot_request}")
+            with live_metrics.experience_hub_predict_latency.time():
+                simbot_response = await self._make_request_async(client, simbot_request)
+        finally:
+            self._num_requests_in_flight -= 1
+            request_slots.release()
+
+        return self._parse_simbot_response(simbot_response)
+
+    def _get_request_slots(self) -> asyncio.Semaphore:
+        """Get the semaphore limiting the requests in flight.
+
+        A semaphore can only be used within the event loop it was first used in, so there is a
+        new one for each running event loop.
+        """
+        running_loop = asyncio.get_running_loop()
+
+        if self._request_slots is None or self._request_slots_loop is not running_loop:
+            self._request_slots = asyncio.Semaphore(self._max_concurrent_requests)
+            self._request_slots_loop = running_loop
+
+        return self._request_slots
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create a client which keeps a connection open for every request that can be in flight."""
+        return httpx.AsyncClient(
+            timeout=None,
+            limits=httpx.Limits(max_keepalive_connections=self._max_concurrent_requests),
+        )
+
+    async def _make_request_async(
+        self, client: httpx.AsyncClient, simbot_request: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Make the request to the experience hub and return the response."""
+        response = await client.post(self._predict_endpoint, json=simbot_request)
+
+        try:
+            response.raise_for_status()
+        except Exception:
+            logger.exception("Unable to get response for request.")
+
+        return response.json()
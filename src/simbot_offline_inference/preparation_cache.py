@@ -0,0 +1,54 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+from simbot_offline_inference.scheduling import cdf_content_hash
+
+
+# The actions taken for each preparation utterance, split by each call to the Arena
+PreparationActions = list[list[list[dict[str, Any]]]]
+
+
+class PreparationActionCache:
+    """Actions that successfully prepared the scene for a CDF, so that they can be replayed.
+
+    Preparation utterances only exist to set up the scene, so once the Experience Hub has
+    prepared a scene for a CDF, the same actions can be sent straight to the Arena next time
+    without asking the model again.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = cache_dir
+
+    def get_key(self, cdf_as_dict: dict[str, Any], preparation_utterances: list[str]) -> str:
+        """Get the key for the preparation of the CDF."""
+        utterances_hash = hashlib.sha256(orjson.dumps(preparation_utterances)).hexdigest()[:16]
+        return f"{cdf_content_hash(cdf_as_dict)}-{utterances_hash}"
+
+    def load(self, cache_key: str) -> Optional[PreparationActions]:
+        """Load the actions that prepared the scene, if there are any."""
+        cache_path = self._get_cache_path(cache_key)
+        if not cache_path.exists():
+            return None
+        return orjson.loads(cache_path.read_bytes())
+
+    def save(self, cache_key: str, preparation_actions: PreparationActions) -> None:
+        """Save the actions that prepared the scene."""
+        cache_path = self._get_cache_path(cache_key)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so that other workers never read a partial file
+        temporary_cache_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+        temporary_cache_path.write_bytes(orjson.dumps(preparation_actions))
+        temporary_cache_path.replace(cache_path)
+
+    def delete(self, cache_key: str) -> None:
+        """Forget the actions for the preparation, such as if they no longer work."""
+        self._get_cache_path(cache_key).unlink(missing_ok=True)
+
+    def _get_cache_path(self, cache_key: str) -> Path:
+        """Get the path to the cached actions."""
+        return self._cache_dir.joinpath(f"{cache_key}.json")
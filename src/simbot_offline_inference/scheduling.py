@@ -0,0 +1,185 @@
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Optional
+
+import orjson
+from loguru import logger
+
+
+if TYPE_CHECKING:
+    from arena_missions.structures import MissionTrajectory
+
+
+SchedulingPolicy = Literal[
+    "in_order", "longest_first", "by_scene", "scene_affinity", "crashes_last"
+]
+
+
+def cdf_content_hash(cdf_as_dict: dict[str, Any]) -> str:
+    """Hash the contents of the CDF, so that identical CDFs have the same hash."""
+    return hashlib.sha256(orjson.dumps(cdf_as_dict, option=orjson.OPT_SORT_KEYS)).hexdigest()[:16]
+
+
+def get_mission_key(trajectory: "MissionTrajectory") -> str:
+    """Get the key for the trajectory that stays the same across runs.
+
+    Generated trajectories have a new session ID every time they are generated, so they are
+    identified by their CDF instead.
+    """
+    if trajectory.mission_id:
+        return trajectory.mission_id
+    return f"cdf-{cdf_content_hash(trajectory.cdf_as_dict)}"
+
+
+def get_scene_key(trajectory: "MissionTrajectory") -> tuple[str, str]:
+    """Get the layout and scene that the Arena needs to load for the trajectory."""
+    scene = trajectory.cdf_as_dict.get("scene", {})
+    return str(scene.get("layoutOverride", "")), str(scene.get("scene_id", ""))
+
+
+class MissionStats(NamedTuple):
+    """How a mission has gone across all previous runs."""
+
+    num_runs: int = 0
+    num_failures: int = 0
+    total_duration: float = 0
+
+    @property
+    def mean_duration(self) -> Optional[float]:
+        """Get the average wall time for the mission, in seconds."""
+        if not self.num_runs:
+            return None
+        return self.total_duration / self.num_runs
+
+
+class MissionHistory:
+    """Wall time and failures for every mission that has been run before.
+
+    Every run of a mission is appended to a JSONL file, which can be shared by multiple workers.
+    """
+
+    def __init__(self, history_path: Path) -> None:
+        self._history_path = history_path
+        self._mission_stats: dict[str, MissionStats] = {}
+        self._total_duration = 0.0
+        self._total_runs = 0
+        self._lock = Lock()
+
+        if self._history_path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        """Get the number of missions with a history."""
+        return len(self._mission_stats)
+
+    def get_stats(self, mission_key: str) -> MissionStats:
+        """Get the stats for the mission."""
+        return self._mission_stats.get(mission_key, MissionStats())
+
+    def get_expected_duration(self, mission_key: str) -> float:
+        """Get how long the mission is expected to take.
+
+        Missions that have never been run are expected to take as long as the average mission.
+        """
+        mean_duration = self.get_stats(mission_key).mean_duration
+        if mean_duration is not None:
+            return mean_duration
+
+        return self._total_duration / self._total_runs if self._total_runs else 0
+
+    def record(self, mission_key: str, duration: float, *, has_failed: bool) -> None:
+        """Record a run of the mission."""
+        with self._lock:
+            self._update(mission_key, duration, has_failed=has_failed)
+
+            self._history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._history_path, "ab") as history_file:
+                history_file.write(
+                    orjson.dumps(
+                        {
+                            "mission_key": mission_key,
+                            "duration": duration,
+                            "has_failed": has_failed,
+                        }
+                    )
+                    + b"\n"
+                )
+
+    def _update(self, mission_key: str, duration: float, *, has_failed: bool) -> None:
+        """Update the stats for the mission with a new run."""
+        self._total_duration += duration
+        self._total_runs += 1
+
+        stats = self.get_stats(mission_key)
+        self._mission_stats[mission_key] = MissionStats(
+            num_runs=stats.num_runs + 1,
+            num_failures=stats.num_failures + int(has_failed),
+            total_duration=stats.total_duration + duration,
+        )
+
+    def _load(self) -> None:
+        """Load the history of every mission."""
+        with open(self._history_path, "rb") as history_file:
+            for line in history_file:
+                try:
+                    mission_run = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+
+                self._update(
+                    mission_run["mission_key"],
+                    mission_run["duration"],
+                    has_failed=mission_run["has_failed"],
+                )
+
+        logger.info(f"Loaded the history for {len(self)} missions from `{self._history_path}`")
+
+
+def schedule_trajectories(
+    trajectories: Iterable["MissionTrajectory"],
+    policy: SchedulingPolicy,
+    mission_history: MissionHistory,
+) -> list["MissionTrajectory"]:
+    """Order the trajectories using the scheduling policy.
+
+    - `in_order` keeps the trajectories in the order they were given.
+    - `longest_first` runs the missions that took longest before first, so that when running in
+        parallel, the last missions to finish are short ones.
+    - `by_scene` runs trajectories that use the same layout and scene one after the other.
+    - `scene_affinity` also runs trajectories with identical CDFs one after the other, such as
+        the different annotations of a T1 mission, so that the Arena can reuse the loaded scene.
+    - `crashes_last` runs the missions that have failed the most before last.
+
+    Every policy keeps the order of any trajectories that it considers equal.
+    """
+    scheduled_trajectories = list(trajectories)
+
+    if policy == "longest_first":
+        scheduled_trajectories.sort(
+            key=lambda trajectory: mission_history.get_expected_duration(
+                get_mission_key(trajectory)
+            ),
+            reverse=True,
+        )
+
+    if policy == "by_scene":
+        scheduled_trajectories.sort(key=get_scene_key)
+
+    if policy == "scene_affinity":
+        scheduled_trajectories.sort(
+            key=lambda trajectory: (
+                get_scene_key(trajectory),
+                cdf_content_hash(trajectory.cdf_as_dict),
+            )
+        )
+
+    if policy == "crashes_last":
+        scheduled_trajectories.sort(
+            key=lambda trajectory: mission_history.get_stats(
+                get_mission_key(trajectory)
+            ).num_failures
+        )
+
+    return scheduled_trajectories
@@ -4,6 +4,9 @@ from typing import Union
 
 from pydantic import BaseSettings
 
+from simbot_offline_inference.scheduling import SchedulingPolicy
+from simbot_offline_inference.tracing import TraceFormat
+
 
 class Settings(BaseSettings):
     """Settings to run the evaluation."""
@@ -20,7 +23,16 @@ class Settings(BaseSettings):
     missions_dir: Path = cdf_dir.joinpath("missions/")
 
     evaluation_output_dir: Path = storage_dir.joinpath("action_outputs/")
-    evaluation_metrics_checkpoint: Path = storage_dir.joinpath("evaluation_metrics_checkpoint.pt")
+    evaluation_output_index: Path = storage_dir.joinpath("action_outputs.index")
+    evaluation_metrics_checkpoint: Path = storage_dir.joinpath(
+        "evaluation_metrics_checkpoint.jsonl"
+    )
+    evaluation_results: Path = storage_dir.joinpath("evaluation_results.json")
+    mission_history: Path = storage_dir.joinpath("mission_history.jsonl")
+    preparation_cache_dir: Path = storage_dir.joinpath("preparation_cache/")
+    replay_results: Path = storage_dir.joinpath("replay_results.jsonl")
+    trajectory_queue_path: Path = storage_dir.joinpath("trajectory_queue.sqlite")
+    trace_dir: Path = storage_dir.joinpath("traces/")
 
     # WandB
     wandb_entity: str = "emma-simbot"
@@ -39,6 +51,25 @@ class Settings(BaseSettings):
 
     # Evaluator settings
     enforce_successful_preparation: bool = False
+    enable_pipelined_evaluation: bool = False
+    enable_preparation_replay: bool = False
+
+    # Order to run the trajectories in
+    scheduling_policy: SchedulingPolicy = "in_order"
+
+    # Trajectory queue, so that multiple workers can share the trajectories
+    use_trajectory_queue: bool = False
+    trajectory_queue_lease_duration: int = 600
+    trajectory_queue_max_attempts: int = 3
+
+    # Tracing
+    enable_tracing: bool = False
+    trace_format: TraceFormat = "chrome"
+
+    # Live metrics
+    enable_live_metrics: bool = False
+    live_metrics_host: str = "127.0.0.1"
+    live_metrics_port: int = 9464
 
     @property
     def should_resume_previous_wandb_run(self) -> bool:
@@ -51,6 +82,7 @@ class Settings(BaseSettings):
         # If the directory is empty, be sure to delete any existing metric checkpoints
         if is_evaluation_output_dir_empty:
             self.evaluation_metrics_checkpoint.unlink(missing_ok=True)
+            self.evaluation_output_index.unlink(missing_ok=True)
 
         return not is_evaluation_output_dir_empty
 
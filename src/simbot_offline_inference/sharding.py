@@ -0,0 +1,68 @@
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+
+if TYPE_CHECKING:
+    from arena_missions.structures import MissionTrajectory
+
+
+def stable_shard_index(mission_id: str, num_shards: int) -> int:
+    """Get the shard for the mission.
+
+    Unlike `hash()`, this is the same across processes and machines, so every host agrees on which
+    shard runs each mission.
+    """
+    mission_hash = hashlib.sha256(mission_id.encode()).digest()
+    return int.from_bytes(mission_hash[:8], "big") % num_shards
+
+
+class Shard(NamedTuple):
+    """One of the partitions of the missions, so an evaluation can be split across machines."""
+
+    index: int = 0
+    count: int = 1
+
+    @property
+    def is_sharded(self) -> bool:
+        """Check if the missions are split across multiple shards."""
+        return self.count > 1
+
+    @property
+    def name(self) -> str:
+        """Get the name of the shard."""
+        return f"shard-{self.index}-of-{self.count}"
+
+    def validate(self) -> None:
+        """Make sure the shard is one of the shards."""
+        if self.count < 1:
+            raise ValueError(f"The number of shards must be positive, not {self.count}.")
+
+        if not 0 <= self.index < self.count:
+            raise ValueError(
+                f"The shard index must be between 0 and {self.count - 1}, not {self.index}."
+            )
+
+    def contains(self, mission_id: str) -> bool:
+        """Check if the mission belongs to this shard."""
+        return stable_shard_index(mission_id, self.count) == self.index
+
+    def select(self, trajectories: Iterable["MissionTrajectory"]) -> list["MissionTrajectory"]:
+        """Get the trajectories that belong to this shard, keeping their order."""
+        self.validate()
+
+        if not self.is_sharded:
+            return list(trajectories)
+
+        return [
+            trajectory
+            for trajectory in trajectories
+            if self.contains(trajectory.mission_id or trajectory.session_id)
+        ]
+
+    def path_for(self, path: Path) -> Path:
+        """Get the path to use for a file that each shard needs its own copy of."""
+        if not self.is_sharded:
+            return path
+        return path.with_name(f"{path.stem}.{self.name}{path.suffix}")
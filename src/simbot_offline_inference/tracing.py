@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional, TypeVar, cast
+
+import orjson
+from loguru import logger
+
+
+TraceFormat = Literal["chrome", "jsonl"]
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+
+class Tracer:
+    """Record how long each phase of running a trajectory takes.
+
+    Tracing is disabled until an output directory is configured, in which case spans cost next to
+    nothing. When enabled, the spans for each trajectory are written to their own file, either as
+    a Chrome trace (which can be opened in `chrome://tracing` or Perfetto), or as JSONL with one
+    span per line.
+
+    Spans belong to the trajectory started in the same thread (or asyncio task). Spans from
+    threads that are not running a trajectory, such as those preparing or finishing trajectories
+    in the background, are not written to any trajectory's trace.
+    """
+
+    def __init__(self) -> None:
+        self._output_dir: Optional[Path] = None
+        self._trace_format: TraceFormat = "chrome"
+
+        self._trajectory_name: ContextVar[Optional[str]] = ContextVar(
+            "trajectory_name", default=None
+        )
+        self._events_per_trajectory: dict[str, list[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Check if tracing is enabled."""
+        return self._output_dir is not None
+
+    def configure(self, output_dir: Optional[Path], trace_format: TraceFormat = "chrome") -> None:
+        """Enable tracing by setting where the traces go, or disable it by giving no directory."""
+        self._output_dir = output_dir
+        self._trace_format = trace_format
+
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Tracing is enabled and will be saved to `{output_dir}`")
+
+    @contextmanager
+    def span(self, name: str, **metadata: Any) -> Iterator[None]:
+        """Time everything within the context."""
+        if not self.enabled:
+            yield
+            return
+
+        start_time = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(name, start_time, time.perf_counter_ns(), metadata)
+
+    def wrap(self, name: str, func: T) -> T:
+        """Wrap the function so that every call to it is traced."""
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.span(name):
+                return func(*args, **kwargs)
+
+        return cast(T, wrapper)
+
+    def start_trajectory(self, trajectory_name: str) -> None:
+        """Start collecting the spans for a new trajectory."""
+        if not self.enabled:
+            return
+
+        self._trajectory_name.set(trajectory_name)
+        with self._lock:
+            self._events_per_trajectory[trajectory_name] = []
+
+    def finish_trajectory(self) -> None:
+        """Write all the spans for the trajectory running in this thread to disk."""
+        trajectory_name = self._trajectory_name.get()
+        if self._output_dir is None or trajectory_name is None:
+            return
+
+        self._trajectory_name.set(None)
+        with self._lock:
+            events = self._events_per_trajectory.pop(trajectory_name, [])
+
+        suffix = "trace.json" if self._trace_format == "chrome" else "trace.jsonl"
+        output_path = self._output_dir.joinpath(f"{trajectory_name}.{suffix}")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self._trace_format == "chrome":
+            output_path.write_bytes(orjson.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        else:
+            output_path.write_bytes(b"".join(orjson.dumps(event) + b"\n" for event in events))
+
+        logger.debug(f"Wrote {len(events)} trace events to `{output_path}`")
+
+    def _record(self, name: str, start_time: int, end_time: int, metadata: dict[str, Any]) -> None:
+        """Record a finished span as a Chrome trace "complete" event for its trajectory."""
+        trajectory_name = self._trajectory_name.get()
+        if trajectory_name is None:
+            return
+
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": start_time / 1000,
+            "dur": (end_time - start_time) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": metadata,
+        }
+
+        with self._lock:
+            trajectory_events = self._events_per_trajectory.get(trajectory_name)
+            if trajectory_events is not None:
+                trajectory_events.append(event)
+
+
+tracer = Tracer()
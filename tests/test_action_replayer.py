@@ -0,0 +1,61 @@
+from unittest.mock import ANY, MagicMock, call
+
+import pytest
+
+from simbot_offline_inference.action_replayer import ActionReplayer, ReplayInstance, batch_actions
+
+
+def _create_action(action_type: str, *, with_mask: bool = False) -> dict:  # type: ignore[type-arg]
+    action_arguments = {"object": {"mask": [[0, 1]]}} if with_mask else {"direction": "Right"}
+    return {"id": action_type, "type": action_type, action_type.lower(): action_arguments}
+
+
+def test_actions_with_masks_start_a_new_batch() -> None:
+    actions = [
+        _create_action("Move"),
+        _create_action("Look"),
+        _create_action("Pickup", with_mask=True),
+        _create_action("Move"),
+        _create_action("Place", with_mask=True),
+    ]
+
+    batches = list(batch_actions(actions, max_batch_size=10))
+
+    assert [[action["id"] for action in batch] for batch in batches] == [
+        ["Move", "Look"],
+        ["Pickup", "Move"],
+        ["Place"],
+    ]
+
+
+def test_batches_are_no_larger_than_the_maximum() -> None:
+    actions = [_create_action("Move") for _ in range(5)]
+
+    assert [len(batch) for batch in batch_actions(actions, max_batch_size=2)] == [2, 2, 1]
+
+
+@pytest.mark.parametrize("randomise_start_position", [True, False])
+def test_replayed_missions_start_from_the_same_position(randomise_start_position: bool) -> None:
+    arena_orchestrator = MagicMock()
+    arena_orchestrator.get_goals_status.return_value = (None, False, [0])
+    arena_orchestrator.execute_action.return_value = (True, {})
+
+    ActionReplayer(arena_orchestrator).replay_mission(
+        ReplayInstance(
+            mission_id="mission",
+            cdf={},
+            predicted_actions=[_create_action("Move")],
+            session_id="T1_session",
+            start_room="BreakRoom",
+            randomise_start_position=randomise_start_position,
+        )
+    )
+
+    expected_calls = [call.execute_action([_create_action("Move")], ANY, "")]
+    if randomise_start_position:
+        expected_calls.insert(0, call.go_to_random_start_position("T1_session", "BreakRoom"))
+    assert [
+        method_call
+        for method_call in arena_orchestrator.method_calls
+        if method_call[0] in {"execute_action", "go_to_random_start_position"}
+    ] == expected_calls
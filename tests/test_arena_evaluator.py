@@ -0,0 +1,85 @@
+from pathlib import Path
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from arena_missions.structures import MissionTrajectory
+from simbot_offline_inference.arena_evaluator import PreparedTrajectory, SimBotArenaEvaluator
+from simbot_offline_inference.job_queue import TrajectoryQueue
+from simbot_offline_inference.metrics import EvaluationMetrics, MeanMetric, MetricsJournal
+
+
+def test_a_failing_trajectory_does_not_stop_the_worker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    trajectory_queue = TrajectoryQueue(
+        tmp_path.joinpath("queue.sqlite"), max_attempts=1, worker_id="worker"
+    )
+    trajectory_queue.enqueue(
+        MissionTrajectory(
+            session_id=f"T1_session_{idx}",
+            mission_id=f"mission_{idx}",
+            utterances=["pick up the mug"],
+            cdf={},
+        )
+        for idx in range(3)
+    )
+
+    checkpoint_path = tmp_path.joinpath("checkpoint.jsonl")
+    evaluation_metrics = EvaluationMetrics(
+        tmp_path.joinpath("outputs"), checkpoint_path, MeanMetric(), MeanMetric()
+    )
+    evaluator = SimBotArenaEvaluator(MagicMock(), evaluation_metrics, MagicMock())
+
+    def run_evaluation_step(  # noqa: WPS430
+        trajectory: MissionTrajectory, prepared_trajectory: Optional[PreparedTrajectory] = None
+    ) -> None:
+        if trajectory.mission_id == "mission_1":
+            raise RuntimeError("The Arena crashed")
+
+        evaluation_metrics.update(
+            mission_id=trajectory.mission_id or trajectory.session_id,
+            mission_group=None,
+            is_mission_completed=True,
+            subgoal_completion_status=[1],
+            predicted_actions=[],
+            last_game_state={},
+            remaining_utterances=[],
+        )
+
+    monkeypatch.setattr(evaluator, "run_evaluation_step", run_evaluation_step)
+
+    evaluator.run_evaluation_from_queue(trajectory_queue)
+
+    assert trajectory_queue.count() == {"pending": 0, "running": 0, "done": 2, "failed": 1}
+    assert [
+        journal_entry["mission_id"] for journal_entry in MetricsJournal(checkpoint_path).replay()
+    ] == ["mission_0", "mission_2"]
+
+
+def test_buffered_logs_are_sent_when_the_evaluation_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wandb_callback = MagicMock()
+    evaluator = SimBotArenaEvaluator(
+        MagicMock(),
+        EvaluationMetrics(
+            tmp_path.joinpath("outputs"),
+            tmp_path.joinpath("checkpoint.jsonl"),
+            MeanMetric(),
+            MeanMetric(),
+        ),
+        wandb_callback,
+    )
+    monkeypatch.setattr(
+        evaluator, "run_evaluation_step", MagicMock(side_effect=RuntimeError("The Arena crashed"))
+    )
+
+    with pytest.raises(RuntimeError):
+        evaluator.run_evaluation(
+            [MissionTrajectory(session_id="T1_session", utterances=["pick up the mug"], cdf={})]
+        )
+
+    wandb_callback.flush_logs.assert_called_once()
+    wandb_callback.finish_evaluation.assert_not_called()
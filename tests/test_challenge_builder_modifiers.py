@@ -0,0 +1,85 @@
+from copy import deepcopy
+
+import pytest
+from deepmerge import always_merger
+from pydantic import ValidationError
+
+from arena_missions.builders import ChallengeBuilderOutput, RequiredObjectBuilder
+from arena_missions.builders.challenge_builder import merge_into_model
+from arena_missions.structures import (
+    IsPickedUpExpression,
+    ObjectInstanceId,
+    RequiredObject,
+    StateCondition,
+    StateExpression,
+    TaskGoal,
+)
+
+
+@pytest.fixture
+def challenge_builder_output() -> ChallengeBuilderOutput:
+    target_object = RequiredObject(name=ObjectInstanceId.parse("Apple_1"))
+    target_object.update_receptacle(ObjectInstanceId.parse("TableRound_02_1"))
+    conditions = [
+        StateCondition(
+            stateName="PickedUpApple",
+            context=target_object.name,
+            expression=StateExpression.from_expression(
+                IsPickedUpExpression(target=target_object.name, value=True)
+            ),
+        )
+    ]
+
+    return ChallengeBuilderOutput(
+        start_room="BreakRoom",
+        required_objects={
+            "target_object": target_object,
+            "breakroom_table": RequiredObjectBuilder().breakroom_table(),
+        },
+        state_conditions=conditions,
+        task_goals=[TaskGoal.from_state_condition(condition) for condition in conditions],
+        plan=["pick up the apple"],
+    )
+
+
+def test_merged_modifications_match_deep_merging_the_output(
+    challenge_builder_output: ChallengeBuilderOutput,
+) -> None:
+    modifications = {"required_objects": {"target_object": {"colors": ["Red"]}}}
+
+    merged_output = merge_into_model(challenge_builder_output, modifications)
+
+    expected_output = deepcopy(challenge_builder_output.dict(by_alias=True))
+    always_merger.merge(expected_output, modifications)
+    assert merged_output == ChallengeBuilderOutput.parse_obj(expected_output)
+
+
+def test_merging_modifications_does_not_change_the_original_output(
+    challenge_builder_output: ChallengeBuilderOutput,
+) -> None:
+    original_output = challenge_builder_output.copy(deep=True)
+
+    merged_output = merge_into_model(
+        challenge_builder_output, {"required_objects": {"target_object": {"colors": ["Red"]}}}
+    )
+
+    assert challenge_builder_output == original_output
+    assert merged_output.required_objects["target_object"].colors == ["Red"]
+    # Anything that is not modified is shared with the original output
+    assert (
+        merged_output.required_objects["breakroom_table"]
+        is challenge_builder_output.required_objects["breakroom_table"]
+    )
+
+
+def test_invalid_modifications_are_rejected(
+    challenge_builder_output: ChallengeBuilderOutput,
+) -> None:
+    with pytest.raises(ValidationError):
+        merge_into_model(
+            challenge_builder_output,
+            {"required_objects": {"target_object": {"colors": ["Rainbow"]}}},
+        )
+
+    with pytest.raises(ValueError, match="does not have the field"):
+        merge_into_model(challenge_builder_output, {"not_a_field": True})
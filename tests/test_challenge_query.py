@@ -0,0 +1,108 @@
+import pytest
+
+from arena_missions.builders import (
+    ChallengeBuilder,
+    MissionBuilder,
+    RequiredObjectBuilder,
+    parse_challenge_query,
+    sample_challenge_builders,
+    select_challenge_builders,
+)
+
+
+def test_challenge_query_is_parsed_like_a_high_level_key() -> None:
+    field_values = parse_challenge_query(
+        [
+            "action=pickup",
+            "to-receptacle-is-container",
+            "target-object=Apple,Bowl_01",
+            "target-object-color=red",
+        ]
+    )
+
+    assert field_values == {
+        "action": "pickup",
+        "to_receptacle_is_container": True,
+        "target_object": frozenset(("Apple", "Bowl_01")),
+        "target_object_color": "Red",
+    }
+
+
+@pytest.mark.parametrize(
+    "flag",
+    ["target-object-is-ambiguous", "from-receptacle-is-container", "#to-receptacle-is-container"],
+)
+def test_boolean_flags_without_a_value_are_true(flag: str) -> None:
+    assert list(parse_challenge_query([flag]).values()) == [True]
+
+
+@pytest.mark.parametrize("query_part", ["action=jump", "favourite-colour=Red", "target-object"])
+def test_invalid_challenge_query_is_rejected(query_part: str) -> None:
+    with pytest.raises(ValueError):
+        parse_challenge_query([query_part])
+
+
+def test_selected_challenge_builders_match_the_query() -> None:
+    selected_entries = select_challenge_builders(
+        ChallengeBuilder(), ["action=pickup,break", "target-object=Bowl_01,FoodPlate_01"]
+    )
+
+    assert selected_entries
+    assert selected_entries == [
+        (high_level_key, challenge_builder_function)
+        for high_level_key, challenge_builder_function in ChallengeBuilder()
+        if high_level_key.action in {"pickup", "break"}
+        and high_level_key.target_object in {"Bowl_01", "FoodPlate_01"}
+    ]
+
+
+def test_sampled_challenge_builders_cover_every_group() -> None:
+    challenge_builder_entries = list(ChallengeBuilder())
+
+    sampled_entries = sample_challenge_builders(
+        challenge_builder_entries, num_per_group=2, group_by=["action"]
+    )
+
+    sampled_actions = [high_level_key.action for high_level_key, _ in sampled_entries]
+    all_actions = {high_level_key.action for high_level_key, _ in challenge_builder_entries}
+    assert set(sampled_actions) == all_actions
+    assert all(sampled_actions.count(action) <= 2 for action in all_actions)
+
+    # The sampled builders stay in registry order
+    sampled_positions = [challenge_builder_entries.index(entry) for entry in sampled_entries]
+    assert sampled_positions == sorted(sampled_positions)
+
+
+def test_sampling_challenge_builders_with_a_seed_is_reproducible() -> None:
+    first_selection = select_challenge_builders(
+        ChallengeBuilder(), num_per_group=3, group_by=["action", "target_object"], rng_seed=0
+    )
+    second_selection = select_challenge_builders(
+        ChallengeBuilder(), num_per_group=3, group_by=["action", "target_object"], rng_seed=0
+    )
+
+    assert first_selection == second_selection
+
+
+def test_selected_missions_have_the_same_rng_seeds_as_when_generating_all_of_them() -> None:
+    mission_builder = MissionBuilder(ChallengeBuilder(), RequiredObjectBuilder())
+    all_entries = list(ChallengeBuilder())
+    selected_entries = select_challenge_builders(ChallengeBuilder(), ["action=clean"])
+
+    all_rng_seeds = dict(
+        zip(map(id, all_entries), mission_builder.get_mission_rng_seeds(all_entries, 3))
+    )
+    selected_rng_seeds = mission_builder.get_mission_rng_seeds(selected_entries, 3)
+
+    assert selected_rng_seeds == [all_rng_seeds[id(entry)] for entry in selected_entries]
+
+
+def test_challenge_builders_can_be_grouped_by_fields_written_like_the_query() -> None:
+    assert select_challenge_builders(
+        ChallengeBuilder(), num_per_group=1, group_by=["action", "target-object"], rng_seed=0
+    ) == select_challenge_builders(
+        ChallengeBuilder(), num_per_group=1, group_by=["action", "target_object"], rng_seed=0
+    )
+
+    with pytest.raises(ValueError):
+        select_challenge_builders(ChallengeBuilder(), num_per_group=1, group_by=["colour"])
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+from pytest_cases import parametrize
+
+
+# Budget for the cumulative time it takes to import the CLI, in microseconds
+CLI_IMPORT_TIME_BUDGET = 500_000
+
+CLI_MODULE = "simbot_offline_inference.__main__"
+
+
+def _import_cli_with_import_time() -> list[tuple[str, int]]:
+    """Import the CLI in a fresh interpreter and return the cumulative time for each module."""
+    completed_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {CLI_MODULE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times: list[tuple[str, int]] = []
+    for line in completed_process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_time, module_name = (part.strip() for part in line.split("|"))
+        import_times.append((module_name, int(cumulative_time)))
+
+    return import_times
+
+
+def test_cli_imports_within_budget() -> None:
+    import_times = dict(_import_cli_with_import_time())
+
+    assert import_times[CLI_MODULE] < CLI_IMPORT_TIME_BUDGET
+
+
+@parametrize(
+    "heavy_module",
+    ["arena_missions", "cv2", "emma_common", "emma_experience_hub", "torch", "wandb"],
+)
+def test_cli_does_not_import_heavy_dependencies(heavy_module: str) -> None:
+    imported_modules = {module_name for module_name, _ in _import_cli_with_import_time()}
+
+    assert heavy_module not in imported_modules
@@ -0,0 +1,97 @@
+import json
+import pickle
+
+import pytest
+
+from arena_missions.builders import RequiredObjectBuilder
+from arena_missions.structures import (
+    CDFScene,
+    FrozenRequiredObject,
+    RequiredObject,
+    RequiredObjectState,
+)
+
+
+def test_default_objects_are_only_built_once() -> None:
+    required_object_builder = RequiredObjectBuilder()
+
+    first_default_objects = required_object_builder.default_objects()
+    second_default_objects = required_object_builder.default_objects()
+
+    assert first_default_objects is not second_default_objects
+    assert all(
+        first_object is second_object
+        for first_object, second_object in zip(first_default_objects, second_default_objects)
+    )
+
+
+def test_default_objects_cannot_be_changed() -> None:
+    door = RequiredObjectBuilder().default_objects()[0]
+
+    with pytest.raises(TypeError):
+        door.update_state("isOpen", "false")
+
+    with pytest.raises(TypeError):
+        door.update_receptacle(None)
+
+    with pytest.raises(TypeError):
+        door.colors = ["Red"]  # noqa: WPS601
+
+    assert door.state[0].value == "true"
+
+
+def test_default_objects_serialise_the_same_as_unfrozen_objects() -> None:
+    required_object_builder = RequiredObjectBuilder()
+    scene = CDFScene(
+        roomLocation=["BreakRoom"],
+        required_objects=required_object_builder.default_objects(),
+        layoutOverride="OfficeLayout1",
+    )
+    unfrozen_scene = scene.copy(
+        update={
+            "required_objects": [
+                RequiredObject.parse_obj(required_object.dict(by_alias=True))
+                for required_object in scene.required_objects
+            ]
+        }
+    )
+
+    assert all(
+        isinstance(required_object, FrozenRequiredObject)
+        for required_object in scene.required_objects
+    )
+    assert scene.dict(by_alias=True) == unfrozen_scene.dict(by_alias=True)
+    assert scene.json(by_alias=True) == unfrozen_scene.json(by_alias=True)
+
+
+def test_changing_a_serialised_default_object_does_not_change_the_cache() -> None:
+    door = RequiredObjectBuilder().default_objects()[0]
+
+    serialised_door = door.dict(by_alias=True)
+    serialised_door["state"].append({"isLocked": "true"})
+
+    assert door.dict(by_alias=True)["state"] == [{"isOpen": "true"}]
+
+
+def test_default_objects_cannot_be_changed_in_place() -> None:
+    door = RequiredObjectBuilder().default_objects()[0]
+    serialised_door = door.dict(by_alias=True)
+
+    with pytest.raises((AttributeError, TypeError)):
+        door.state.append(RequiredObjectState.from_parts("isLocked", "true"))  # type: ignore[attr-defined]
+
+    with pytest.raises(TypeError):
+        door.state[0].__root__["isOpen"] = "false"
+
+    with pytest.raises(TypeError):
+        door.condition["isBroken"] = True
+
+    assert door.dict(by_alias=True) == serialised_door
+    assert json.loads(door.json(by_alias=True)) == serialised_door
+
+
+def test_default_objects_can_be_copied_and_pickled() -> None:
+    door = RequiredObjectBuilder().default_objects()[0]
+
+    assert door.copy(deep=True).dict(by_alias=True) == door.dict(by_alias=True)
+    assert pickle.loads(pickle.dumps(door)).dict(by_alias=True) == door.dict(by_alias=True)
@@ -1,9 +1,13 @@
+import random
+
+import pytest
 from deepdiff import DeepDiff
 from pytest_cases import fixture, param_fixture
 
 from arena_missions.builders import (
     ChallengeBuilder,
     ChallengeBuilderFunction,
+    ChallengeBuilderRegistry,
     MissionBuilder,
     RequiredObjectBuilder,
 )
@@ -39,6 +43,32 @@ def test_challenge_builder_instantiates_without_error() -> None:
     assert ChallengeBuilder()
 
 
+def test_challenge_builder_registry_rejects_duplicates() -> None:
+    high_level_key, challenge_builder_function = next(iter(ChallengeBuilder()))
+    registry = ChallengeBuilderRegistry([(high_level_key, challenge_builder_function)])
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.add(high_level_key, challenge_builder_function)
+
+
+def test_challenge_builder_registry_filters_by_high_level_key_fields() -> None:
+    filtered_entries = ChallengeBuilder.filter(action="pickup", target_object_is_ambiguous=True)
+
+    assert filtered_entries
+    assert filtered_entries == [
+        (high_level_key, challenge_builder_function)
+        for high_level_key, challenge_builder_function in ChallengeBuilder()
+        if high_level_key.action == "pickup" and high_level_key.target_object_is_ambiguous
+    ]
+
+
+def test_challenge_builder_registry_counts_functions_per_key() -> None:
+    key_counts = ChallengeBuilder.count_available_functions_per_key()
+
+    assert sum(key_counts.values()) == len(ChallengeBuilder())
+    assert list(key_counts) == sorted(key_counts, key=lambda high_level_key: high_level_key.key)
+
+
 def test_registered_challenge_builders_are_valid(
     challenge_builder_function: ChallengeBuilderFunction,
 ) -> None:
@@ -76,3 +106,53 @@ def test_generated_missions_are_valid(
 
     # Make sure the mission can be reimported successfully
     assert Mission.parse_obj(mission.dict(by_alias=True))
+
+
+def test_missions_generated_in_parallel_match_serial_generation(
+    required_object_builder: RequiredObjectBuilder,
+) -> None:
+    class FewerChallengeBuilders(ChallengeBuilder):
+        _registry = ChallengeBuilderRegistry(list(ChallengeBuilder())[:40])
+
+    mission_builder = MissionBuilder(FewerChallengeBuilders(), required_object_builder)
+
+    serial_missions = list(mission_builder.generate_all_missions(rng_seed=42))
+    parallel_missions = list(mission_builder.generate_all_missions(num_workers=2, rng_seed=42))
+
+    assert len(serial_missions) == len(FewerChallengeBuilders())
+    assert [mission.high_level_key for mission in parallel_missions] == [
+        high_level_key for high_level_key, _ in FewerChallengeBuilders()
+    ]
+    assert parallel_missions == serial_missions
+
+
+def test_missions_generated_with_the_same_seed_are_identical(
+    required_object_builder: RequiredObjectBuilder,
+) -> None:
+    class FewerChallengeBuilders(ChallengeBuilder):
+        _registry = ChallengeBuilderRegistry(list(ChallengeBuilder())[:40])
+
+    mission_builder = MissionBuilder(FewerChallengeBuilders(), required_object_builder)
+
+    first_missions = list(mission_builder.generate_all_missions(rng_seed=7))
+    second_missions = list(mission_builder.generate_all_missions(rng_seed=7))
+
+    assert first_missions == second_missions
+    challenge_builder_entries = list(FewerChallengeBuilders())
+    assert mission_builder.get_mission_rng_seeds(
+        challenge_builder_entries, 7
+    ) != mission_builder.get_mission_rng_seeds(challenge_builder_entries, 8)
+
+
+def test_session_ids_created_with_the_same_seed_are_identical(
+    mission_builder: MissionBuilder,
+) -> None:
+    high_level_key, challenge_builder_function = next(iter(ChallengeBuilder()))
+    mission = mission_builder.generate_mission(
+        high_level_key, challenge_builder_function, rng=random.Random(0)
+    )
+
+    first_session_id = mission.create_session_id("T", rng=random.Random(0))
+    second_session_id = mission.create_session_id("T", rng=random.Random(0))
+
+    assert first_session_id == second_session_id
@@ -0,0 +1,47 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+from simbot_offline_inference.inference_controller import SimBotInferenceController
+from simbot_offline_inference.orchestrators import ExperienceHubNextActions
+
+
+FAILED_ACTIONS = [{"id": "1", "type": "Pickup", "pickup": {"object": {"name": "Bowl"}}}]
+RECOVERY_ACTIONS = [{"id": "2", "type": "Goto", "goto": {"object": {"name": "Bowl"}}}]
+PICKUP_ACTIONS = [{"id": "3", "type": "Pickup", "pickup": {"object": {"name": "Bowl"}}}]
+
+
+def _create_inference_controller(
+    next_actions: list[ExperienceHubNextActions], failed_actions: list[dict[str, Any]]
+) -> SimBotInferenceController:
+    """Create the controller, where the Arena only fails to execute the failed actions."""
+    arena_orchestrator = MagicMock(response=None)
+    arena_orchestrator.execute_action.side_effect = lambda actions, *_: (
+        (False, {"errorType": "ObjectNotFound"}) if actions == failed_actions else (True, {})
+    )
+
+    experience_hub_orchestrator = MagicMock()
+    experience_hub_orchestrator.get_next_actions.side_effect = next_actions
+
+    return SimBotInferenceController(arena_orchestrator, experience_hub_orchestrator)
+
+
+def test_only_executed_action_batches_are_recorded_to_replay() -> None:
+    inference_controller = _create_inference_controller(
+        [
+            ExperienceHubNextActions(FAILED_ACTIONS, [], should_return_control=False),
+            ExperienceHubNextActions(RECOVERY_ACTIONS, [], should_return_control=False),
+            ExperienceHubNextActions(
+                PICKUP_ACTIONS, [{"type": "Dialog"}], should_return_control=True
+            ),
+        ],
+        FAILED_ACTIONS,
+    )
+
+    executed_action_batches: list[list[dict[str, Any]]] = []
+    actions_taken = inference_controller.handle_utterance(
+        "T1_session", "pick up the bowl", executed_action_batches=executed_action_batches
+    )
+
+    assert actions_taken == [*FAILED_ACTIONS, *RECOVERY_ACTIONS, *PICKUP_ACTIONS]
+    assert executed_action_batches == [RECOVERY_ACTIONS, PICKUP_ACTIONS]
+    assert inference_controller.replay_actions(executed_action_batches, "pick up the bowl")
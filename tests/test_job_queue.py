@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+from arena_missions.structures import MissionTrajectory
+from simbot_offline_inference.job_queue import TrajectoryQueue
+
+
+def _create_trajectories(num_trajectories: int) -> list[MissionTrajectory]:
+    return [
+        MissionTrajectory(
+            session_id=f"T1_session_{idx}",
+            mission_id=f"mission_{idx}",
+            utterances=["pick up the mug"],
+            cdf={},
+        )
+        for idx in range(num_trajectories)
+    ]
+
+
+def test_enqueueing_the_same_trajectories_is_idempotent(tmp_path: Path) -> None:
+    queue_path = tmp_path.joinpath("queue.sqlite")
+    first_worker = TrajectoryQueue(queue_path, worker_id="first")
+    second_worker = TrajectoryQueue(queue_path, worker_id="second")
+
+    assert first_worker.enqueue(_create_trajectories(3)) == 3
+    assert second_worker.enqueue(_create_trajectories(4)) == 1
+    assert first_worker.count()["pending"] == 4
+
+
+def test_workers_never_claim_the_same_trajectory(tmp_path: Path) -> None:
+    queue_path = tmp_path.joinpath("queue.sqlite")
+    workers = [TrajectoryQueue(queue_path, worker_id=f"worker_{idx}") for idx in range(3)]
+    workers[0].enqueue(_create_trajectories(10))
+
+    claimed_mission_ids = []
+    while True:
+        claims = [worker.claim() for worker in workers]
+        for claimed_trajectory in claims:
+            if claimed_trajectory is not None:
+                claimed_mission_ids.append(claimed_trajectory.trajectory.mission_id)
+                workers[0].mark_done(claimed_trajectory)
+        if all(claimed_trajectory is None for claimed_trajectory in claims):
+            break
+
+    assert claimed_mission_ids == [f"mission_{idx}" for idx in range(10)]
+    assert workers[0].count()["done"] == 10
+
+
+def test_expired_leases_go_back_on_the_queue(tmp_path: Path) -> None:
+    queue_path = tmp_path.joinpath("queue.sqlite")
+    crashed_worker = TrajectoryQueue(queue_path, lease_duration=0.01, worker_id="crashed")
+    healthy_worker = TrajectoryQueue(queue_path, worker_id="healthy")
+    crashed_worker.enqueue(_create_trajectories(1))
+
+    crashed_claim = crashed_worker.claim()
+    assert crashed_claim is not None
+    assert healthy_worker.claim() is None
+
+    time.sleep(0.05)
+    healthy_claim = healthy_worker.claim()
+
+    assert healthy_claim is not None
+    assert healthy_claim.trajectory_key == crashed_claim.trajectory_key
+    assert healthy_claim.attempt == 2
+    assert not crashed_worker.heartbeat(crashed_claim)
+    assert healthy_worker.heartbeat(healthy_claim)
+
+
+def test_failed_trajectories_are_retried_until_out_of_attempts(tmp_path: Path) -> None:
+    trajectory_queue = TrajectoryQueue(tmp_path.joinpath("queue.sqlite"), max_attempts=2)
+    trajectory_queue.enqueue(_create_trajectories(1))
+
+    for _ in range(2):
+        claimed_trajectory = trajectory_queue.claim()
+        assert claimed_trajectory is not None
+        trajectory_queue.mark_failed(claimed_trajectory, "Unity crashed")
+
+    assert trajectory_queue.claim() is None
+    assert trajectory_queue.count()["failed"] == 1
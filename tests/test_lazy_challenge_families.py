@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+import pytest
+
+from arena_missions.builders import ChallengeBuilder, ChallengeBuilderRegistry, ChallengeFamily
+from arena_missions.load_challenges import CHALLENGE_FAMILIES
+
+
+def _run_in_fresh_interpreter(code: str) -> str:
+    """Run the code in a fresh interpreter, so that no challenges have been registered yet."""
+    completed_process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return completed_process.stdout.strip()
+
+
+def test_importing_the_builders_does_not_register_any_challenges() -> None:
+    num_pending_families = _run_in_fresh_interpreter(
+        "from arena_missions.builders import ChallengeBuilder;"
+        + "print(len(ChallengeBuilder._registry.pending_families))"
+    )
+
+    assert int(num_pending_families) == len(CHALLENGE_FAMILIES)
+
+
+def test_filtering_only_registers_the_families_that_could_match() -> None:
+    registered_families = _run_in_fresh_interpreter(
+        "from arena_missions.builders import ChallengeBuilder;"
+        + "from arena_missions.load_challenges import CHALLENGE_FAMILIES;"
+        + "ChallengeBuilder.filter(action='clean');"
+        + "pending = ChallengeBuilder._registry.pending_families;"
+        + "print(','.join(family.name for family in CHALLENGE_FAMILIES if family not in pending))"
+    )
+
+    assert registered_families.split(",") == [
+        family.name for family in CHALLENGE_FAMILIES if "clean" in family.actions
+    ]
+
+
+def test_challenges_are_in_the_same_order_however_the_families_are_registered() -> None:
+    high_level_keys = _run_in_fresh_interpreter(
+        "from arena_missions.builders import ChallengeBuilder;"
+        + "ChallengeBuilder.filter(action='break');"
+        + "ChallengeBuilder.filter(action='clean');"
+        + "print('\\n'.join(high_level_key.key for high_level_key, _ in ChallengeBuilder()))"
+    )
+
+    assert high_level_keys.splitlines() == [
+        high_level_key.key for high_level_key, _ in ChallengeBuilder()
+    ]
+
+
+@pytest.mark.parametrize(
+    "challenge_family", CHALLENGE_FAMILIES, ids=[family.name for family in CHALLENGE_FAMILIES]
+)
+def test_families_only_produce_the_challenges_they_declare(
+    challenge_family: ChallengeFamily, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    registry = ChallengeBuilderRegistry()
+    monkeypatch.setattr(ChallengeBuilder, "_registry", registry)
+
+    challenge_family.register()
+
+    assert registry.keys()
+    for high_level_key in registry.keys():
+        assert high_level_key.action in challenge_family.actions
+        if challenge_family.target_objects is not None:
+            assert high_level_key.target_object in challenge_family.target_objects
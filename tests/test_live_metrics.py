@@ -0,0 +1,55 @@
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from simbot_offline_inference.live_metrics import Histogram, LiveMetrics, LiveMetricsExporter
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram(buckets=(1, 5))
+    for latency in (0.5, 2, 3, 10):
+        histogram.observe(latency)
+
+    assert histogram.render("latency") == [
+        'latency_bucket{le="1"} 1',
+        'latency_bucket{le="5"} 3',
+        'latency_bucket{le="+Inf"} 4',
+        "latency_sum 15.5",
+        "latency_count 4",
+    ]
+
+
+def test_live_metrics_are_rendered_per_mission_group() -> None:
+    metrics = LiveMetrics()
+    metrics.start_evaluation(num_missions=3)
+    metrics.record_mission_dequeued()
+    metrics.record_mission("pickup", is_success=True)
+    metrics.record_mission("pickup", is_success=False)
+    metrics.record_mission(None, is_success=True)
+    metrics.record_utterance(num_actions=3)
+    metrics.record_utterance(num_actions=1)
+    metrics.record_arena_restart()
+
+    rendered_lines = metrics.render().splitlines()
+
+    assert "simbot_missions_remaining 2" in rendered_lines
+    assert 'simbot_missions_total{mission_group="pickup",success="true"} 1' in rendered_lines
+    assert 'simbot_missions_total{mission_group="pickup",success="false"} 1' in rendered_lines
+    assert 'simbot_missions_total{mission_group="unknown",success="true"} 1' in rendered_lines
+    assert "simbot_actions_per_utterance 2.0" in rendered_lines
+    assert "simbot_arena_restarts_total 1" in rendered_lines
+
+
+def test_exporter_serves_metrics_over_http() -> None:
+    metrics = LiveMetrics()
+    metrics.arena_interact_latency.observe(0.2)
+
+    with LiveMetricsExporter(metrics, port=0) as exporter:
+        with urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            response_body = response.read().decode()
+
+        with pytest.raises(HTTPError):
+            urlopen(f"http://127.0.0.1:{exporter.port}/")
+
+    assert "simbot_arena_interact_latency_seconds_count 1" in response_body
@@ -0,0 +1,65 @@
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+from arena_missions.constants.arena import ObjectIds
+from arena_missions.structures import CDFScene, ObjectId, ObjectInstanceId
+from arena_missions.structures.object_id import convert_object_instance_id_to_object_id
+
+
+@pytest.mark.parametrize("object_id", get_args(ObjectIds))
+def test_every_object_id_is_valid(object_id: str) -> None:
+    assert ObjectId.parse(object_id) == object_id
+    assert ObjectInstanceId.parse(f"{object_id}_1").object_id == object_id
+
+
+def test_validated_ids_are_reused() -> None:
+    assert ObjectId.parse("Apple") is ObjectId.parse("Apple")
+    assert ObjectInstanceId.parse("Apple_1") is ObjectInstanceId.parse("Apple_1")
+
+
+@pytest.mark.parametrize(
+    ("object_instance_id", "object_id"),
+    [
+        ("Apple_1", "Apple"),
+        ("Bowl_01_1", "Bowl_01"),
+        ("Printer_3D_1_Spawned_Hammer_*", "Printer_3D_1_Spawned_Hammer"),
+    ],
+)
+def test_object_ids_are_split_from_the_last_underscore(
+    object_instance_id: str, object_id: str
+) -> None:
+    assert convert_object_instance_id_to_object_id(object_instance_id) == object_id
+
+
+@pytest.mark.parametrize("object_instance_id", ["Apple", "NotAnObject_1", "Apple_01", "Apple_a"])
+def test_invalid_object_instance_ids_are_rejected(object_instance_id: str) -> None:
+    with pytest.raises(ValueError):
+        ObjectInstanceId.parse(object_instance_id)
+
+
+def test_validating_many_ids_keeps_their_order() -> None:
+    object_instance_ids = ["Apple_1", "Bowl_01_2", "Apple_1"]
+
+    assert ObjectInstanceId.validate_many(object_instance_ids) == object_instance_ids
+
+
+def test_validating_many_ids_reports_every_invalid_one() -> None:
+    with pytest.raises(ValueError, match="'NotAnObject_1', 'Apple'"):
+        ObjectInstanceId.validate_many(["NotAnObject_1", "Apple_1", "Apple", "NotAnObject_1"])
+
+
+def test_parsing_a_scene_reports_every_invalid_object() -> None:
+    with pytest.raises(ValidationError, match="'NotAnObject_1', 'Apple_01'"):
+        CDFScene.parse_obj(
+            {
+                "roomLocation": ["BreakRoom"],
+                "layoutOverride": "OfficeLayout1",
+                "required_objects": [
+                    {"name": "NotAnObject_1"},
+                    {"name": "Apple_1"},
+                    {"name": "Apple_01"},
+                ],
+            }
+        )
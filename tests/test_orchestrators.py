@@ -0,0 +1,221 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from simbot_offline_inference.orchestrators import (
+    ArenaOrchestrator,
+    AsyncExperienceHubOrchestrator,
+    PredictionRequest,
+)
+from simbot_offline_inference.scheduling import cdf_content_hash
+
+
+CDF: dict[str, Any] = {"scene": {"floor_plan": "0"}}
+
+
+def _create_arena_orchestrator(
+    loaded_cdf: Optional[dict[str, Any]], *, can_reset_scene: bool
+) -> ArenaOrchestrator:
+    """Create the orchestrator without starting anything, as if the CDF was already loaded."""
+    arena_orchestrator = ArenaOrchestrator.__new__(ArenaOrchestrator)
+    arena_orchestrator._loaded_cdf_hash = (  # noqa: WPS437
+        cdf_content_hash(loaded_cdf) if loaded_cdf is not None else None
+    )
+    arena_orchestrator.send_cdf_to_arena = MagicMock()  # type: ignore[method-assign]
+    arena_orchestrator.send_dummy_actions_to_arena = MagicMock()  # type: ignore[method-assign]
+    arena_orchestrator.reset_scene = MagicMock(  # type: ignore[method-assign]
+        return_value=can_reset_scene
+    )
+    return arena_orchestrator
+
+
+def test_the_loaded_scene_is_reset_instead_of_loading_the_cdf_again() -> None:
+    arena_orchestrator = _create_arena_orchestrator(CDF, can_reset_scene=True)
+
+    arena_orchestrator.launch_new_game(CDF)
+
+    arena_orchestrator.reset_scene.assert_called_once()  # type: ignore[attr-defined]
+    arena_orchestrator.send_cdf_to_arena.assert_not_called()  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    ("loaded_cdf", "can_reset_scene"),
+    [(None, True), ({"scene": {"floor_plan": "1"}}, True), (CDF, False)],
+)
+def test_the_cdf_is_loaded_when_the_scene_cannot_be_reset(
+    loaded_cdf: Optional[dict[str, Any]], can_reset_scene: bool
+) -> None:
+    arena_orchestrator = _create_arena_orchestrator(loaded_cdf, can_reset_scene=can_reset_scene)
+
+    arena_orchestrator.launch_new_game(CDF)
+
+    arena_orchestrator.send_cdf_to_arena.assert_called_once_with(CDF)  # type: ignore[attr-defined]
+    assert arena_orchestrator._loaded_cdf_hash == cdf_content_hash(CDF)  # noqa: WPS437
+
+
+def test_arena_builds_cannot_reset_the_scene_by_default() -> None:
+    assert not ArenaOrchestrator.reset_scene(ArenaOrchestrator.__new__(ArenaOrchestrator))
+
+
+def _record_random_start_position(session_id: str, monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    """Get every action sent to go to a random viewpoint and randomise the start position."""
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    arena_orchestrator = _create_arena_orchestrator(None, can_reset_scene=False)
+    arena_orchestrator.response = {
+        "sceneMetadata": {"GoToPoints": {f"BreakRoom_{idx}": {} for idx in range(10)}}
+    }
+    arena_orchestrator.execute_action = MagicMock(  # type: ignore[method-assign]
+        return_value=(True, {})
+    )
+
+    arena_orchestrator.go_to_random_start_position(session_id, "BreakRoom")
+
+    return [
+        sent_actions for (sent_actions, *_), _ in arena_orchestrator.execute_action.call_args_list
+    ]
+
+
+def test_random_start_positions_are_the_same_for_the_same_session(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first_actions = _record_random_start_position("T1_session_0", monkeypatch)
+    second_actions = _record_random_start_position("T1_session_0", monkeypatch)
+    other_session_actions = _record_random_start_position("T1_session_1", monkeypatch)
+
+    assert len(first_actions) == 11
+    assert first_actions == second_actions
+    assert first_actions != other_session_actions
+
+
+def _create_experience_hub_orchestrator(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    handle_request: Any,
+    *,
+    max_concurrent_requests: int,
+) -> AsyncExperienceHubOrchestrator:
+    """Create the orchestrator, sending its requests to the handler instead of the network."""
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda **kwargs: async_client(transport=httpx.MockTransport(handle_request), **kwargs),
+    )
+    return AsyncExperienceHubOrchestrator(
+        healthcheck_endpoint="http://experience-hub/healthcheck",
+        predict_endpoint="http://experience-hub/v1/predict",
+        auxiliary_metadata_dir=tmp_path.joinpath("auxiliary_metadata"),
+        auxiliary_metadata_cache_dir=tmp_path.joinpath("auxiliary_metadata_cache"),
+        cached_extracted_features_dir=tmp_path.joinpath("features"),
+        model_storage_dir=tmp_path.joinpath("models"),
+        experience_hub_dir=tmp_path.joinpath("experience_hub"),
+        max_concurrent_requests=max_concurrent_requests,
+    )
+
+
+def _create_prediction_requests(num_sessions: int) -> list[PredictionRequest]:
+    return [
+        PredictionRequest(f"T1_session_{idx}", "pick up the mug", {}, [])
+        for idx in range(num_sessions)
+    ]
+
+
+def test_experience_hub_responses_are_in_the_order_of_the_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    received_session_ids: list[str] = []
+    max_requests_in_flight = 0
+
+    async def handle_request(request: httpx.Request) -> httpx.Response:  # noqa: WPS430
+        nonlocal max_requests_in_flight
+        max_requests_in_flight = max(max_requests_in_flight, orchestrator.num_requests_in_flight)
+
+        session_id = json.loads(request.content)["header"]["sessionId"]
+        received_session_ids.append(session_id)
+
+        # Later sessions respond first, so the responses finish out of order
+        await asyncio.sleep(0.01 * (4 - int(session_id.rsplit("_", 1)[-1])))
+        return httpx.Response(200, json={"actions": [{"type": "Dialog", "id": session_id}]})
+
+    orchestrator = _create_experience_hub_orchestrator(
+        tmp_path, monkeypatch, handle_request, max_concurrent_requests=2
+    )
+
+    next_actions = asyncio.run(
+        orchestrator.get_next_actions_for_sessions(_create_prediction_requests(4))
+    )
+
+    assert received_session_ids == [f"T1_session_{idx}" for idx in range(4)]
+    assert [actions.dialog_actions[0]["id"] for actions in next_actions] == received_session_ids
+    assert max_requests_in_flight == 2
+    assert orchestrator.num_requests_in_flight == 0
+    assert orchestrator.num_requests_waiting == 0
+
+
+@pytest.mark.parametrize(
+    ("failure", "expected_error"),
+    [
+        (httpx.Response(500, json={"detail": "Internal Server Error"}), AssertionError),
+        (httpx.ConnectError("Connection refused"), httpx.ConnectError),
+    ],
+)
+def test_experience_hub_errors_are_raised_to_the_caller(
+    failure: Any,
+    expected_error: type[Exception],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def handle_request(request: httpx.Request) -> httpx.Response:  # noqa: WPS430
+        if json.loads(request.content)["header"]["sessionId"] != "T1_session_1":
+            return httpx.Response(200, json={"actions": [{"type": "Dialog"}]})
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+    orchestrator = _create_experience_hub_orchestrator(
+        tmp_path, monkeypatch, handle_request, max_concurrent_requests=1
+    )
+
+    with pytest.raises(expected_error):
+        asyncio.run(orchestrator.get_next_actions_for_sessions(_create_prediction_requests(3)))
+
+    # The failed request still gives its slot back, so later requests are not stuck
+    assert orchestrator.num_requests_in_flight == 0
+    next_actions = asyncio.run(orchestrator.get_next_actions_async("T1_session_0", None, {}, []))
+    assert next_actions.should_return_control
+
+
+def test_sessions_share_one_client_in_every_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def handle_request(request: httpx.Request) -> httpx.Response:  # noqa: WPS430
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"actions": [{"type": "Dialog"}]})
+
+    orchestrator = _create_experience_hub_orchestrator(
+        tmp_path, monkeypatch, handle_request, max_concurrent_requests=1
+    )
+    created_clients: list[httpx.AsyncClient] = []
+    create_client = orchestrator._create_client  # noqa: WPS437
+
+    def record_created_client() -> httpx.AsyncClient:  # noqa: WPS430
+        created_clients.append(create_client())
+        return created_clients[-1]
+
+    monkeypatch.setattr(orchestrator, "_create_client", record_created_client)
+
+    # Each run has more requests than slots, and uses a new event loop
+    for _ in range(2):
+        next_actions = asyncio.run(
+            orchestrator.get_next_actions_for_sessions(_create_prediction_requests(3))
+        )
+        assert len(next_actions) == 3
+
+    assert len(created_clients) == 2
+    assert all(client.is_closed for client in created_clients)
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from simbot_offline_inference.preparation_cache import PreparationActionCache
+
+
+CDF = {"scene": {"layoutOverride": "OfficeLayout1", "scene_id": "01 (Make_Cereal)"}}
+
+
+def test_preparation_actions_are_cached_per_cdf_and_plan(tmp_path: Path) -> None:
+    preparation_cache = PreparationActionCache(tmp_path)
+    preparation_actions = [[[{"id": "1", "type": "Goto"}], [{"id": "2", "type": "Pickup"}]]]
+
+    cache_key = preparation_cache.get_key(CDF, ["pick up the bowl"])
+    preparation_cache.save(cache_key, preparation_actions)
+
+    assert preparation_cache.load(cache_key) == preparation_actions
+    assert preparation_cache.get_key(CDF, ["pick up the mug"]) != cache_key
+    assert preparation_cache.load(preparation_cache.get_key(CDF, ["pick up the mug"])) is None
+
+
+def test_deleted_preparation_actions_are_not_replayed(tmp_path: Path) -> None:
+    preparation_cache = PreparationActionCache(tmp_path)
+    cache_key = preparation_cache.get_key(CDF, ["pick up the bowl"])
+    preparation_cache.save(cache_key, [[]])
+
+    preparation_cache.delete(cache_key)
+
+    assert preparation_cache.load(cache_key) is None
@@ -0,0 +1,45 @@
+import pytest
+
+from arena_missions.constants.arena import (
+    get_all_readable_names,
+    get_object_ids_with_readable_name,
+    is_readable_name,
+    load_object_id_to_readable_name_map,
+    load_readable_name_to_object_ids_map,
+)
+from arena_missions.structures import ObjectId, ObjectInstanceId
+
+
+def test_every_object_id_is_under_its_readable_name() -> None:
+    readable_name_to_object_ids = load_readable_name_to_object_ids_map()
+
+    for object_id, readable_name in load_object_id_to_readable_name_map().items():
+        assert object_id in readable_name_to_object_ids[readable_name]
+
+
+def test_every_readable_name_is_found() -> None:
+    readable_names = get_all_readable_names()
+
+    assert len(readable_names) == len(set(readable_names))
+    assert all(is_readable_name(readable_name) for readable_name in readable_names)
+    assert not is_readable_name("NotAReadableName")
+
+
+def test_readable_names_map_to_object_ids() -> None:
+    assert get_object_ids_with_readable_name("NotAReadableName") == frozenset()
+    assert ObjectId.from_readable_name("Bowl") == {"Bowl_01"}
+    assert ObjectId.from_readable_name("Sticky Note") == {"StickyNote", "AP_Prop_Note_05"}
+
+
+def test_object_instances_have_the_readable_name_of_their_object() -> None:
+    object_instance_id = ObjectInstanceId.parse("Bowl_01_1")
+
+    assert object_instance_id.readable_name == object_instance_id.object_id.readable_name
+
+
+def test_readable_name_maps_cannot_be_changed() -> None:
+    with pytest.raises(TypeError):
+        load_object_id_to_readable_name_map()["Bowl_01"] = "Plate"  # type: ignore[index]
+
+    with pytest.raises(TypeError):
+        load_readable_name_to_object_ids_map()["Bowl"] = frozenset()  # type: ignore[index]
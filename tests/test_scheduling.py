@@ -0,0 +1,95 @@
+from pathlib import Path
+
+from arena_missions.structures import MissionTrajectory
+from simbot_offline_inference.scheduling import (
+    MissionHistory,
+    cdf_content_hash,
+    get_mission_key,
+    schedule_trajectories,
+)
+
+
+def _create_trajectory(mission_id: str, layout: str = "OfficeLayout1") -> MissionTrajectory:
+    return MissionTrajectory(
+        session_id=f"T1_{mission_id}",
+        mission_id=mission_id,
+        utterances=["pick up the mug"],
+        cdf={"scene": {"layoutOverride": layout, "scene_id": "01 (Make_Cereal)"}},
+    )
+
+
+def _get_mission_ids(trajectories: list[MissionTrajectory]) -> list[str]:
+    return [get_mission_key(trajectory) for trajectory in trajectories]
+
+
+def test_history_is_reloaded_from_disk(tmp_path: Path) -> None:
+    history_path = tmp_path.joinpath("history.jsonl")
+    mission_history = MissionHistory(history_path)
+    mission_history.record("mission_0", 10, has_failed=False)
+    mission_history.record("mission_0", 20, has_failed=True)
+
+    reloaded_stats = MissionHistory(history_path).get_stats("mission_0")
+
+    assert reloaded_stats.num_runs == 2
+    assert reloaded_stats.num_failures == 1
+    assert reloaded_stats.mean_duration == 15
+
+
+def test_longest_missions_are_scheduled_first(tmp_path: Path) -> None:
+    mission_history = MissionHistory(tmp_path.joinpath("history.jsonl"))
+    mission_history.record("short", 10, has_failed=False)
+    mission_history.record("long", 90, has_failed=False)
+    trajectories = [_create_trajectory(mission_id) for mission_id in ("short", "new", "long")]
+
+    scheduled_trajectories = schedule_trajectories(trajectories, "longest_first", mission_history)
+
+    # Missions without a history are expected to take as long as the average mission
+    assert _get_mission_ids(scheduled_trajectories) == ["long", "new", "short"]
+
+
+def test_crashing_missions_are_scheduled_last(tmp_path: Path) -> None:
+    mission_history = MissionHistory(tmp_path.joinpath("history.jsonl"))
+    mission_history.record("crashes", 10, has_failed=True)
+    trajectories = [_create_trajectory(mission_id) for mission_id in ("crashes", "a", "b")]
+
+    scheduled_trajectories = schedule_trajectories(trajectories, "crashes_last", mission_history)
+
+    assert _get_mission_ids(scheduled_trajectories) == ["a", "b", "crashes"]
+
+
+def test_trajectories_are_grouped_by_scene(tmp_path: Path) -> None:
+    trajectories = [
+        _create_trajectory("a", layout="OfficeLayout3"),
+        _create_trajectory("b", layout="OfficeLayout1"),
+        _create_trajectory("c", layout="OfficeLayout3"),
+    ]
+
+    scheduled_trajectories = schedule_trajectories(
+        trajectories, "by_scene", MissionHistory(tmp_path.joinpath("history.jsonl"))
+    )
+
+    assert _get_mission_ids(scheduled_trajectories) == ["b", "a", "c"]
+
+
+def test_generated_trajectories_are_identified_by_their_cdf() -> None:
+    trajectory = _create_trajectory("mission").copy(update={"mission_id": None})
+
+    assert get_mission_key(trajectory) == f"cdf-{cdf_content_hash(trajectory.cdf_as_dict)}"
+
+
+def test_identical_cdfs_are_scheduled_together(tmp_path: Path) -> None:
+    first_annotation, other_mission, second_annotation = (
+        _create_trajectory(mission_id) for mission_id in ("task_0", "other_task_0", "task_1")
+    )
+    first_annotation.cdf["scene"]["required_objects"] = ["mug"]
+    second_annotation.cdf["scene"]["required_objects"] = ["mug"]
+
+    scheduled_trajectories = schedule_trajectories(
+        [first_annotation, other_mission, second_annotation],
+        "scene_affinity",
+        MissionHistory(tmp_path.joinpath("history.jsonl")),
+    )
+    mission_ids = _get_mission_ids(scheduled_trajectories)
+
+    assert abs(mission_ids.index("task_0") - mission_ids.index("task_1")) == 1
+    assert mission_ids.index("task_0") < mission_ids.index("task_1")
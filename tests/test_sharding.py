@@ -0,0 +1,232 @@
+from pathlib import Path
+from typing import Literal, Optional
+
+import pytest
+from pytest_cases import parametrize
+
+from simbot_offline_inference.commands.merge_evaluation_shards import (
+    find_worker_journals,
+    merge_worker_and_shard_metrics,
+)
+from simbot_offline_inference.metrics import (
+    CompletedMissionIndex,
+    EvaluationMetrics,
+    MeanMetric,
+    merge_metrics_states,
+    summarise_metrics_state,
+)
+from simbot_offline_inference.sharding import Shard, stable_shard_index
+
+
+MissionResult = tuple[str, Optional[str], bool, list[Literal[0, 1]]]
+
+MISSION_RESULTS: list[MissionResult] = [
+    ("mission_0", "pickup&deliver", True, [1, 1]),
+    ("mission_1", "pickup&deliver", False, [1, 0]),
+    ("mission_2", "breakObject", True, [1]),
+    ("mission_3", "scanObject", False, [0, 0, 0]),
+    ("mission_4", None, True, [1, 1, 1]),
+]
+
+
+def _evaluate(results_dir: Path, mission_results: list[MissionResult]) -> EvaluationMetrics:
+    evaluation_metrics = EvaluationMetrics(
+        results_dir.joinpath("outputs"),
+        results_dir.joinpath("checkpoint.jsonl"),
+        MeanMetric(),
+        MeanMetric(),
+    )
+    for mission_id, mission_group, is_mission_completed, subgoal_completion in mission_results:
+        evaluation_metrics.update(
+            mission_id=mission_id,
+            mission_group=mission_group,
+            is_mission_completed=is_mission_completed,
+            subgoal_completion_status=subgoal_completion,
+            predicted_actions=[],
+            last_game_state={},
+            remaining_utterances=[],
+        )
+    return evaluation_metrics
+
+
+def test_shard_index_is_stable() -> None:
+    assert [stable_shard_index(f"mission_{idx}", 4) for idx in range(5)] == [
+        stable_shard_index(f"mission_{idx}", 4) for idx in range(5)
+    ]
+    assert stable_shard_index("Pickup_and_Deliver_0", 1) == 0
+
+
+@parametrize("num_shards", [1, 2, 3, 7])
+def test_every_mission_is_in_exactly_one_shard(num_shards: int) -> None:
+    mission_ids = [f"mission_{idx}" for idx in range(200)]
+
+    shard_mission_ids = [
+        [
+            mission_id
+            for mission_id in mission_ids
+            if Shard(shard_index, num_shards).contains(mission_id)
+        ]
+        for shard_index in range(num_shards)
+    ]
+
+    assert sorted(mission_id for shard in shard_mission_ids for mission_id in shard) == sorted(
+        mission_ids
+    )
+
+
+@parametrize("shard", [Shard(index=2, count=2), Shard(index=-1, count=2), Shard(count=0)])
+def test_invalid_shards_are_rejected(shard: Shard) -> None:
+    with pytest.raises(ValueError):
+        shard.validate()
+
+
+def test_sharded_files_do_not_clash() -> None:
+    results_path = Path("storage/evaluation_results.json")
+
+    assert Shard().path_for(results_path) == results_path
+    assert Shard(1, 4).path_for(results_path) == Path(
+        "storage/evaluation_results.shard-1-of-4.json"
+    )
+
+
+def test_merged_shards_match_a_single_run(tmp_path: Path) -> None:
+    single_run_metrics = _evaluate(tmp_path.joinpath("single"), MISSION_RESULTS)
+
+    shard_metrics = [
+        _evaluate(
+            tmp_path.joinpath(f"shard_{shard_index}"),
+            [result for result in MISSION_RESULTS if Shard(shard_index, 3).contains(result[0])],
+        )
+        for shard_index in range(3)
+    ]
+    merged_metrics = merge_metrics_states(metrics.to_dict() for metrics in shard_metrics)
+
+    assert merged_metrics == single_run_metrics.to_dict()
+    assert summarise_metrics_state(merged_metrics) == single_run_metrics.summarise()
+
+
+def test_merging_workers_includes_the_missions_of_workers_that_died(tmp_path: Path) -> None:
+    single_run_metrics = _evaluate(tmp_path.joinpath("single"), MISSION_RESULTS)
+
+    journals_dir = tmp_path.joinpath("journals")
+    # The first worker died after two missions, and lost its lease on the second one
+    _evaluate(journals_dir, MISSION_RESULTS[:2]).save_checkpoint()
+    journals_dir.joinpath("checkpoint.jsonl").rename(
+        journals_dir.joinpath("checkpoint.worker-dead.jsonl")
+    )
+    healthy_worker_metrics = _evaluate(journals_dir, MISSION_RESULTS[1:])
+    healthy_worker_metrics.save_checkpoint()
+    journals_dir.joinpath("checkpoint.jsonl").rename(
+        journals_dir.joinpath("checkpoint.worker-healthy.jsonl")
+    )
+
+    worker_journals = find_worker_journals(journals_dir, Path("checkpoint.jsonl"))
+    merged_metrics = merge_worker_and_shard_metrics(
+        [
+            {
+                "metadata": {"shard_index": 0, "num_shards": 1, "worker_id": "healthy"},
+                "metrics": healthy_worker_metrics.to_dict(),
+            }
+        ],
+        worker_journals,
+    )
+
+    assert len(worker_journals) == 2
+    assert merged_metrics == single_run_metrics.to_dict()
+
+
+def test_forgetting_a_shard_keeps_the_missions_of_other_shards(tmp_path: Path) -> None:
+    outputs_dir = tmp_path.joinpath("outputs")
+    outputs_dir.mkdir()
+    index_path = tmp_path.joinpath("index.txt")
+    mission_ids = [mission_id for mission_id, *_ in MISSION_RESULTS]
+    shard = Shard(index=0, count=2)
+    shard_mission_ids = [mission_id for mission_id in mission_ids if shard.contains(mission_id)]
+
+    completed_missions = CompletedMissionIndex(outputs_dir, index_path)
+    for mission_id in mission_ids:
+        completed_missions.add(mission_id)
+    other_worker_completed_missions = CompletedMissionIndex(outputs_dir, index_path)
+
+    completed_missions.forget(shard_mission_ids)
+    other_worker_completed_missions.refresh()
+
+    for index in (
+        completed_missions,
+        other_worker_completed_missions,
+        CompletedMissionIndex(outputs_dir, index_path),
+    ):
+        assert sorted(mission_id for mission_id in mission_ids if mission_id in index) == sorted(
+            set(mission_ids) - set(shard_mission_ids)
+        )
+
+
+def test_forgetting_missions_never_loses_missions_added_by_other_workers(tmp_path: Path) -> None:
+    outputs_dir = tmp_path.joinpath("outputs")
+    index_path = tmp_path.joinpath("index.txt")
+    completed_missions = CompletedMissionIndex(outputs_dir, index_path)
+    other_worker_completed_missions = CompletedMissionIndex(outputs_dir, index_path)
+
+    completed_missions.add("mission_0")
+    completed_missions.add("mission_1")
+    other_worker_completed_missions.refresh()
+
+    completed_missions.forget(["mission_0"])
+    other_worker_completed_missions.add("mission_2")
+    completed_missions.add("mission_0")
+    completed_missions.forget(["mission_1"])
+    completed_missions.refresh()
+    other_worker_completed_missions.refresh()
+
+    for index in (
+        completed_missions,
+        other_worker_completed_missions,
+        CompletedMissionIndex(outputs_dir, index_path),
+    ):
+        assert {
+            mission_id
+            for mission_id in ("mission_0", "mission_1", "mission_2")
+            if mission_id in index
+        } == {"mission_0", "mission_2"}
+
+
+def test_building_the_index_does_not_replace_one_from_another_worker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    outputs_dir = tmp_path.joinpath("outputs")
+    outputs_dir.mkdir()
+    outputs_dir.joinpath("mission_0.json").write_text("{}")
+    index_path = tmp_path.joinpath("index.txt")
+
+    create_index = CompletedMissionIndex._create_index  # noqa: WPS437
+
+    def create_index_after_another_worker(  # noqa: WPS430
+        completed_missions: CompletedMissionIndex, index_contents: str
+    ) -> None:
+        index_path.write_text("mission_1\n")
+        create_index(completed_missions, index_contents)
+
+    monkeypatch.setattr(CompletedMissionIndex, "_create_index", create_index_after_another_worker)
+
+    completed_missions = CompletedMissionIndex(outputs_dir, index_path)
+    completed_missions.refresh()
+
+    assert index_path.read_text() == "mission_1\n"
+    assert "mission_0" in completed_missions
+    assert "mission_1" in completed_missions
+
+
+def test_checking_missions_only_reads_the_index_once_it_is_stale(tmp_path: Path) -> None:
+    outputs_dir = tmp_path.joinpath("outputs")
+    index_path = tmp_path.joinpath("index.txt")
+    recently_refreshed_missions = CompletedMissionIndex(
+        outputs_dir, index_path, refresh_interval=3600
+    )
+    stale_missions = CompletedMissionIndex(outputs_dir, index_path, refresh_interval=0)
+
+    CompletedMissionIndex(outputs_dir, index_path).add("mission_0")
+    recently_refreshed_missions.refresh_if_stale()
+    stale_missions.refresh_if_stale()
+
+    assert "mission_0" not in recently_refreshed_missions
+    assert "mission_0" in stale_missions
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+import pytest
+
+from simbot_offline_inference.tracing import Tracer
+
+
+def test_disabled_tracer_writes_nothing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracer = Tracer()
+    tracer.configure(tmp_path.joinpath("traces"), "chrome")
+    tracer.configure(None)
+
+    tracer.start_trajectory("mission")
+    with tracer.span("phase"):
+        pass  # noqa: WPS420
+    tracer.finish_trajectory()
+
+    assert not list(tmp_path.joinpath("traces").iterdir())
+    assert [path.name for path in tmp_path.iterdir()] == ["traces"]
+
+
+def test_chrome_trace_contains_nested_spans(tmp_path: Path) -> None:
+    tracer = Tracer()
+    tracer.configure(tmp_path, "chrome")
+
+    tracer.start_trajectory("mission")
+    with tracer.span("outer", utterance="pick up the mug"):
+        tracer.wrap("inner", lambda: None)()
+    tracer.finish_trajectory()
+
+    trace = orjson.loads(tmp_path.joinpath("mission.trace.json").read_bytes())
+    events = {event["name"]: event for event in trace["traceEvents"]}
+
+    assert set(events) == {"outer", "inner"}
+    assert events["outer"]["args"] == {"utterance": "pick up the mug"}
+    assert events["outer"]["ts"] <= events["inner"]["ts"]
+    assert events["inner"]["dur"] <= events["outer"]["dur"]
+
+
+def test_jsonl_trace_has_one_span_per_line(tmp_path: Path) -> None:
+    tracer = Tracer()
+    tracer.configure(tmp_path, "jsonl")
+
+    tracer.start_trajectory("nested/mission")
+    for phase in ("launch_game", "healthcheck"):
+        with tracer.span(phase):
+            pass  # noqa: WPS420
+    tracer.finish_trajectory()
+
+    lines = tmp_path.joinpath("nested", "mission.trace.jsonl").read_bytes().splitlines()
+
+    assert [orjson.loads(line)["name"] for line in lines] == ["launch_game", "healthcheck"]
+
+
+def test_spans_from_background_threads_are_not_in_the_trajectory_trace(tmp_path: Path) -> None:
+    tracer = Tracer()
+    tracer.configure(tmp_path, "jsonl")
+
+    def prepare_next_trajectory() -> None:  # noqa: WPS430
+        with tracer.span("prepare_next_trajectory"):
+            pass  # noqa: WPS420
+
+    tracer.start_trajectory("mission")
+    with tracer.span("launch_game"):
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            prefetcher.submit(prepare_next_trajectory).result()
+    tracer.finish_trajectory()
+
+    lines = tmp_path.joinpath("mission.trace.jsonl").read_bytes().splitlines()
+
+    assert [orjson.loads(line)["name"] for line in lines] == ["launch_game"]
+
+
+def test_trajectories_in_different_threads_have_their_own_traces(tmp_path: Path) -> None:
+    tracer = Tracer()
+    tracer.configure(tmp_path, "jsonl")
+
+    def run_trajectory(trajectory_name: str) -> None:  # noqa: WPS430
+        tracer.start_trajectory(trajectory_name)
+        with tracer.span(f"{trajectory_name}_phase"):
+            pass  # noqa: WPS420
+        tracer.finish_trajectory()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(run_trajectory, ["first", "second"]))
+
+    for trajectory_name in ("first", "second"):
+        lines = tmp_path.joinpath(f"{trajectory_name}.trace.jsonl").read_bytes().splitlines()
+        assert [orjson.loads(line)["name"] for line in lines] == [f"{trajectory_name}_phase"]
@@ -0,0 +1,55 @@
+import pytest
+from pydantic import ValidationError
+
+from arena_missions.builders import RequiredObjectBuilder
+from arena_missions.structures import CDFScene, ObjectInstanceId, RequiredObject
+from arena_missions.structures.trusted import is_trusted
+
+
+def _create_scene(*required_objects: RequiredObject) -> CDFScene:
+    return CDFScene(
+        roomLocation=["BreakRoom"],
+        floor_plan="0",
+        required_objects=list(required_objects),
+        layoutOverride="OfficeLayout1",
+    )
+
+
+def test_trusted_objects_are_the_same_as_validated_objects() -> None:
+    fridge = RequiredObjectBuilder().fridge(is_open=True)
+    fridge.update_receptacle(ObjectInstanceId("TableRound_02_1"))
+
+    validated_fridge = RequiredObject.parse_raw(fridge.json(by_alias=True))
+
+    assert is_trusted(fridge)
+    assert _create_scene(fridge).required_objects == [validated_fridge]
+
+
+def test_trusted_objects_are_validated_when_added_to_the_scene() -> None:
+    fridge = RequiredObjectBuilder().fridge()
+
+    scene = _create_scene(fridge)
+
+    assert not any(is_trusted(required_object) for required_object in scene.required_objects)
+    assert not any(is_trusted(state) for state in scene.required_objects[0].state)
+
+
+def test_invalid_trusted_values_fail_when_added_to_the_scene() -> None:
+    trusted_object = RequiredObject.trusted(name="NotAnObject_1")
+    trusted_object.update_room("NotARoom")  # type: ignore[arg-type]
+
+    with pytest.raises(ValidationError, match="NotAnObject_1|roomLocation"):
+        _create_scene(trusted_object)
+
+
+def test_updating_a_copy_of_a_trusted_object_does_not_change_the_original() -> None:
+    fridge = RequiredObjectBuilder().fridge()
+    fridge_copy = fridge.copy()
+
+    fridge_copy.update_state("isOpen", "true")
+
+    assert [(state.name, state.value) for state in fridge.state] == [
+        ("isOpen", "false"),
+        ("removeInitialContainedItems", "true"),
+    ]
+    assert (fridge_copy.state[-1].name, fridge_copy.state[-1].value) == ("isOpen", "true")